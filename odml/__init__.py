@@ -8,7 +8,7 @@ from . import doc
 from . import property
 from . import section
 from .dtypes import DType
-from .fileio import load, save, display
+from .fileio import load, load_many, iter_load_many, save, display
 from .info import VERSION
 from .tools.parser_utils import SUPPORTED_PARSERS as PARSERS
 
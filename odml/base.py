@@ -105,6 +105,18 @@ class SmartList(list):
         self._content_type = content_type
         super(SmartList, self).__init__()
 
+    def __reduce__(self):
+        """
+        Pickles the list items together with the attributes, so that
+        *_content_type* is restored before any item is added again.
+        """
+        return self.__class__, (self._content_type,), (self.__dict__, list(self))
+
+    def __setstate__(self, state):
+        attributes, items = state
+        self.__dict__.update(attributes)
+        super(SmartList, self).extend(items)
+
     def __getitem__(self, key):
         """
         Provides element index also by searching for an element with a given name.
@@ -201,6 +213,28 @@ class SmartList(list):
 
             super(SmartList, self).append(obj)
 
+    def extend(self, obj_list):
+        """
+        Adds all objects of obj_list to the list. Unlike repeated calls of
+        append, the names of the existing objects are only collected once.
+        Nothing is added if any of the objects is invalid.
+
+        :param obj_list: Iterable of objects of the lists *_content_type*.
+        """
+        obj_list = list(obj_list)
+        names = set(obj.name for obj in self)
+        for obj in obj_list:
+            if not isinstance(obj, self._content_type):
+                raise ValueError("List only supports elements of type '%s'" %
+                                 self._content_type)
+
+            if obj.name in names:
+                raise KeyError(
+                    "Object with the same name already exists! " + str(obj))
+            names.add(obj.name)
+
+        super(SmartList, self).extend(obj_list)
+
     def sort(self, key=lambda x: x.name, reverse=False):
         """
         If not otherwise defined, sort by the *name* attribute
@@ -290,16 +324,21 @@ class Sectionable(BaseObject):
         if not isinstance(sec_list, Iterable):
             raise TypeError("'%s' object is not iterable" % type(sec_list).__name__)
 
+        sec_list = list(sec_list)
+
         # Make sure only Sections with unique names will be added.
+        names = set(sec.name for sec in self._sections)
         for sec in sec_list:
             if not isinstance(sec, BaseSection):
                 raise ValueError("Can only extend objects of type Section.")
 
-            if isinstance(sec, BaseSection) and sec.name in self._sections:
+            if sec.name in names:
                 raise KeyError("Section with name '%s' already exists." % sec.name)
+            names.add(sec.name)
 
+        self._sections.extend(sec_list)
         for sec in sec_list:
-            self.append(sec)
+            sec._parent = self
 
     def remove(self, section):
         """ Removes the specified child-section """
@@ -49,6 +49,103 @@ class BaseDocument(base.Sectionable):
         return "Document %s {author = %s, %d sections}" % \
                (self._version, self._author, len(self._sections))
 
+    def __copy__(self):
+        # Shallow copies keep the child list; avoids the flattening of __getstate__.
+        obj = self.__class__.__new__(self.__class__)
+        obj.__dict__.update(self.__dict__)
+        return obj
+
+    def __getstate__(self):
+        """
+        Returns the state of the Document for pickling. The Section tree is
+        flattened into a list of Sections in preorder, each entry containing the
+        index of its parent Section, so that pickling does not recurse through
+        the tree and deep trees do not hit the recursion limit. References of
+        merged (linked) Sections and Properties to their source objects within
+        the Document are stored as indices into this list as well.
+
+        :returns: dictionary of the Document attributes and the Section list.
+        """
+        state = dict(self.__dict__)
+        del state["_sections"]
+
+        tree = []
+        stack = [(sec, -1) for sec in reversed(self._sections)]
+        while stack:
+            sec, parent = stack.pop()
+            stack.extend((child, len(tree)) for child in reversed(sec._sections))
+            tree.append((sec, parent))
+
+        indices = {}
+        for index, (sec, _) in enumerate(tree):
+            indices[id(sec)] = (index,)
+            for prop_index, prop in enumerate(sec._props):
+                indices[id(prop)] = (index, prop_index)
+
+        def merged_state(obj_state):
+            # Objects outside of the Document, e.g. of included
+            # terminologies, are pickled as they are.
+            merged = obj_state.pop("_merged", None)
+            if merged is None:
+                return None
+            return indices.get(id(merged), merged)
+
+        sections = []
+        for sec, parent in tree:
+            sec_state = dict(sec.__dict__)
+            for key in ("_parent", "_sections", "_props"):
+                del sec_state[key]
+            sec_merged = merged_state(sec_state)
+
+            props = []
+            for prop in sec._props:
+                prop_state = dict(prop.__dict__)
+                del prop_state["_parent"]
+                props.append((prop.__class__, prop_state, merged_state(prop_state)))
+
+            sections.append((sec.__class__, parent, sec_state, props, sec_merged))
+
+        return {"document": state, "sections": sections}
+
+    def __setstate__(self, state):
+        """
+        Restores a pickled Document and its Section tree in a single pass
+        over the flattened Section list created by __getstate__.
+        """
+        from odml.property import BaseProperty
+        from odml.section import BaseSection
+
+        self.__dict__.update(state["document"])
+        self._sections = base.SmartList(BaseSection)
+
+        restored = []
+        merged = []
+        for sec_cls, parent, sec_state, props, sec_merged in state["sections"]:
+            sec = sec_cls.__new__(sec_cls)
+            sec.__dict__.update(sec_state)
+            sec._sections = base.SmartList(BaseSection)
+            sec._props = base.SmartList(BaseProperty)
+            merged.append((sec, sec_merged))
+            for prop_cls, prop_state, prop_merged in props:
+                prop = prop_cls.__new__(prop_cls)
+                prop.__dict__.update(prop_state)
+                prop._parent = sec
+                list.append(sec._props, prop)
+                merged.append((prop, prop_merged))
+
+            sec._parent = self if parent < 0 else restored[parent]
+            list.append(sec._parent._sections, sec)
+            restored.append(sec)
+
+        for obj, source in merged:
+            if isinstance(source, tuple):
+                index = source
+                source = restored[index[0]]
+                if len(index) > 1:
+                    source = source._props[index[1]]
+            if source is not None:
+                obj._merged = source
+
     @property
     def oid(self):
         """
@@ -3,17 +3,59 @@ This module provides convenience functions for saving and loading of odML files.
 """
 
 import os
+import pickle
+
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .tools.binary_parser import BinaryReader, BinaryWriter
 from .tools.odmlparser import ODMLReader, ODMLWriter
+from .tools.parse_cache import ParseCache
+from .tools.parser_utils import ParserException
 
+LoadResult = namedtuple("LoadResult", ["path", "document", "error"])
+LoadResult.__doc__ = """
+Result of loading a single file via load_many or iter_load_many. Either
+'document' contains the loaded odML document or 'error' the exception
+raised while loading the file.
+"""
 
-def load(filename, backend="xml", show_warnings=True):
+
+def load(filename, backend="xml", show_warnings=True, validation_profile=None,
+         include_paths=None, exclude_types=None, max_depth=None, lazy_values=False,
+         cache=None, iterative=False, fail_fast=False):
     """
     Load an odML document from file.
     :param filename: Path and filename from where the odML document
                      is to be loaded and parsed.
     :param backend: File format of the file containing the odML document.
-                    The default format is XML.
+                    The default format is XML. With 'auto' the format is
+                    identified from the content of the file.
     :param show_warnings: Toggle whether to print warnings to the command line.
+    :param validation_profile: Name of the validation profile that is run after
+                               loading, e.g. 'errors-only' or 'structural'.
+                               The default profile is 'full'.
+    :param include_paths: Optional list of absolute Section paths like "/exp/subject".
+                          Only the listed Sections, their subsections and the
+                          Sections on their paths are loaded. Supported by the
+                          XML, JSON and YAML backends.
+    :param exclude_types: Optional list of Section types that are not loaded.
+    :param max_depth: Optional maximum depth of loaded Sections; top level
+                      Sections have the depth 1.
+    :param lazy_values: Toggle whether Property values are only decoded when they
+                        are accessed for the first time. Values that were not
+                        accessed are saved unchanged to XML files.
+    :param cache: Optional persistent cache of parsed documents. True uses a
+                  odml.tools.parse_cache.ParseCache with default settings,
+                  a ParseCache instance can be provided as well. Unchanged files
+                  are restored from the cache instead of being parsed again.
+    :param iterative: Toggle whether XML files are parsed incrementally, building
+                      the odML objects while the file is read instead of parsing
+                      the full XML tree first. Reduces the peak memory of large files.
+    :param fail_fast: Toggle whether loading raises a ParserException on the first
+                      validation error instead of reporting validation warnings
+                      after loading. Validation errors are found while parsing
+                      the XML, JSON and YAML formats.
     :return: The parsed odML document.
     """
     if not os.path.exists(filename):
@@ -21,8 +63,132 @@ def load(filename, backend="xml", show_warnings=True):
               (filename if len(filename) < 20 else "...%s" % filename[19:])
         raise FileNotFoundError(msg)
 
-    reader = ODMLReader(backend, show_warnings)
-    return reader.from_file(filename)
+    if cache:
+        if not isinstance(cache, ParseCache):
+            cache = ParseCache()
+        return cache.load(filename, backend, show_warnings, validation_profile,
+                          fail_fast=fail_fast, include_paths=include_paths, exclude_types=exclude_types,
+                          max_depth=max_depth, lazy_values=lazy_values,
+                          iterative=iterative)
+
+    reader = ODMLReader(backend, show_warnings, fail_fast=fail_fast)
+    return reader.from_file(filename, validation_profile=validation_profile,
+                            include_paths=include_paths, exclude_types=exclude_types,
+                            max_depth=max_depth, lazy_values=lazy_values,
+                            iterative=iterative)
+
+
+def _load_worker(index, filename, backend, show_warnings, validation_profile, kwargs):
+    """
+    Loads an odML document in a worker process. Documents are returned in the
+    binary odML format, which is considerably faster to restore than a pickled
+    Document. Documents the binary format cannot store are pickled.
+
+    :return: tuple of file index, serialization format, serialized document
+             or None and the exception raised while loading or None.
+    """
+    try:
+        doc = load(filename, backend, show_warnings, validation_profile, **kwargs)
+    except Exception as exc:
+        return index, None, None, exc
+
+    # The RDF backend returns a list of Documents.
+    if not isinstance(doc, list):
+        try:
+            return index, "binary", (BinaryWriter(doc).to_bytes(), doc.origin_file_name), None
+        except ParserException:
+            pass
+
+    return index, "pickle", pickle.dumps(doc, pickle.HIGHEST_PROTOCOL), None
+
+
+def _restore(data_format, data):
+    if data_format == "binary":
+        doc = BinaryReader().from_bytes(data[0])
+        doc.origin_file_name = data[1]
+        return doc
+
+    return pickle.loads(data)
+
+
+def _iter_load(filenames, backend, workers, show_warnings, validation_profile, kwargs):
+    """
+    Yields tuples of file index and LoadResult in the order the files have been loaded.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers <= 1 or len(filenames) <= 1:
+        for index, filename in enumerate(filenames):
+            try:
+                doc = load(filename, backend, show_warnings, validation_profile, **kwargs)
+                yield index, LoadResult(filename, doc, None)
+            except Exception as exc:
+                yield index, LoadResult(filename, None, exc)
+        return
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(filenames))) as executor:
+        futures = dict((executor.submit(_load_worker, index, filename, backend,
+                                        show_warnings, validation_profile, kwargs), index)
+                       for index, filename in enumerate(filenames))
+
+        for future in as_completed(futures):
+            try:
+                index, data_format, data, error = future.result()
+            except Exception as exc:
+                # Crashed workers and results that cannot be transferred
+                # only fail the affected files.
+                index, error = futures[future], exc
+
+            doc = None
+            if error is None:
+                try:
+                    doc = _restore(data_format, data)
+                except Exception as exc:
+                    error = exc
+            yield index, LoadResult(filenames[index], doc, error)
+
+
+def load_many(filenames, backend="xml", workers=None, show_warnings=False,
+              validation_profile=None, **kwargs):
+    """
+    Load multiple odML documents in parallel using a pool of worker processes.
+    Errors are not raised but returned with the result of the corresponding file.
+
+    :param filenames: list of paths of the files containing odML documents.
+    :param backend: File format of the files containing the odML documents.
+                    The default format is XML.
+    :param workers: Number of worker processes. Defaults to the number of CPUs;
+                    with a single worker the files are loaded in the current process.
+    :param show_warnings: Toggle whether to print warnings to the command line.
+                          Disabled by default to avoid interleaved output of
+                          the worker processes.
+    :param validation_profile: Name of the validation profile that is run after
+                               loading each document.
+    :param kwargs: Further arguments of the 'load' function e.g. 'include_paths'.
+    :return: list of LoadResults in the order of the provided file names.
+    """
+    filenames = list(filenames)
+    results = [None] * len(filenames)
+    for index, result in _iter_load(filenames, backend, workers, show_warnings,
+                                    validation_profile, kwargs):
+        results[index] = result
+
+    return results
+
+
+def iter_load_many(filenames, backend="xml", workers=None, show_warnings=False,
+                   validation_profile=None, **kwargs):
+    """
+    Load multiple odML documents in parallel and yield every LoadResult as soon
+    as its file has been loaded. Results are yielded in the order the files
+    have been loaded. See 'load_many' for the supported arguments.
+
+    :return: generator of LoadResults.
+    """
+    for _, result in _iter_load(list(filenames), backend, workers, show_warnings,
+                                validation_profile, kwargs):
+        yield result
 
 
 def save(obj, filename, backend="xml", **kwargs):
@@ -36,7 +202,9 @@ def save(obj, filename, backend="xml", **kwargs):
     :param kwargs: Writer backend keyword arguments e.g. for adding specific
                    stylesheets for xml documents or specifying an RDF format.
                    Refer to the documentation of the available parsers to check
-                   which arguments are supported.
+                   which arguments are supported. The 'validation_profile' keyword
+                   selects the validation profile run before saving e.g.
+                   'errors-only', 'structural' or 'full'.
     """
     writer = ODMLWriter(backend)
     if "." not in filename.split(os.pathsep)[-1]:
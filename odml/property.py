@@ -110,6 +110,9 @@ class BaseProperty(base.BaseObject):
 
     _format = frmt.Property
 
+    # Serialized values and their decode function of lazily loaded Properties.
+    _raw_values = None
+
     def __init__(self, name=None, values=None, parent=None, unit=None,
                  uncertainty=None, reference=None, definition=None,
                  dependency=None, dependency_value=None, dtype=None,
@@ -185,6 +188,51 @@ class BaseProperty(base.BaseObject):
     def __repr__(self):
         return "Property: {name = %s}" % self._name
 
+    @property
+    def _values(self):
+        if self._raw_values is not None:
+            self._decode_values()
+        return self._decoded_values
+
+    @_values.setter
+    def _values(self, new_values):
+        self._raw_values = None
+        self._decoded_values = new_values
+
+    def _set_raw_values(self, raw_values, decode, val_cardinality=None, report=None):
+        """
+        Stores serialized values that are only decoded when the values of the
+        Property are accessed for the first time. The decoded values are
+        converted and checked like values set via the 'values' attribute.
+        Used by the odML readers to load Property values lazily.
+
+        :param raw_values: serialized values.
+        :param decode: function returning the list of values of raw_values.
+        :param val_cardinality: values cardinality of the Property. It is set
+                                without validating the not yet decoded values.
+        :param report: Optional function called with the exception raised when
+                       the values cannot be decoded. Unless it raises itself, the
+                       Property keeps empty values. By default the exception is raised.
+        """
+        self._val_cardinality = format_cardinality(val_cardinality)
+        self._decoded_values = []
+        self._raw_values = (raw_values, decode, report)
+
+    def _decode_values(self):
+        raw = self._raw_values
+        self._raw_values = None
+        try:
+            self.values = raw[1](raw[0])
+        except Exception as exc:
+            # Keep the serialized values if they cannot be decoded.
+            self._raw_values = raw
+            if raw[2] is None:
+                raise
+
+            raw[2](exc)
+            self._raw_values = None
+            self._decoded_values = []
+
     @property
     def oid(self):
         """
@@ -242,6 +290,9 @@ class BaseProperty(base.BaseObject):
         """
         The data type of the value. Check odml.DType for supported data types.
         """
+        # Without dtype the type of lazily loaded values has to be inferred.
+        if self._dtype is None and self._raw_values is not None:
+            self._decode_values()
         return self._dtype
 
     @dtype.setter
@@ -6,7 +6,7 @@ Original files will never be overwritten. New files will be
 written either to a new directory at the current or a specified
 location.
 
-Usage: odmlconvert [-r] [-o OUT] SEARCHDIR
+Usage: odmlconvert [-r] [-t] [-o OUT] SEARCHDIR
 
 Arguments:
     SEARCHDIR       Directory to search for odML files.
@@ -17,6 +17,8 @@ Options:
                     written to the current directory.
     -r              Search recursively. Directory structures
                     will not be retained.
+    -t              Print the accumulated timings of all validation
+                    handlers run when loading recent version files.
     -h --help       Show this screen.
     --version       Show version.
 """
@@ -33,12 +35,13 @@ try:
 except ImportError:
     from io import StringIO
 
-import odml
-
 from odml.tools.converters import VersionConverter as VerConf
+from odml.tools.odmlparser import ODMLReader
+from odml.tools.sniffer import is_previous_version
+from odml.validation import merge_timings, timing_summary
 
 
-def run_conversion(file_list, output_dir, report, source_format="XML"):
+def run_conversion(file_list, output_dir, report, source_format="XML", timings=None):
     """
     Convert a list of odML files to the latest odML version.
     :param file_list: list of files to be converted.
@@ -47,6 +50,8 @@ def run_conversion(file_list, output_dir, report, source_format="XML"):
     :param report: Reporting StringIO.
     :param source_format: Original file format of the odML source files.
                           XML, JSON and YAML are supported, default is XML.
+    :param timings: Optional dictionary the timings of the validation handlers
+                    run when loading recent version files will be added to.
     """
     # Exceptions are kept as broad as possible to ignore any non-odML or
     # invalid odML files and ensuring everything that can be will be converted.
@@ -55,18 +60,30 @@ def run_conversion(file_list, output_dir, report, source_format="XML"):
         report.write("[Info] Handling file '%s'\n" % file_path)
         # When loading the current file succeeds, it is
         # a recent odML format file and can be ignored.
-        try:
-            odml.load(file_path, source_format)
+        # Files identified as previous version files are
+        # not loaded but converted right away.
+        doc = None
+        reader = ODMLReader(source_format, timing=timings is not None)
+        if not is_previous_version(file_path):
+            try:
+                doc = reader.from_file(file_path)
+            except Exception:
+                pass
+
+        if doc is not None:
             report.write("[Info] Skip recent version file '%s'" % file_path)
+            if timings is not None:
+                merge_timings(timings, reader.validation.timings)
+            continue
+
+        out_name = os.path.splitext(os.path.basename(file_path))[0]
+        outfile = os.path.join(output_dir, "%s_conv.xml" % out_name)
+        try:
+            VerConf(file_path).write_to_file(outfile, source_format)
         except Exception as exc:
-            out_name = os.path.splitext(os.path.basename(file_path))[0]
-            outfile = os.path.join(output_dir, "%s_conv.xml" % out_name)
-            try:
-                VerConf(file_path).write_to_file(outfile, source_format)
-            except Exception as exc:
-                # Ignore files we cannot parse or convert
-                report.write("[Error] version converting file '%s': '%s'\n" %
-                             (file_path, exc))
+            # Ignore files we cannot parse or convert
+            report.write("[Error] version converting file '%s': '%s'\n" %
+                         (file_path, exc))
 
 
 def main(args=None):
@@ -110,9 +127,14 @@ def main(args=None):
     report = StringIO()
     report.write("[Info] Files will be saved to '%s'\n" % out_dir)
 
-    run_conversion(xfiles, out_dir, report)
-    run_conversion(jfiles, out_dir, report, "JSON")
-    run_conversion(yfiles, out_dir, report, "YAML")
+    timings = {} if parser["-t"] else None
+
+    run_conversion(xfiles, out_dir, report, timings=timings)
+    run_conversion(jfiles, out_dir, report, "JSON", timings)
+    run_conversion(yfiles, out_dir, report, "YAML", timings)
+
+    if timings is not None:
+        report.write("[Info] Validation handler timings\n%s\n" % timing_summary(timings))
 
     print(report.getvalue())
     report.close()
@@ -7,7 +7,7 @@ Original files will never be overwritten. New files will be
 written either to a new directory at the current or a specified
 location.
 
-Usage: odmltordf [-r] [-o OUT] SEARCHDIR
+Usage: odmltordf [-r] [-t] [-o OUT] SEARCHDIR
 
 Arguments:
     SEARCHDIR       Directory to search for odML files.
@@ -18,6 +18,8 @@ Options:
                     written to the current directory.
     -r              Search recursively. Directory structures
                     will not be retained.
+    -t              Print the accumulated timings of all validation
+                    handlers run before exporting the documents.
     -h --help       Show this screen.
     --version       Show version.
 """
@@ -34,13 +36,13 @@ try:
 except ImportError:
     from io import StringIO
 
-import odml
-
 from odml.tools.odmlparser import ODMLReader, ODMLWriter
 from odml.tools.converters import VersionConverter as VerConf
+from odml.tools.sniffer import is_previous_version
+from odml.validation import timing_summary
 
 
-def run_rdf_export(odml_file, export_dir):
+def run_rdf_export(odml_file, export_dir, timings=None, doc=None):
     """
     Convert an odML file to an XML RDF file and
     export it to an export directory with the
@@ -48,17 +50,25 @@ def run_rdf_export(odml_file, export_dir):
     ending.
     :param odml_file: odML file to be converted to RDF.
     :param export_dir:
+    :param timings: Optional dictionary the timings of the validation handlers
+                    run before the export will be added to.
+    :param doc: Optional odml.Document already loaded from odml_file.
+                The file is only read if no document is provided.
     """
     out_name = os.path.splitext(os.path.basename(odml_file))[0]
     out_file = os.path.join(export_dir, "%s.rdf" % out_name)
-    doc = ODMLReader().from_file(odml_file)
-    ODMLWriter("RDF").write_file(doc, out_file)
+    if doc is None:
+        doc = ODMLReader().from_file(odml_file)
+    ODMLWriter("RDF").write_file(doc, out_file, timings=timings)
 
 
-def run_conversion(file_list, output_dir, rdf_dir, report, source_format="XML"):
+def run_conversion(file_list, output_dir, rdf_dir, report, source_format="XML",
+                   timings=None):
     """
     Convert a list of odML files to the latest odML version if required
     and export all files to XML RDF files in a specified output directory.
+    Every file is parsed once; version converted documents are exported
+    from memory.
     :param file_list: list of files to be exported to RDF.
     :param output_dir: Directory where odML files converted to
                        the latest odML version will be saved.
@@ -66,6 +76,8 @@ def run_conversion(file_list, output_dir, rdf_dir, report, source_format="XML"):
     :param report: Reporting StringIO.
     :param source_format: Original file format of the odML source files.
                           XML, JSON and YAML are supported, default is XML.
+    :param timings: Optional dictionary the timings of the validation handlers
+                    run before exporting the documents will be added to.
     """
     # Exceptions are kept as broad as possible to ignore any non-odML or
     # invalid odML files and ensuring everything that can be will be converted.
@@ -76,25 +88,40 @@ def run_conversion(file_list, output_dir, rdf_dir, report, source_format="XML"):
         # a recent odML format file and can be exported
         # to RDF right away. Otherwise it needs to be
         # converted to the latest odML version first.
-        try:
-            odml.load(file_path, source_format)
+        # Files identified as previous version files are
+        # not loaded but converted right away.
+        doc = None
+        if not is_previous_version(file_path):
+            try:
+                doc = ODMLReader(source_format).from_file(file_path)
+            except Exception:
+                pass
+
+        if doc is not None:
             report.write("[Info] RDF conversion of '%s'\n" % file_path)
-            run_rdf_export(file_path, rdf_dir)
-        except Exception as exc:
-            out_name = os.path.splitext(os.path.basename(file_path))[0]
-            outfile = os.path.join(output_dir, "%s_conv.xml" % out_name)
             try:
-                VerConf(file_path).write_to_file(outfile, source_format)
-                try:
-                    report.write("[Info] RDF conversion of '%s'\n" % outfile)
-                    run_rdf_export(outfile, rdf_dir)
-                except Exception as exc:
-                    report.write("[Error] converting '%s' to RDF: '%s'\n" %
-                                 (file_path, exc))
+                run_rdf_export(file_path, rdf_dir, timings, doc)
             except Exception as exc:
-                # Ignore files we cannot parse or convert
-                report.write("[Error] version converting file '%s': '%s'\n" %
+                report.write("[Error] converting '%s' to RDF: '%s'\n" %
                              (file_path, exc))
+            continue
+
+        out_name = os.path.splitext(os.path.basename(file_path))[0]
+        outfile = os.path.join(output_dir, "%s_conv.xml" % out_name)
+        try:
+            doc = VerConf(file_path).to_document(source_format, outfile, show_warnings=True)
+        except Exception as exc:
+            # Ignore files we cannot parse or convert
+            report.write("[Error] version converting file '%s': '%s'\n" %
+                         (file_path, exc))
+            continue
+
+        try:
+            report.write("[Info] RDF conversion of '%s'\n" % outfile)
+            run_rdf_export(outfile, rdf_dir, timings, doc)
+        except Exception as exc:
+            report.write("[Error] converting '%s' to RDF: '%s'\n" %
+                         (file_path, exc))
 
 
 def main(args=None):
@@ -139,9 +166,14 @@ def main(args=None):
     report = StringIO()
     report.write("[Info] Files will be saved to '%s'\n" % out_dir)
 
-    run_conversion(xfiles, out_dir, rdf_dir, report)
-    run_conversion(jfiles, out_dir, rdf_dir, report, "JSON")
-    run_conversion(yfiles, out_dir, rdf_dir, report, "YAML")
+    timings = {} if parser["-t"] else None
+
+    run_conversion(xfiles, out_dir, rdf_dir, report, timings=timings)
+    run_conversion(jfiles, out_dir, rdf_dir, report, "JSON", timings)
+    run_conversion(yfiles, out_dir, rdf_dir, report, "YAML", timings)
+
+    if timings is not None:
+        report.write("[Info] Validation handler timings\n%s\n" % timing_summary(timings))
 
     print(report.getvalue())
     report.close()
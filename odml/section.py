@@ -539,22 +539,34 @@ class BaseSection(base.Sectionable):
         if not isinstance(obj_list, Iterable):
             raise TypeError("'%s' object is not iterable" % type(obj_list).__name__)
 
+        obj_list = list(obj_list)
+        sec_names = set(sec.name for sec in self._sections)
+        prop_names = set(prop.name for prop in self._props)
+
         # Make sure only Sections and Properties with unique names will be added.
         for obj in obj_list:
             if not isinstance(obj, BaseSection) and not isinstance(obj, BaseProperty):
                 msg = "odml.Section.extend: Can only extend sections and properties."
                 raise ValueError(msg)
 
-            if isinstance(obj, BaseSection) and obj.name in self.sections:
+            if isinstance(obj, BaseSection) and obj.name in sec_names:
                 msg = "odml.Section.extend: Section with name '%s' already exists." % obj.name
                 raise KeyError(msg)
 
-            if isinstance(obj, BaseProperty) and obj.name in self.properties:
+            if isinstance(obj, BaseProperty) and obj.name in prop_names:
                 msg = "odml.Section.extend: Property with name '%s' already exists." % obj.name
                 raise KeyError(msg)
 
+            if isinstance(obj, BaseSection):
+                sec_names.add(obj.name)
+            else:
+                prop_names.add(obj.name)
+
+        # Add all children at once to avoid a name lookup per appended object.
+        self._sections.extend([obj for obj in obj_list if isinstance(obj, BaseSection)])
+        self._props.extend([obj for obj in obj_list if isinstance(obj, BaseProperty)])
         for obj in obj_list:
-            self.append(obj)
+            obj._parent = self
 
     def insert(self, position, obj):
         """
@@ -1,4 +1,6 @@
+from .archive import ArchiveDocument, ArchiveWriter
+from .binary_parser import BinaryReader, BinaryWriter
 from .dict_parser import DictReader, DictWriter
 from .odmlparser import ODMLReader, ODMLWriter
-from .rdf_converter import RDFReader, RDFWriter
+from .rdf_converter import RDFReader, RDFStreamWriter, RDFWriter
 from .xmlparser import XMLReader, XMLWriter
@@ -0,0 +1,411 @@
+"""
+The archive module provides access to the ArchiveWriter and ArchiveDocument classes.
+Both handle odML archives, a random access container for large odML documents.
+
+An odML archive is a binary odML document (see odml.tools.binary_parser) followed
+by a section index and a trailer; archives can therefore also be loaded by the
+BinaryReader. The layout of the appended data is as follows; all numbers are
+little endian:
+
+    - Section index: one fixed size entry per Section in document order,
+      containing the index of the parent entry, the byte offset of the Section
+      record and string table references to the Section name, type and id.
+    - Trailer: byte offset of the section index, number of index entries and
+      an 8 byte magic number.
+
+ArchiveDocument opens an archive via mmap and only reads the string table, the
+Document attributes and the section index. Sections are read from the file when
+they are accessed.
+
+Usage:
+    >>> ArchiveWriter(doc).write_file("file.odmla")
+    >>> with ArchiveDocument("file.odmla") as arc:
+    ...     sec = arc.get_section_by_path("/experiment/subject")
+"""
+import mmap
+import posixpath
+import struct
+
+from .binary_parser import BinaryReader, BinaryWriter, NONE_REF
+from .parser_utils import ParserException
+
+INDEX_MAGIC = b"ODMLIDX\x00"
+
+# Index of the parent entry or -1, offset of the Section record and
+# references to the Section name, type and id.
+INDEX_ENTRY = struct.Struct("<iQIII")
+
+# Offset of the section index, number of index entries and magic number.
+TRAILER = struct.Struct("<QI8s")
+
+
+class ArchiveWriter(BinaryWriter):
+    """
+    Creates an odML archive of an odML Document.
+
+    Usage:
+        >>> ArchiveWriter(doc).write_file("file.odmla")
+    """
+
+    def __init__(self, odml_document):
+        super(ArchiveWriter, self).__init__(odml_document)
+        self._entries = []
+        self._parents = [-1]
+
+    def to_bytes(self):
+        """
+        Returns the odML archive of the writers odML document.
+
+        :return: bytes.
+        """
+        self._entries = []
+        self._parents = [-1]
+
+        data = bytearray(super(ArchiveWriter, self).to_bytes())
+
+        index_offset = len(data)
+        for parent, offset, name, sec_type, oid in self._entries:
+            data += INDEX_ENTRY.pack(parent, self._body_offset + offset, name, sec_type, oid)
+        data += TRAILER.pack(index_offset, len(self._entries), INDEX_MAGIC)
+
+        return bytes(data)
+
+    def _write_section(self, buf, sec):
+        entry = len(self._entries)
+        self._entries.append((self._parents[-1], len(buf), self._ref(sec.name),
+                              self._ref(sec.type), self._ref(sec.id)))
+
+        self._parents.append(entry)
+        super(ArchiveWriter, self)._write_section(buf, sec)
+        self._parents.pop()
+
+
+class ArchiveDocument(object):
+    """
+    Read only, Document like view of an odML archive. The archive is memory mapped
+    and Sections are read from the file on first access. Accessed Sections are
+    complete odML Sections including all their Properties and subsections.
+
+    Top level Sections refer to a Document containing the archived Document attributes
+    as their parent. Subsections that are read directly, e.g. via get_section_by_path,
+    are not attached to a parent; subsections of an already read Section are taken
+    from this Section.
+
+    Usage:
+        >>> with ArchiveDocument("file.odmla") as arc:
+        ...     sec = arc.get_section_by_path("/experiment/subject")
+        ...     subjects = arc.find(type="subject", findAll=True)
+    """
+
+    def __init__(self, filename):
+        self._file = open(filename, "rb")
+        try:
+            self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ParserException("Cannot open empty file '%s' as odML archive." % filename)
+
+        self._reader = BinaryReader()
+        self._cache = {}
+        try:
+            offset = self._reader.read_header(self._data)
+            self._doc, _ = self._reader.read_document(self._data, offset, read_sections=False)
+            self._read_index()
+        except (struct.error, IndexError, UnicodeDecodeError) as exc:
+            self.close()
+            raise ParserException("Invalid odML archive: %s" % exc)
+        except ParserException:
+            self.close()
+            raise
+
+        self._doc._origin_file_name = filename
+
+    def __repr__(self):
+        return "<ArchiveDocument %s by %s (%d sections)>" % \
+               (self._doc.version, self._doc.author, len(self._top_level))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """
+        Closes the memory map and the underlying file. Already read Sections
+        remain valid.
+        """
+        if self._data is not None:
+            self._data.close()
+            self._data = None
+        self._file.close()
+
+    def _read_index(self):
+        data = self._data
+        trailer_offset = len(data) - TRAILER.size
+        if trailer_offset < 0:
+            raise ParserException("File is not an odML archive.")
+
+        index_offset, count, magic = TRAILER.unpack_from(data, trailer_offset)
+        if magic != INDEX_MAGIC or index_offset + count * INDEX_ENTRY.size != trailer_offset:
+            raise ParserException("File is not an odML archive.")
+
+        string = self._reader._str
+        self._parents = []
+        self._offsets = []
+        self._names = []
+        self._types = []
+        self._positions = []
+        self._children = {-1: []}
+        self._paths = {}
+        self._ids = {}
+
+        paths = []
+        for idx in range(count):
+            parent, offset, name, sec_type, oid = INDEX_ENTRY.unpack_from(
+                data, index_offset + idx * INDEX_ENTRY.size)
+            if not -1 <= parent < idx or name == NONE_REF:
+                raise ParserException("Invalid section index entry %d." % idx)
+
+            name = string(name)
+            siblings = self._children[parent]
+
+            self._parents.append(parent)
+            self._offsets.append(offset)
+            self._names.append(name)
+            self._types.append(string(sec_type))
+            self._positions.append(len(siblings))
+            self._children[idx] = []
+            siblings.append(idx)
+
+            path = "/" + name if parent < 0 else paths[parent] + "/" + name
+            paths.append(path)
+            self._paths[path] = idx
+            self._ids[string(oid)] = idx
+
+        self._top_level = self._children[-1]
+
+    def _section(self, idx):
+        """
+        Returns the Section of an index entry. The Section is taken from an already
+        read ancestor Section if available or read from the archive otherwise.
+        """
+        sec = self._cache.get(idx)
+        if sec is not None:
+            return sec
+
+        chain = []
+        ancestor = idx
+        while ancestor >= 0 and ancestor not in self._cache:
+            chain.append(ancestor)
+            ancestor = self._parents[ancestor]
+
+        if ancestor < 0:
+            if self._data is None:
+                raise ValueError("I/O operation on closed odML archive.")
+            sec, _ = self._reader.read_section(self._data, self._offsets[idx])
+            if self._parents[idx] < 0:
+                sec._parent = self._doc
+        else:
+            sec = self._cache[ancestor]
+            for entry in reversed(chain):
+                sec = sec.sections[self._positions[entry]]
+
+        self._cache[idx] = sec
+        return sec
+
+    @property
+    def document(self):
+        return self
+
+    @property
+    def parent(self):
+        return None
+
+    @property
+    def id(self):
+        """
+        The uuid of the archived Document.
+        """
+        return self._doc.id
+
+    @property
+    def author(self):
+        """
+        The author of the archived Document.
+        """
+        return self._doc.author
+
+    @property
+    def version(self):
+        """
+        The version of the archived Document.
+        """
+        return self._doc.version
+
+    @property
+    def date(self):
+        """
+        The date of the archived Document.
+        """
+        return self._doc.date
+
+    @property
+    def repository(self):
+        """
+        The repository of the archived Document.
+        """
+        return self._doc.repository
+
+    @property
+    def sections(self):
+        """
+        The list of top level Sections. All top level Sections are read.
+        """
+        return [self._section(idx) for idx in self._top_level]
+
+    def section_paths(self):
+        """
+        Returns the absolute paths of all archived Sections in document order
+        without reading any Section.
+        """
+        return list(self._paths)
+
+    def get_section_by_path(self, path):
+        """
+        Find a Section through an absolute or a relative path like "name1/name2".
+        Only the found Section is read from the archive.
+        Raises ValueError if not found.
+
+        :param path: path like "/name1/name2"
+        :type path: str
+        """
+        norm_path = posixpath.normpath("/" + path.lstrip("/"))
+        if path in ("", "/") or norm_path not in self._paths:
+            raise ValueError("Section with path '%s' does not exist" % path)
+
+        return self._section(self._paths[norm_path])
+
+    def get_property_by_path(self, path):
+        """
+        Find a Property through a path like "/name1/name2:property_name"
+        Raises ValueError if not found.
+
+        :param path: path like "/name1/name2:property_name"
+        :type path: str
+        """
+        laststep = path.split(":")
+        found = self.get_section_by_path(laststep[0])
+        return found._match_iterable(found.properties, ":".join(laststep[1:]))
+
+    def get_section_by_id(self, oid):
+        """
+        Returns the Section with the given id or None if the archive contains
+        no such Section. Only the found Section is read from the archive.
+
+        :param oid: id of the Section.
+        """
+        idx = self._ids.get(str(oid))
+        if idx is None:
+            return None
+
+        return self._section(idx)
+
+    def itersections(self, recursive=True, yield_self=False,
+                     filter_func=lambda x: True, max_depth=None):
+        """
+        Iterate each Section of the archive in the same order as
+        odml.Document.itersections. Sections are read when they are reached,
+        only top level Sections up to the last yielded Section are read.
+
+        :param recursive: iterate all child sections recursively (deprecated)
+        :type recursive: bool
+
+        :param yield_self: kept for compatibility with odml.Document.itersections;
+                           the archive itself is never yielded.
+        :type yield_self: bool
+
+        :param filter_func: accepts a function that will be applied to each
+                            iterable. Yields iterable if function returns True
+        :type filter_func: function
+        :param max_depth: number of layers in the document tree to include in the search.
+        """
+        if max_depth is not None and max_depth <= 0:
+            return
+
+        stack = [(idx, 1) for idx in self._top_level]
+        while stack:
+            (idx, level) = stack.pop(0)
+            sec = self._section(idx)
+            if filter_func(sec):
+                yield sec
+
+            if max_depth is None or level < max_depth:
+                for child in self._children[idx]:
+                    stack.append((child, level + 1))
+
+    def iterproperties(self, max_depth=None, filter_func=lambda x: True):
+        """
+        Iterate each Property of the archived Sections.
+
+        :param max_depth: iterate all properties recursively if None, only to
+                          a certain level otherwise
+        :param filter_func: accepts a function that will be applied to each
+                            iterable. Yields iterable if function returns True
+        """
+        for sec in self.itersections(max_depth=max_depth):
+            for prop in sec.properties:
+                if filter_func(prop):
+                    yield prop
+
+    def find(self, key=None, type=None, findAll=False, include_subtype=False):
+        """
+        Returns the first top level Section named *key* of type *type*.
+        Names and types are matched against the section index and only the
+        matching Sections are read from the archive.
+
+        :param key: string to search against an odML objects name.
+        :param type: type of an odML object.
+        :param findAll: include further matches after the first one in the result.
+        :param include_subtype: splits an objects type at '/' and matches the parts
+                                against the provided type.
+        """
+        if type:
+            type = type.lower()
+
+        ret = []
+        for idx in self._top_level:
+            if key is not None and self._names[idx] != key:
+                continue
+
+            if type is not None:
+                sec_type = (self._types[idx] or "").lower()
+                if sec_type != type and not (include_subtype and
+                                             type in sec_type.split("/")[:-1]):
+                    continue
+
+            if not findAll:
+                return self._section(idx)
+            ret.append(self._section(idx))
+
+        if ret:
+            return ret
+
+    def load(self):
+        """
+        Reads the whole archive and returns it as an odml.Document.
+        """
+        if self._data is None:
+            raise ValueError("I/O operation on closed odML archive.")
+
+        doc = self._reader.from_bytes(self._data)
+        doc._origin_file_name = self._doc._origin_file_name
+        return doc
+
+
+def load(filename):
+    """
+    Shortcut function for ArchiveDocument(filename).load().
+    """
+    with ArchiveDocument(filename) as arc:
+        return arc.load()
@@ -0,0 +1,557 @@
+"""
+The binary_parser module provides access to the BinaryWriter and BinaryReader classes.
+Both handle the conversion of odML documents from and to a compact binary format.
+
+The binary format is meant for fast saving and loading of odML documents and
+stores all values in their native representation, no string conversion of values
+is required. The format is laid out as follows; all numbers are little endian:
+
+    - 8 byte magic number, format version and the number of table strings.
+    - String table: every string is stored once as UTF-8 with a length prefix.
+      All names, types, units, definitions and string values refer to an entry
+      in this table.
+    - Document record followed by its Sections.
+    - Every Section record is prefixed by its length in bytes, which allows
+      readers to skip unneeded subtrees. A Section record contains its attributes,
+      its Properties and its child Sections.
+    - Property records contain their attributes followed by a typed value array.
+
+The parser can be invoked standalone:
+    python -m odml.tools.binary_parser file.odmlb
+"""
+import datetime
+import struct
+
+import odml
+
+from .. import base
+from .. import format as ofmt
+from ..info import FORMAT_VERSION
+from .parser_utils import InvalidVersionException, ParserException, open_file
+
+MAGIC = b"ODMLBIN\x00"
+BINARY_VERSION = 1
+
+# String reference used for None values.
+NONE_REF = 0xFFFFFFFF
+
+# Binary format version, number of strings in the string table.
+HEADER = struct.Struct("<HI")
+STR_LEN = struct.Struct("<I")
+SEC_LEN = struct.Struct("<Q")
+
+# References to odML version, id, author, version and repository; date flag and
+# ordinal; number of Sections.
+DOCUMENT = struct.Struct("<5IBqI")
+
+# References to id, name, type, definition, reference, repository, link and include;
+# Section and Property cardinality; number of Properties and Sections.
+SECTION = struct.Struct("<8IBqqBqqII")
+
+# References to id, name, dtype, unit, reference, definition, dependency,
+# dependency value and value origin; uncertainty; value cardinality;
+# value type and number of values.
+PROPERTY = struct.Struct("<9IBqdBqqBI")
+
+# Value types of the typed Property value arrays.
+VAL_EMPTY = 0
+VAL_INT = 1
+VAL_FLOAT = 2
+VAL_BOOL = 3
+VAL_STRING = 4
+VAL_DATE = 5
+VAL_TIME = 6
+VAL_DATETIME = 7
+VAL_TUPLE = 8
+VAL_BIGINT = 9
+
+INT64_MIN = -2 ** 63
+INT64_MAX = 2 ** 63 - 1
+
+DATETIME_BASE = datetime.datetime(1, 1, 1)
+
+
+def _value_type(values):
+    """
+    Returns the binary value type of a list of odML values. Raises a ParserException
+    if the values cannot be stored in a typed array.
+
+    :param values: list of odML values.
+    :return: binary value type.
+    """
+    if not values:
+        return VAL_EMPTY
+
+    val_type = None
+    py_type = type(values[0])
+    if not all(type(val) is py_type for val in values):
+        val_type = None
+    elif py_type is bool:
+        val_type = VAL_BOOL
+    elif py_type is int:
+        val_type = VAL_INT
+        if not all(INT64_MIN <= val <= INT64_MAX for val in values):
+            val_type = VAL_BIGINT
+    elif py_type is float:
+        val_type = VAL_FLOAT
+    elif py_type is str:
+        val_type = VAL_STRING
+    elif py_type is datetime.date:
+        val_type = VAL_DATE
+    elif py_type in (datetime.datetime, datetime.time):
+        # Timezone information is not supported by odML dtypes.
+        if all(val.tzinfo is None for val in values):
+            val_type = VAL_DATETIME if py_type is datetime.datetime else VAL_TIME
+    elif py_type is list:
+        if len(set(map(len, values))) == 1 and \
+                all(isinstance(item, str) for val in values for item in val):
+            val_type = VAL_TUPLE
+
+    if val_type is None:
+        raise ParserException("Values of type '%s' cannot be saved in the binary format"
+                              % py_type.__name__)
+    return val_type
+
+
+def _pack_cardinality(card):
+    """
+    Returns a tuple of cardinality flag, minimum and maximum; None is stored as -1.
+    """
+    if card is None:
+        return 0, -1, -1
+
+    min_val, max_val = card
+    return (1, -1 if min_val is None else min_val,
+            -1 if max_val is None else max_val)
+
+
+def _unpack_cardinality(flag, min_val, max_val):
+    """
+    Returns a cardinality tuple or None from its packed representation.
+    """
+    if not flag:
+        return None
+
+    return (None if min_val < 0 else min_val,
+            None if max_val < 0 else max_val)
+
+
+class BinaryWriter:
+    """
+    Creates the binary representation of an odML Document.
+
+    Usage:
+        >>> BinaryWriter(doc).write_file("file.odmlb")
+    """
+
+    def __init__(self, odml_document):
+        self.doc = odml_document
+        self._strings = {}
+        self._table = []
+        self._body_offset = 0
+
+    def _ref(self, val):
+        """
+        Returns the string table reference of a value; adds the value to the
+        string table if required.
+
+        :param val: string or None.
+        :return: string table reference.
+        """
+        if val is None:
+            return NONE_REF
+
+        if not isinstance(val, str):
+            val = str(val)
+
+        ref = self._strings.get(val)
+        if ref is None:
+            ref = len(self._table)
+            self._strings[val] = ref
+            self._table.append(val)
+        return ref
+
+    def to_bytes(self):
+        """
+        Returns the binary representation of the writers odML document.
+
+        :return: bytes.
+        """
+        self._strings = {}
+        self._table = []
+
+        body = bytearray()
+        self._write_document(body)
+
+        data = bytearray(MAGIC)
+        data += HEADER.pack(BINARY_VERSION, len(self._table))
+        for val in self._table:
+            encoded = val.encode("utf-8")
+            data += STR_LEN.pack(len(encoded))
+            data += encoded
+        self._body_offset = len(data)
+        data += body
+
+        return bytes(data)
+
+    def write_file(self, filename):
+        """
+        Saves the writers odML document to a binary file.
+
+        :param filename: location and name where the file will be written to.
+        """
+        # calculate the data before opening the file in case we get any exception
+        data = self.to_bytes()
+
+        with open_file(filename, "wb") as file:
+            file.write(data)
+
+    def _write_document(self, buf):
+        doc = self.doc
+        date = doc.date
+        buf += DOCUMENT.pack(self._ref(FORMAT_VERSION), self._ref(doc.id),
+                             self._ref(doc.author), self._ref(doc.version),
+                             self._ref(doc.repository), 0 if date is None else 1,
+                             0 if date is None else date.toordinal(), len(doc.sections))
+
+        for sec in doc.sections:
+            self._write_section(buf, sec)
+
+    def _write_section(self, buf, sec):
+        start = len(buf)
+        buf += SEC_LEN.pack(0)
+
+        buf += SECTION.pack(self._ref(sec.id), self._ref(sec.name), self._ref(sec.type),
+                            self._ref(sec.definition), self._ref(sec.reference),
+                            self._ref(sec._repository), self._ref(sec._link),
+                            self._ref(sec._include),
+                            *(_pack_cardinality(sec.sec_cardinality) +
+                              _pack_cardinality(sec.prop_cardinality) +
+                              (len(sec.properties), len(sec.sections))))
+
+        for prop in sec.properties:
+            self._write_property(buf, prop)
+
+        for child in sec.sections:
+            self._write_section(buf, child)
+
+        SEC_LEN.pack_into(buf, start, len(buf) - start - SEC_LEN.size)
+
+    def _write_property(self, buf, prop):
+        values = prop.values
+        val_type = _value_type(values)
+
+        uncertainty = prop.uncertainty
+        unc_type, unc_int, unc_float = 0, 0, 0.0
+        if isinstance(uncertainty, int):
+            unc_type, unc_int = 1, uncertainty
+        elif isinstance(uncertainty, float):
+            unc_type, unc_float = 2, uncertainty
+        elif uncertainty is not None:
+            # Uncertainties read from text files are not converted to numbers.
+            unc_type, unc_int = 3, self._ref(uncertainty)
+
+        buf += PROPERTY.pack(self._ref(prop.id), self._ref(prop.name), self._ref(prop.dtype),
+                             self._ref(prop.unit), self._ref(prop.reference),
+                             self._ref(prop.definition), self._ref(prop.dependency),
+                             self._ref(prop.dependency_value), self._ref(prop.value_origin),
+                             unc_type, unc_int, unc_float,
+                             *(_pack_cardinality(prop.val_cardinality) +
+                               (val_type, len(values))))
+
+        count = len(values)
+        if val_type == VAL_INT:
+            buf += struct.pack("<%dq" % count, *values)
+        elif val_type == VAL_FLOAT:
+            buf += struct.pack("<%dd" % count, *values)
+        elif val_type == VAL_BOOL:
+            buf += bytes(values)
+        elif val_type in (VAL_STRING, VAL_BIGINT):
+            buf += struct.pack("<%dI" % count, *map(self._ref, values))
+        elif val_type == VAL_DATE:
+            buf += struct.pack("<%dq" % count, *[val.toordinal() for val in values])
+        elif val_type == VAL_TIME:
+            buf += struct.pack("<%dq" % count, *[
+                ((val.hour * 60 + val.minute) * 60 + val.second) * 1000000 + val.microsecond
+                for val in values])
+        elif val_type == VAL_DATETIME:
+            buf += struct.pack("<%dq" % count, *[
+                (val - DATETIME_BASE) // datetime.timedelta(microseconds=1)
+                for val in values])
+        elif val_type == VAL_TUPLE:
+            size = len(values[0])
+            buf += STR_LEN.pack(size)
+            buf += struct.pack("<%dI" % (count * size),
+                               *[self._ref(item) for val in values for item in val])
+
+
+class BinaryReader(object):
+    """
+    A reader to parse binary odML files or bytes into odML data structures.
+    Since binary files are only written from validated documents, the odML
+    objects are restored directly from their stored state.
+
+    Usage:
+        >>> doc = BinaryReader().from_file("file.odmlb")
+    """
+
+    def __init__(self):
+        self._table = []
+
+    def from_file(self, filename):
+        """
+        Parses a binary odML file and returns an odML data structure.
+        If the file cannot be parsed, a ParserException is raised.
+
+        :param filename: path to a binary odML file.
+        :returns: a parsed odml.Document.
+        """
+        with open_file(filename, "rb") as file:
+            return self.from_bytes(file.read())
+
+    def from_bytes(self, data):
+        """
+        Parses binary odML content and returns an odML data structure.
+        If the content cannot be parsed, a ParserException is raised.
+
+        :param data: bytes like object containing a binary odML document.
+        :returns: a parsed odml.Document.
+        """
+        try:
+            offset = self.read_header(data)
+            doc, _ = self.read_document(data, offset)
+        except (struct.error, IndexError, UnicodeDecodeError) as exc:
+            raise ParserException("Invalid binary odML content: %s" % exc)
+
+        return doc
+
+    def read_header(self, data):
+        """
+        Checks the header of binary odML content and reads its string table.
+
+        :param data: bytes like object containing a binary odML document.
+        :returns: offset of the document record.
+        """
+        if bytes(data[:len(MAGIC)]) != MAGIC:
+            raise ParserException("Content is not a binary odML document.")
+
+        offset = len(MAGIC)
+        version, count = HEADER.unpack_from(data, offset)
+        if version != BINARY_VERSION:
+            raise ParserException("Unsupported binary odML format version '%s'." % version)
+        offset += HEADER.size
+
+        table = []
+        data = memoryview(data)
+        for _ in range(count):
+            length, = STR_LEN.unpack_from(data, offset)
+            offset += STR_LEN.size
+            table.append(str(data[offset:offset + length], "utf-8"))
+            offset += length
+
+        self._table = table
+        return offset
+
+    def _str(self, ref):
+        return None if ref == NONE_REF else self._table[ref]
+
+    def read_document(self, data, offset, read_sections=True):
+        """
+        Reads the Document record starting at offset.
+
+        :param data: bytes like object containing a binary odML document.
+        :param offset: offset of the Document record.
+        :param read_sections: if False, only the Document attributes are read
+                              and the returned Document contains no Sections.
+        :returns: tuple of the parsed odml.Document and the offset of the next record.
+        """
+        fields = DOCUMENT.unpack_from(data, offset)
+        offset += DOCUMENT.size
+
+        odml_version = self._str(fields[0])
+        if odml_version != FORMAT_VERSION:
+            raise InvalidVersionException("Cannot parse binary odML document with "
+                                          "format version '%s'." % odml_version)
+
+        doc = _new(ofmt.Document)
+        doc._sections = base.SmartList(odml.section.BaseSection)
+        doc._id = self._str(fields[1])
+        doc._author = self._str(fields[2])
+        doc._version = self._str(fields[3])
+        doc._repository = self._str(fields[4])
+        doc._date = datetime.date.fromordinal(fields[6]) if fields[5] else None
+        doc._origin_file_name = None
+
+        if not read_sections:
+            return doc, offset
+
+        sections = []
+        for _ in range(fields[7]):
+            sec, offset = self.read_section(data, offset)
+            sections.append(sec)
+        _attach(doc, doc._sections, sections)
+
+        return doc, offset
+
+    def read_section(self, data, offset):
+        """
+        Reads the Section record starting at offset including all its
+        Properties and subsections.
+
+        :param data: bytes like object containing a binary odML document.
+        :param offset: offset of the Section record.
+        :returns: tuple of the parsed odml.Section and the offset of the next record.
+        """
+        length, = SEC_LEN.unpack_from(data, offset)
+        offset += SEC_LEN.size
+        end = offset + length
+
+        fields = SECTION.unpack_from(data, offset)
+        offset += SECTION.size
+
+        sec = _new(ofmt.Section)
+        sec._sections = base.SmartList(odml.section.BaseSection)
+        sec._props = base.SmartList(odml.property.BaseProperty)
+        sec._parent = None
+        sec._id = self._str(fields[0])
+        sec._name = self._str(fields[1])
+        sec.type = self._str(fields[2])
+        sec._definition = self._str(fields[3])
+        sec._reference = self._str(fields[4])
+        sec._repository = self._str(fields[5])
+        sec._link = self._str(fields[6])
+        sec._include = self._str(fields[7])
+        sec._sec_cardinality = _unpack_cardinality(*fields[8:11])
+        sec._prop_cardinality = _unpack_cardinality(*fields[11:14])
+
+        props = []
+        for _ in range(fields[14]):
+            prop, offset = self._read_property(data, offset)
+            props.append(prop)
+        _attach(sec, sec._props, props)
+
+        sections = []
+        for _ in range(fields[15]):
+            child, offset = self.read_section(data, offset)
+            sections.append(child)
+        _attach(sec, sec._sections, sections)
+
+        if offset != end:
+            raise ParserException("Invalid length of Section record '%s'." % sec.name)
+
+        return sec, end
+
+    @staticmethod
+    def skip_section(data, offset):
+        """
+        Returns the offset of the record following the Section record at offset
+        without parsing the Section.
+
+        :param data: bytes like object containing a binary odML document.
+        :param offset: offset of the Section record.
+        :returns: offset of the next record.
+        """
+        length, = SEC_LEN.unpack_from(data, offset)
+        return offset + SEC_LEN.size + length
+
+    def _read_property(self, data, offset):
+        fields = PROPERTY.unpack_from(data, offset)
+        offset += PROPERTY.size
+
+        prop = _new(ofmt.Property)
+        prop._parent = None
+        prop._id = self._str(fields[0])
+        prop._name = self._str(fields[1])
+        prop._dtype = self._str(fields[2])
+        prop._unit = self._str(fields[3])
+        prop._reference = self._str(fields[4])
+        prop._definition = self._str(fields[5])
+        prop._dependency = self._str(fields[6])
+        prop._dependency_value = self._str(fields[7])
+        prop._value_origin = self._str(fields[8])
+        if fields[9] == 3:
+            prop._uncertainty = self._str(fields[10])
+        else:
+            prop._uncertainty = (None, fields[10], fields[11])[fields[9]]
+        prop._val_cardinality = _unpack_cardinality(*fields[12:15])
+
+        val_type, count = fields[15], fields[16]
+        values = []
+        if val_type in (VAL_INT, VAL_DATE, VAL_TIME, VAL_DATETIME):
+            ints = struct.unpack_from("<%dq" % count, data, offset)
+            offset += 8 * count
+            if val_type == VAL_INT:
+                values = list(ints)
+            elif val_type == VAL_DATE:
+                values = [datetime.date.fromordinal(val) for val in ints]
+            elif val_type == VAL_TIME:
+                values = [(datetime.datetime.min +
+                           datetime.timedelta(microseconds=val)).time() for val in ints]
+            else:
+                values = [DATETIME_BASE + datetime.timedelta(microseconds=val)
+                          for val in ints]
+        elif val_type == VAL_FLOAT:
+            values = list(struct.unpack_from("<%dd" % count, data, offset))
+            offset += 8 * count
+        elif val_type == VAL_BOOL:
+            values = [bool(val) for val in bytes(data[offset:offset + count])]
+            offset += count
+        elif val_type in (VAL_STRING, VAL_BIGINT):
+            table = self._table
+            values = [table[ref] for ref in struct.unpack_from("<%dI" % count, data, offset)]
+            offset += 4 * count
+            if val_type == VAL_BIGINT:
+                values = [int(val) for val in values]
+        elif val_type == VAL_TUPLE:
+            size, = STR_LEN.unpack_from(data, offset)
+            offset += STR_LEN.size
+            table = self._table
+            items = [table[ref] for ref in
+                     struct.unpack_from("<%dI" % (count * size), data, offset)]
+            offset += 4 * count * size
+            values = [items[i:i + size] for i in range(0, count * size, size)]
+        elif val_type != VAL_EMPTY:
+            raise ParserException("Unknown value type '%s' of Property '%s'."
+                                  % (val_type, prop.name))
+        prop._values = values
+
+        return prop, offset
+
+
+def _new(fmt):
+    """
+    Returns an uninitialized instance of the odML class of the format class fmt.
+    """
+    cls = getattr(odml.getImplementation(), fmt.__class__.__name__)
+    return cls.__new__(cls)
+
+
+def _attach(parent, child_list, children):
+    """
+    Adds restored children to the child list of their parent.
+    """
+    child_list.extend(children)
+    for child in children:
+        child._parent = parent
+
+
+def load(filename):
+    """
+    Shortcut function for BinaryReader().from_file(filename).
+    """
+    return BinaryReader().from_file(filename)
+
+
+if __name__ == '__main__':
+    import argparse
+    import sys
+    import odml.tools.dumper as dumper
+
+    args = sys.argv[1:]
+
+    desc = "Print content of a binary odml file to the stdout"
+    parser = argparse.ArgumentParser(description=desc)
+    parser.add_argument("odml_file", help="Path to binary odml file")
+    args = parser.parse_args(args)
+
+    dumper.dump_doc(load(args.odml_file))
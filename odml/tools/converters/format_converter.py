@@ -7,7 +7,7 @@ A full list of the available odML output formats is available via the
 CONVERSION_FORMATS constant.
 
 Command line usage:
-python -m <in_dir> <odml_out_format> [-out <out_dir>] [-r]
+python -m <in_dir> <odml_out_format> [-out <out_dir>] [-r] [-j <jobs>] [-s {mtime,hash}]
 
 Examples:
 1) >> python -m odml.tools.converters.format_converter <in_dir> v1_1 -out <out_dir> -r
@@ -19,19 +19,31 @@ Examples:
 
     Converts files from path <in_dir> to .odml and writes them
     to <in_dir_odml> not including subdirectories.
+
+3) >> python -m odml.tools.converters.format_converter <in_dir> turtle -r -j 8 -s hash
+
+    Converts files from the path <in_dir> including subdirectories to turtle
+    using 8 processes. Files converted by a previous run whose content has not
+    changed since are skipped, see FormatConverter.convert_dir for details.
 """
 
 import argparse
 import copy
+import hashlib
+import json
 import os
-import re
 import sys
+import time
+
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 import odml
 
-from .. import RDFWriter
+from .. import RDFStreamWriter, RDFWriter
 from . import VersionConverter
 from ..parser_utils import RDF_CONVERSION_FORMATS
+from ..rdf_converter import STREAM_FORMATS
 
 
 CONVERSION_FORMATS = copy.deepcopy(RDF_CONVERSION_FORMATS)
@@ -40,6 +52,15 @@ CONVERSION_FORMATS.update({
     'odml': '.odml'
 })
 
+# Name of the manifest file in the output directory recording converted files.
+MANIFEST_NAME = ".odml_conversion_manifest"
+
+# Supported modes of skipping files that have already been converted.
+SKIP_MODES = ("mtime", "hash")
+
+ConversionSummary = namedtuple("ConversionSummary",
+                               ["converted", "skipped", "failed", "seconds"])
+
 
 class FormatConverter(object):
     """
@@ -52,7 +73,7 @@ class FormatConverter(object):
         Enables usage of the argparse for calling convert_dir(...)
 
         Usage:
-        python -m <in_dir> <odml_out_format> [-out <out_dir>] [-r]
+        python -m <in_dir> <odml_out_format> [-out <out_dir>] [-r] [-j <jobs>] [-s {mtime,hash}]
 
         Examples:
           1) >> python -m odml.tools.converters.format_converter <in_dir> v1_1 -out <out_dir> -r
@@ -73,14 +94,28 @@ class FormatConverter(object):
         parser.add_argument("-out", "--output_dir", help="Path for output directory")
         parser.add_argument("-r", "--recursive", action="store_true",
                             help="Enable converting files from subdirectories")
+        parser.add_argument("-j", "--jobs", type=int, default=1,
+                            help="Number of processes converting files in parallel")
+        parser.add_argument("-s", "--skip", choices=SKIP_MODES,
+                            help="Skip files that are unchanged since their last "
+                                 "conversion by modification time or content hash")
         args = parser.parse_args(args)
         recursive = bool(args.recursive)
-        cls.convert_dir(args.input_dir, args.output_dir, recursive, args.result_format)
+        cls.convert_dir(args.input_dir, args.output_dir, recursive, args.result_format,
+                        jobs=args.jobs, skip=args.skip)
 
     @classmethod
-    def convert_dir(cls, input_dir, output_dir, parse_subdirs, res_format):
+    def convert_dir(cls, input_dir, output_dir, parse_subdirs, res_format,
+                    jobs=1, skip=None):
         """
         Convert files from given input directory to the specified res_format.
+        Files that cannot be converted are reported and do not stop the conversion.
+        A summary of the converted, skipped and failed files is printed at the end.
+
+        When skip is set, converted files are recorded in a manifest file in the
+        output directory and files that are unchanged since their last conversion
+        are not converted again; interrupted conversions of large directory trees
+        can therefore be resumed by running the conversion again.
 
         :param input_dir: Path to input directory
         :param output_dir: Path for output directory.
@@ -91,11 +126,25 @@ class FormatConverter(object):
                                              "odml" (version 1.1 .xml to .odml files)
                                              "turtle", "nt" etc. (version 1.1 to RDF files)
                                              (full list of RDF serializers in CONVERSION_FORMATS)
+        :param jobs: Number of processes converting files in parallel. With a single
+                     job all files are converted in the current process.
+        :param skip: None to convert all files or one of SKIP_MODES:
+                     "mtime" skips files with an output file newer than the input file,
+                     "hash" skips files with an output file whose input file content
+                     hash is unchanged since the conversion recorded in the manifest.
+        :return: ConversionSummary of the numbers of converted, skipped and failed
+                 files and the duration of the conversion in seconds.
         """
         if res_format not in CONVERSION_FORMATS:
             raise ValueError("Format for output files is incorrect. "
                              "Please choose from the list: {}".format(list(CONVERSION_FORMATS)))
 
+        if skip is not None and skip not in SKIP_MODES:
+            raise ValueError("Skip mode is incorrect. "
+                             "Please choose from the list: {}".format(list(SKIP_MODES)))
+
+        start = time.time()
+
         cls._check_input_output_directory(input_dir, output_dir)
         input_dir = os.path.join(input_dir, '')
 
@@ -109,19 +158,156 @@ class FormatConverter(object):
 
         output_dir = os.path.join(output_dir, '')
 
+        tasks = []
         if not parse_subdirs:
             for file_name in os.listdir(input_dir):
                 if os.path.isfile(os.path.join(input_dir, file_name)):
-                    cls._convert_file(os.path.join(input_dir, file_name),
-                                      os.path.join(output_dir, file_name), res_format)
+                    tasks.append((os.path.join(input_dir, file_name),
+                                  os.path.join(output_dir, file_name)))
         else:
             for dir_path, _, file_names in os.walk(input_dir):
+                rel_dir = os.path.relpath(dir_path, input_dir)
+                out_dir = os.path.normpath(os.path.join(output_dir, rel_dir))
                 for file_name in file_names:
-                    in_file_path = os.path.join(dir_path, file_name)
-                    out_dir = re.sub(r"" + input_dir, r"" + output_dir, dir_path)
-                    out_file_path = os.path.join(out_dir, file_name)
-                    cls._create_sub_directory(out_dir)
-                    cls._convert_file(in_file_path, out_file_path, res_format)
+                    tasks.append((os.path.join(dir_path, file_name),
+                                  os.path.join(out_dir, file_name)))
+
+        manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+        manifest = cls._read_manifest(manifest_path) if skip else {}
+
+        todo = []
+        skipped = 0
+        for in_path, out_path in tasks:
+            if skip and os.path.abspath(in_path) == os.path.abspath(manifest_path):
+                continue
+
+            rel_path = os.path.relpath(in_path, input_dir)
+            out_path = cls._output_path(out_path, res_format)
+            content_hash = _file_hash(in_path) if skip == "hash" else None
+
+            if skip and cls._is_unchanged(in_path, out_path, skip, res_format,
+                                          manifest.get(rel_path), content_hash):
+                skipped += 1
+                continue
+
+            cls._create_sub_directory(os.path.dirname(out_path))
+            todo.append((rel_path, in_path, out_path, res_format, content_hash))
+
+        converted = 0
+        failed = 0
+        seconds = 0.0
+
+        manifest_file = open(manifest_path, "a") if skip else None
+        try:
+            for rel_path, in_path, res_path, content_hash, duration, error in \
+                    _iter_convert(todo, jobs):
+                seconds += duration
+                if error is not None:
+                    failed += 1
+                    print("[Error] converting file '%s': %s" % (in_path, error))
+                    continue
+
+                converted += 1
+                if manifest_file is not None:
+                    entry = {"input": rel_path,
+                             "output": os.path.relpath(res_path, output_dir),
+                             "format": res_format, "hash": content_hash}
+                    manifest_file.write("%s\n" % json.dumps(entry))
+                    manifest_file.flush()
+                    manifest[rel_path] = entry
+        finally:
+            if manifest_file is not None:
+                manifest_file.close()
+
+        if skip:
+            cls._write_manifest(manifest_path, manifest)
+
+        summary = ConversionSummary(converted, skipped, failed, time.time() - start)
+        print("[Info] Converted %d, skipped %d and failed to convert %d files in %.2fs "
+              "(%.2fs conversion time)" % (converted, skipped, failed,
+                                           summary.seconds, seconds))
+
+        return summary
+
+    @staticmethod
+    def _output_path(output_path, res_format):
+        """
+        Returns the output file path with the file extension adjusted to the
+        output format like the file path written by _convert_file.
+
+        :param output_path: full path including file name of the output file.
+        :param res_format: Format the input file will be converted to.
+        """
+        if res_format == "v1_1":
+            if not output_path.endswith((".xml", ".odml")):
+                output_path = "%s.xml" % output_path
+        elif not output_path.endswith(CONVERSION_FORMATS[res_format]):
+            file_path, _ = os.path.splitext(output_path)
+            output_path = file_path + CONVERSION_FORMATS[res_format]
+
+        return output_path
+
+    @staticmethod
+    def _is_unchanged(input_path, output_path, skip, res_format, entry, content_hash):
+        """
+        Returns True if the output file of an input file is up to date.
+
+        :param input_path: path of the input file.
+        :param output_path: path of the output file.
+        :param skip: skip mode, one of SKIP_MODES.
+        :param res_format: Format the input file is converted to.
+        :param entry: manifest entry of the input file or None.
+        :param content_hash: content hash of the input file; required by the
+                             "hash" skip mode.
+        """
+        if not os.path.isfile(output_path):
+            return False
+
+        if skip == "mtime":
+            return os.path.getmtime(output_path) >= os.path.getmtime(input_path)
+
+        return entry is not None and entry.get("format") == res_format and \
+            entry.get("hash") == content_hash
+
+    @staticmethod
+    def _read_manifest(manifest_path):
+        """
+        Reads the entries of a manifest file. Every line of the file contains the
+        JSON entry of a converted file; later entries replace earlier entries of
+        the same input file. Unreadable lines e.g. of an interrupted write are ignored.
+
+        :param manifest_path: path of the manifest file.
+        :return: dictionary of input file paths relative to the input directory
+                 and manifest entries.
+        """
+        manifest = {}
+        if not os.path.isfile(manifest_path):
+            return manifest
+
+        with open(manifest_path) as file:
+            for line in file:
+                try:
+                    entry = json.loads(line)
+                    manifest[entry["input"]] = entry
+                except (ValueError, KeyError, TypeError):
+                    continue
+
+        return manifest
+
+    @staticmethod
+    def _write_manifest(manifest_path, manifest):
+        """
+        Replaces a manifest file with a compacted version containing one entry
+        per converted file.
+
+        :param manifest_path: path of the manifest file.
+        :param manifest: dictionary of manifest entries.
+        """
+        tmp_path = "%s.tmp" % manifest_path
+        with open(tmp_path, "w") as file:
+            for rel_path in sorted(manifest):
+                file.write("%s\n" % json.dumps(manifest[rel_path]))
+        os.replace(tmp_path, manifest_path)
 
     @classmethod
     def _convert_file(cls, input_path, output_path, res_format):
@@ -135,22 +321,24 @@ class FormatConverter(object):
                             output format.
         :param res_format: Format the input file will be converted to. Only formats
                            listed in constant CONVERSION_FORMATS are supported.
+        :return: path of the written output file.
         """
+        if res_format not in CONVERSION_FORMATS:
+            raise ValueError("Format for output files is incorrect. "
+                             "Please choose from the list: {}".format(list(CONVERSION_FORMATS)))
+
+        output_path = cls._output_path(output_path, res_format)
         if res_format == "v1_1":
             VersionConverter(input_path).write_to_file(output_path)
         elif res_format == "odml":
-            if not output_path.endswith(".odml"):
-                file_path, _ = os.path.splitext(output_path)
-                output_path = file_path + ".odml"
             odml.save(odml.load(input_path), output_path)
-        elif res_format in CONVERSION_FORMATS:
-            if not output_path.endswith(CONVERSION_FORMATS[res_format]):
-                file_path, _ = os.path.splitext(output_path)
-                output_path = file_path + CONVERSION_FORMATS[res_format]
-            RDFWriter(odml.load(input_path)).write_file(output_path, res_format)
+        elif res_format in STREAM_FORMATS:
+            # N-Triples and Turtle files are written without an intermediate RDF graph.
+            RDFStreamWriter(odml.load(input_path)).write_file(output_path, res_format)
         else:
-            raise ValueError("Format for output files is incorrect. "
-                             "Please choose from the list: {}".format(list(CONVERSION_FORMATS)))
+            RDFWriter(odml.load(input_path)).write_file(output_path, res_format)
+
+        return output_path
 
     @staticmethod
     def _create_sub_directory(dir_path):
@@ -183,5 +371,61 @@ class FormatConverter(object):
                 raise ValueError(msg)
 
 
+def _file_hash(file_path):
+    """
+    Returns the SHA-256 hex digest of the content of a file.
+    """
+    content_hash = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        for chunk in iter(lambda: file.read(1024 ** 2), b""):
+            content_hash.update(chunk)
+
+    return content_hash.hexdigest()
+
+
+def _convert_worker(rel_path, input_path, output_path, res_format, content_hash):
+    """
+    Converts a single file and returns the task attributes, the path of the
+    written file, the duration of the conversion and the error message if
+    the conversion failed. Runs in the worker processes of convert_dir.
+    """
+    start = time.time()
+    try:
+        res_path = FormatConverter._convert_file(input_path, output_path, res_format)
+        error = None
+    except Exception as exc:
+        res_path = None
+        error = str(exc) or exc.__class__.__name__
+
+    return rel_path, input_path, res_path, content_hash, time.time() - start, error
+
+
+def _iter_convert(tasks, jobs):
+    """
+    Yields the results of _convert_worker for all tasks in the order the files
+    have been converted.
+    """
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+
+    if jobs <= 1 or len(tasks) <= 1:
+        for task in tasks:
+            yield _convert_worker(*task)
+        return
+
+    with ProcessPoolExecutor(max_workers=min(jobs, len(tasks))) as executor:
+        futures = dict((executor.submit(_convert_worker, *task), task) for task in tasks)
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as exc:
+                # Crashed workers and results that cannot be transferred
+                # only fail the affected files.
+                rel_path, input_path, _, _, content_hash = futures[future]
+                error = str(exc) or exc.__class__.__name__
+                result = rel_path, input_path, None, content_hash, 0.0, error
+            yield result
+
+
 if __name__ == "__main__":
     FormatConverter.convert(sys.argv[1:])
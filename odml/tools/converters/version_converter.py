@@ -7,12 +7,12 @@ import io
 import json
 import os
 import uuid
-import yaml
 
 from lxml import etree as ET
 
+from .. import yaml_backend
 from ..parser_utils import ParserException
-from ..xmlparser import XML_HEADER
+from ..xmlparser import XML_HEADER, XMLReader
 
 from ...format import Document, Section, Property
 from ...info import FORMAT_VERSION
@@ -28,6 +28,9 @@ class VersionConverter(object):
         'dtype': 'type'
     }
 
+    # List collecting the log messages of the current conversion step.
+    _pending_log = None
+
     def __init__(self, filename):
         self.filename = filename
         self.conversion_log = []
@@ -61,7 +64,7 @@ class VersionConverter(object):
 
     def _parse_yaml(self):
         with open(self.filename) as file:
-            parsed_doc = yaml.safe_load(file)
+            parsed_doc = yaml_backend.load(file)
 
         return self._parse_dict_document(parsed_doc)
 
@@ -167,32 +170,56 @@ class VersionConverter(object):
         its parent Property. Exports only Document, Section and Property elements,
         that are supported by odML v1.1.
 
+        The document is converted in a single traversal of the tree. Log messages
+        are collected per conversion step and logged in the order of the steps.
+
         :param tree: lxml.ElementTree containing a v1.0 odML document.
         """
         # Reset status messages
         self.conversion_log = []
 
-        tree = self._replace_same_name_entities(tree)
         root = tree.getroot()
         root.set("version", FORMAT_VERSION)
 
-        # Handle Values, exclude unsupported Property attributes and unnamed Properties.
-        self._handle_properties(root)
-
-        # Exclude unsupported Section attributes, ignore comments, handle repositories.
-        for sec in root.iter("section"):
-            sec_name = sec.find("name").text
-            for elem in sec:
-                if elem.tag not in Section.arguments_keys and isinstance(elem.tag, str):
-                    self._log("[Info] Omitted non-Section attribute "
-                              "'%s: %s/%s'" % (sec_name, elem.tag, elem.text))
-                    sec.remove(elem)
+        prop_logs = []
+        sec_logs = []
+        # Elements requiring an id, grouped by top level Section; Properties
+        # outside of Sections do not receive an id.
+        id_groups = []
+
+        stack = [(root, False)]
+        try:
+            while stack:
+                elem, in_section = stack.pop()
+
+                # Number same name Sections and Properties before their names are used.
+                self._rename_same_name_children(elem)
+
+                if elem.tag == "property":
+                    # Handle Values, exclude unsupported Property attributes
+                    # and unnamed Properties.
+                    self._pending_log = prop_logs
+                    if self._handle_property(elem) and in_section:
+                        id_groups[-1][1].append(elem)
                     continue
 
-                if elem.tag == "repository":
-                    self._handle_repository(elem)
-                elif elem.tag == "include":
-                    self._handle_include(elem)
+                if elem.tag == "section":
+                    # Exclude unsupported Section attributes, handle repositories.
+                    self._pending_log = sec_logs
+                    self._handle_section(elem)
+                    if in_section:
+                        id_groups[-1][2].append(elem)
+                    else:
+                        id_groups.append(([elem], [], []))
+                    in_section = True
+
+                stack.extend((child, in_section) for child in reversed(elem)
+                             if isinstance(child.tag, str))
+        finally:
+            self._pending_log = None
+
+        for msg in prop_logs + sec_logs:
+            self._log(msg)
 
         # Exclude unsupported Document attributes, ignore comments, handle repositories.
         for elem in root:
@@ -205,10 +232,34 @@ class VersionConverter(object):
             if elem.tag == "repository":
                 self._handle_repository(elem)
 
-        tree = self._check_add_ids(tree)
+        # Checks whether elements possess an UUID and adds one in case of absence.
+        self._add_id(root)
+        for sections, props, subsections in id_groups:
+            for elem in sections + props + subsections:
+                self._add_id(elem)
 
         return tree
 
+    def _handle_section(self, sec):
+        """
+        Removes unsupported Section elements, ignores comments and handles
+        repositories and includes of a Section.
+
+        :param sec: lxml element containing a v1.0 Section.
+        """
+        sec_name = sec.find("name").text
+        for elem in sec:
+            if elem.tag not in Section.arguments_keys and isinstance(elem.tag, str):
+                self._log("[Info] Omitted non-Section attribute "
+                          "'%s: %s/%s'" % (sec_name, elem.tag, elem.text))
+                sec.remove(elem)
+                continue
+
+            if elem.tag == "repository":
+                self._handle_repository(elem)
+            elif elem.tag == "include":
+                self._handle_include(elem)
+
     def _handle_include(self, element):
         """
         _handle_include checks whether a provided include element is
@@ -271,66 +322,67 @@ class VersionConverter(object):
         # Print a warning, if no v1.1 compatible repository url can be provided.
         self._log("[Warning] Repository file '%s' is not odML v1.1 compatible." % content)
 
-    def _handle_properties(self, root):
+    def _handle_property(self, prop):
         """
-        Removes all property elements without name attribute, converts Value
+        Removes a property element without name attribute, converts Value
         elements from v1.0 to v1.1 style and removes unsupported Property elements.
 
-        :param root: lxml.ElementTree containing a v1.0 odML property list.
-        """
-        for prop in root.iter("property"):
-            main_val = ET.Element("value")
-            multiple_values = False
-            parent = prop.getparent()
-
-            # If a Property has no name attribute, remove it from its parent and
-            # continue with the next Property.
-            if prop.find("name") is None:
-                self._log("[Warning] Omitted Property without "
-                          "name tag: '%s'" % ET.tostring(prop))
-                parent.remove(prop)
-                continue
+        :param prop: lxml element containing a v1.0 Property.
+        :return: False if the Property has been removed, True otherwise.
+        """
+        main_val = ET.Element("value")
+        multiple_values = False
+        parent = prop.getparent()
+
+        # If a Property has no name attribute, remove it from its parent.
+        if prop.find("name") is None:
+            self._log("[Warning] Omitted Property without "
+                      "name tag: '%s'" % ET.tostring(prop))
+            parent.remove(prop)
+            return False
+
+        sname = "unnamed"
+        if parent.find("name") is not None:
+            sname = parent.find("name").text
+        stype = "untyped"
+        if parent.find("type") is not None:
+            stype = parent.find("type").text
+        prop_id = "%s|%s:%s" % (sname, stype, prop.find("name").text)
+
+        # Special handling of Values
+        for value in prop.iter("value"):
+            # Move supported elements from Value to parent Property.
+            self._handle_value(value, prop_id)
+
+            if value.text:
+                if main_val.text:
+                    main_val.text += "," + value.text.strip()
+                    multiple_values = True
+                else:
+                    main_val.text = value.text.strip()
 
-            sname = "unnamed"
-            if parent.find("name") is not None:
-                sname = parent.find("name").text
-            stype = "untyped"
-            if parent.find("type") is not None:
-                stype = parent.find("type").text
-            prop_id = "%s|%s:%s" % (sname, stype, prop.find("name").text)
-
-            # Special handling of Values
-            for value in prop.iter("value"):
-                # Move supported elements from Value to parent Property.
-                self._handle_value(value, prop_id)
-
-                if value.text:
-                    if main_val.text:
-                        main_val.text += "," + value.text.strip()
-                        multiple_values = True
-                    else:
-                        main_val.text = value.text.strip()
+            prop.remove(value)
 
-                prop.remove(value)
+        # Append value element only if it contains an actual value
+        if main_val.text:
+            # Multiple values require brackets
+            if multiple_values:
+                main_val.text = "[" + main_val.text + "]"
 
-            # Append value element only if it contains an actual value
-            if main_val.text:
-                # Multiple values require brackets
-                if multiple_values:
-                    main_val.text = "[" + main_val.text + "]"
+            prop.append(main_val)
 
-                prop.append(main_val)
+        # Reverse map "dependency_value", exclude unsupported Property attributes.
+        for elem in prop:
+            if elem.tag == "dependency_value":
+                elem.tag = "dependencyvalue"
 
-            # Reverse map "dependency_value", exclude unsupported Property attributes.
-            for elem in prop:
-                if elem.tag == "dependency_value":
-                    elem.tag = "dependencyvalue"
+            if (elem.tag not in Property.arguments_keys and
+                    isinstance(elem.tag, str)):
+                self._log("[Info] Omitted non-Property attribute "
+                          "'%s: %s/%s'" % (prop_id, elem.tag, elem.text))
+                prop.remove(elem)
 
-                if (elem.tag not in Property.arguments_keys and
-                        isinstance(elem.tag, str)):
-                    self._log("[Info] Omitted non-Property attribute "
-                              "'%s: %s/%s'" % (prop_id, elem.tag, elem.text))
-                    prop.remove(elem)
+        return True
 
     def _handle_value(self, value, log_id):
         """
@@ -393,58 +445,40 @@ class VersionConverter(object):
         :param tree: ElementTree of the doc
         :return: ElementTree
         """
-        sec_map = {}
-        prop_map = {}
-        root = tree.getroot()
-        for sec in root.iter("section"):
-
-            sec_name = sec.find("name")
-            if sec_name is not None:
-                cls._change_entity_name(tree, sec_map, sec_name)
-            else:
-                raise Exception("Section attribute name is not specified")
-
-            for prop in sec.iter("property"):
-                if prop.getparent() == sec:
-                    prop_name = prop.find("name")
-                    if prop_name is not None:
-                        cls._change_entity_name(tree, prop_map, prop_name)
-            prop_map.clear()
+        for elem in tree.getroot().iter():
+            if isinstance(elem.tag, str):
+                cls._rename_same_name_children(elem)
         return tree
 
     @staticmethod
-    def _change_entity_name(tree, elem_map, name):
+    def _rename_same_name_children(element):
         """
-        Adds numbering to identical element names where their odml.Section
-        or odml.Property parents reside on the same level in the tree.
-
-        :param tree: The element tree containing the 'name' element.
-        :param elem_map: lxml path to occurrence maps of named Sections or Properties.
-        :param name: lxml element containing the name text of a Section or Property.
-        """
-        named_path = "%s:%s" % (tree.getpath(name.getparent().getparent()), name.text)
-        if named_path not in elem_map:
-            elem_map[named_path] = 1
-        else:
-            elem_map[named_path] += 1
-            name.text += "-" + str(elem_map[named_path])
+        Adds numbering to identical names of the child Sections of an element
+        and of the child Properties of a Section.
 
-    def _check_add_ids(self, tree):
-        """
-        Checks, whether elements (properties) possess an UUID
-        and adds one in case of absence.
-
-        :param tree: ElementTree of the doc
-        :return: ElementTree
+        :param element: lxml element.
         """
-        root = tree.getroot()
-        self._add_id(root)
-        for sec in root.iter("section"):
-            self._add_id(sec)
-            for prop in sec.iter("property"):
-                self._add_id(prop)
+        sec_map = {}
+        prop_map = {}
+        for child in element:
+            if child.tag == "section":
+                elem_map = sec_map
+                name = child.find("name")
+                if name is None:
+                    raise Exception("Section attribute name is not specified")
+            elif child.tag == "property" and element.tag == "section":
+                elem_map = prop_map
+                name = child.find("name")
+                if name is None:
+                    continue
+            else:
+                continue
 
-        return tree
+            if name.text not in elem_map:
+                elem_map[name.text] = 1
+            else:
+                elem_map[name.text] += 1
+                name.text += "-" + str(elem_map[name.text])
 
     @staticmethod
     def _add_id(element):
@@ -469,11 +503,16 @@ class VersionConverter(object):
     def _log(self, msg):
         """
         Adds the passed message to the conversion_log attribute and
-        prints the message to the command line.
+        prints the message to the command line. While a conversion step
+        collects its messages, the message is added to its list instead.
 
         :param msg: string that is appended to the conversion log and
                     printed to the command line.
         """
+        if self._pending_log is not None:
+            self._pending_log.append(msg)
+            return
+
         self.conversion_log.append(msg)
         print(msg)
 
@@ -485,16 +524,15 @@ class VersionConverter(object):
         tree = self.convert()
         return ET.tounicode(tree, pretty_print=True) if tree else ""
 
-    def convert(self, backend="XML"):
+    def convert_tree(self, backend="XML"):
         """
         This method returns the content of the provided file object converted
-        to odML version 1.1 as a string object which is directly consumable
-        by the odml.tools.ODMLReader.
+        to odML version 1.1 as an lxml.ElementTree.
         Will raise an Exception, if the backend format is not supported.
 
         :param backend: File format of the source file. 'JSON', 'YAML' and 'XML' are
                         supported. Default backend is 'XML'.
-        :returns an odML v1.1 document as an XML string
+        :returns an odML v1.1 document as lxml.ElementTree
         """
         if backend.upper() == "JSON":
             old_tree = self._parse_json()
@@ -505,19 +543,24 @@ class VersionConverter(object):
         else:
             raise Exception("Unknown backend, only XML, JSON and YAML are supported.")
 
-        tree = self._convert(old_tree)
-        return ET.tounicode(tree, pretty_print=True) if tree else ""
+        return self._convert(old_tree)
 
-    def write_to_file(self, filename, backend="XML"):
+    def convert(self, backend="XML"):
         """
-        This method converts the content of the provided converter file object
-        to odML version 1.1 and writes the results to `filename`.
+        This method returns the content of the provided file object converted
+        to odML version 1.1 as a string object which is directly consumable
+        by the odml.tools.ODMLReader.
+        Will raise an Exception, if the backend format is not supported.
 
-        :param filename: Output file.
-        :param backend: Format of the source file, default is XML.
+        :param backend: File format of the source file. 'JSON', 'YAML' and 'XML' are
+                        supported. Default backend is 'XML'.
+        :returns an odML v1.1 document as an XML string
         """
-        data = self.convert(backend)
+        tree = self.convert_tree(backend)
+        return ET.tounicode(tree, pretty_print=True) if tree else ""
 
+    @staticmethod
+    def _write_data(filename, data):
         ext = [".xml", ".odml"]
         if not filename.endswith(tuple(ext)):
             filename = "%s.xml" % filename
@@ -526,3 +569,44 @@ class VersionConverter(object):
             with open(filename, "w") as file:
                 file.write("%s\n" % XML_HEADER)
                 file.write(data)
+
+        return filename
+
+    def write_to_file(self, filename, backend="XML"):
+        """
+        This method converts the content of the provided converter file object
+        to odML version 1.1 and writes the results to `filename`.
+
+        :param filename: Output file.
+        :param backend: Format of the source file, default is XML.
+        """
+        self._write_data(filename, self.convert(backend))
+
+    def to_document(self, backend="XML", filename=None, show_warnings=False):
+        """
+        This method converts the content of the provided converter file object
+        to odML version 1.1 and returns it as an odml.Document. The document is
+        created from the converted XML tree in memory; the source file is parsed
+        only once. If `filename` is provided, the converted content is written to
+        this file as well, identical to 'write_to_file'.
+
+        :param backend: Format of the source file, default is XML.
+        :param filename: Optional output file.
+        :param show_warnings: Toggle whether to print parser warnings to the command line.
+        :returns an odML v1.1 odml.Document
+        """
+        tree = self.convert_tree(backend)
+
+        origin = self.filename if isinstance(self.filename, str) else None
+        if filename is not None:
+            origin = self._write_data(filename, ET.tounicode(tree, pretty_print=True))
+
+        # The odML parser does not handle XML comments; they are dropped on load anyway.
+        root = tree.getroot()
+        ET.strip_tags(root, ET.Comment)
+
+        doc = XMLReader(ignore_errors=True, show_warnings=show_warnings).parse_element(root)
+        if origin is not None:
+            doc.origin_file_name = os.path.basename(origin)
+
+        return doc
@@ -2,15 +2,31 @@
 The dict_parser module provides access to the DictWriter and DictReader class.
 Both handle the conversion of odML documents from and to Python dictionary objects.
 """
+import json
 import sys
 
+from functools import partial
+
 from .. import format as odmlfmt
 from ..info import FORMAT_VERSION
 from .parser_utils import InvalidVersionException, ParserException, odml_tuple_export
+from .parser_utils import report_value_error
 
 LABEL_ERROR = "Error"
 LABEL_WARNING = "Warning"
 
+# Maps (format name, dictionary key) to the odML class attribute name
+# of all dictionary keys that have already been found to be valid.
+_ATTRIBUTE_NAMES = {}
+
+
+def _dict_values(values):
+    """
+    Decode function of lazily loaded Property values; dictionary values
+    are already decoded and only converted to the Property dtype.
+    """
+    return values
+
 
 def parse_cardinality(vals):
     """
@@ -168,12 +184,25 @@ class DictWriter:
         return props_seq
 
 
+class _ParsedObjects(list):
+    """
+    List of odml.Sections or odml.Properties that have already been
+    created while a JSON document was decoded. Errors and validations
+    encountered while creating the objects are stored with the list.
+    """
+
+    def __init__(self, objects, events):
+        super(_ParsedObjects, self).__init__(objects)
+        self.events = events
+
+
 class DictReader:
     """
     A reader to parse dictionaries with odML content into an odml.Document.
     """
 
-    def __init__(self, show_warnings=True, ignore_errors=False):
+    def __init__(self, show_warnings=True, ignore_errors=False, validation=None,
+                 selection=None, lazy_values=False):
         """
         :param show_warnings: Toggle whether to print warnings to the command line.
                               Any warnings can be accessed via the Reader's class
@@ -182,12 +211,27 @@ class DictReader:
                               encountered errors can be converted to warnings
                               instead. Such a document can only be saved when
                               all errors have been addressed though.
+        :param validation: Optional odml.validation.StreamingValidation. If provided,
+                           every parsed Section and Property is validated as soon
+                           as it has been attached to its parent.
+        :param selection: Optional odml.tools.parser_utils.SectionSelection. If provided,
+                          only the selected Sections are parsed.
+        :param lazy_values: If True, Property values are only converted to their
+                            dtype when they are accessed for the first time.
         """
         self.parsed_doc = None  # Python dictionary object equivalent
         self.warnings = []
 
         self.show_warnings = show_warnings
         self.ignore_errors = ignore_errors
+        self.validation = validation
+        self.selection = selection
+        self.lazy_values = lazy_values
+        self._section_path = []
+
+        # Errors and validations are deferred while a JSON document is decoded,
+        # since its format version can only be checked once decoding is done.
+        self._deferred = None
 
     def is_valid_attribute(self, attr, fmt):
         """
@@ -211,6 +255,29 @@ class DictReader:
 
         return None
 
+    def attribute_name(self, attr, fmt):
+        """
+        Returns the odML class attribute name of a dictionary key if the key is
+        a valid attribute of the provided odml class (Document, Section, Property).
+        Valid keys are cached, invalid keys are reported via the error method.
+
+        :param attr: Python dictionary key.
+        :param fmt: required odml format class format.Document, format.Section or
+                    format.Property against which the attribute is checked.
+        :returns: the odML class attribute name if the key is valid, None otherwise.
+        """
+        key = (fmt.name, attr)
+        name = _ATTRIBUTE_NAMES.get(key)
+        if name is None:
+            if self.is_valid_attribute(attr, fmt) is None:
+                return None
+
+            # Make sure to always use the correct odml format attribute name
+            name = fmt.map(attr)
+            _ATTRIBUTE_NAMES[key] = name
+
+        return name
+
     def error(self, msg):
         """
         If the parsers ignore_errors property is set to False, a ParserException
@@ -219,6 +286,10 @@ class DictReader:
 
         :param msg: Error message.
         """
+        if self._deferred is not None:
+            self._deferred.append((self.error, msg))
+            return None
+
         if self.ignore_errors:
             return self.warn(msg, LABEL_ERROR)
 
@@ -240,6 +311,34 @@ class DictReader:
         if self.show_warnings:
             sys.stderr.write("Parser%s\n" % msg)
 
+    def validate(self, obj):
+        """
+        Validates a parsed odML object via the readers streaming validation.
+        Raises a ParserException on the first validation error, if the
+        validation is set to fail fast.
+
+        :param obj: odml.Section or odml.Property attached to its parent or
+                    the fully parsed odml.Document.
+        """
+        if self.validation is None:
+            return
+
+        if self._deferred is not None:
+            self._deferred.append((self.validate, obj))
+            return
+
+        if obj.format().name == "odML":
+            errors = self.validation.finalize(obj)
+        else:
+            errors = self.validation.add(obj)
+
+        if not self.validation.fail_fast:
+            return
+
+        for err in errors:
+            if err.is_error:
+                raise ParserException("Validation failed: %s" % err)
+
     def to_odml(self, parsed_doc):
         """
         Parses a Python dictionary object containing an odML document to an odml.Document.
@@ -250,41 +349,124 @@ class DictReader:
         :param parsed_doc: Python dictionary object containing an odML document.
         :returns: parsed odml.Document.
         """
-        self.parsed_doc = parsed_doc
+        self.check_version(parsed_doc)
+        self.parsed_doc = parsed_doc['Document']
+
+        doc_attrs = {}
+        doc_secs = []
+
+        for key, content in self.parsed_doc.items():
+            attr = self.attribute_name(key, odmlfmt.Document)
+            if attr is None:
+                continue
 
+            if key == 'sections':
+                doc_secs = self._children(content, self.parse_sections)
+            else:
+                doc_attrs[attr] = content
+
+        doc = odmlfmt.Document.create(**doc_attrs)
+        doc.extend(doc_secs)
+
+        for sec in doc_secs:
+            self.validate(sec)
+        self.validate(doc)
+
+        return doc
+
+    @staticmethod
+    def check_version(parsed_doc):
+        """
+        Raises a ParserException if the Python dictionary does not contain an
+        odML document and an InvalidVersionException if the odML document is
+        of a previous odML format version.
+
+        :param parsed_doc: Python dictionary object containing an odML document.
+        """
         # Parse only odML documents of supported format versions.
-        if 'Document' not in self.parsed_doc:
+        if 'Document' not in parsed_doc:
             msg = "Missing root element 'Document'"
             raise ParserException(msg)
 
-        if 'odml-version' not in self.parsed_doc:
+        if 'odml-version' not in parsed_doc:
             raise ParserException("Invalid odML document: Could not find odml-version.")
 
-        if self.parsed_doc.get('odml-version') != FORMAT_VERSION:
+        if parsed_doc.get('odml-version') != FORMAT_VERSION:
             msg = ("Cannot parse odML document with format version '%s'. \n"
                    "\tUse the 'VersionConverter' from 'odml.tools.converters' "
                    "to import previous odML formats."
-                   % self.parsed_doc.get('odml-version'))
+                   % parsed_doc.get('odml-version'))
             raise InvalidVersionException(msg)
 
-        self.parsed_doc = self.parsed_doc['Document']
-
-        doc_attrs = {}
-        doc_secs = []
+    def from_json(self, json_data):
+        """
+        Parses a JSON string or file like object containing an odML document to an
+        odml.Document. The odML Sections and Properties are created while the JSON
+        content is decoded; a decoded JSON object is converted as soon as its
+        parent object has been read, so the full document never exists as nested
+        Python dictionaries next to the created odml.Document.
+        Errors and validation results are reported in document order once the odML
+        format version of the document has been checked. Raises the same exceptions
+        as 'to_odml' and a json.JSONDecodeError if the JSON content cannot be decoded.
+        If the reader has a Section selection, the JSON content is decoded first and
+        only the selected Sections are created.
+
+        :param json_data: JSON string or file like object.
+        :returns: parsed odml.Document.
+        """
+        if self.selection is not None:
+            if hasattr(json_data, "read"):
+                return self.to_odml(json.load(json_data))
+            return self.to_odml(json.loads(json_data))
+
+        self._deferred = []
+        try:
+            if hasattr(json_data, "read"):
+                parsed_doc = json.load(json_data, object_pairs_hook=self._json_object)
+            else:
+                parsed_doc = json.loads(json_data, object_pairs_hook=self._json_object)
+        finally:
+            self._deferred = None
+
+        return self.to_odml(parsed_doc)
+
+    def _json_object(self, pairs):
+        """
+        json object_pairs_hook creating the odML Sections and Properties
+        contained in a decoded JSON object.
 
-        for i in self.parsed_doc:
-            attr = self.is_valid_attribute(i, odmlfmt.Document)
-            if attr == 'sections':
-                doc_secs = self.parse_sections(self.parsed_doc['sections'])
-            elif attr:
-                # Make sure to always use the correct odml format attribute name
-                doc_attrs[odmlfmt.Document.map(attr)] = self.parsed_doc[i]
+        :param pairs: list of key value pairs of a decoded JSON object.
+        :returns: dictionary of the JSON object with created odML children.
+        """
+        obj = dict(pairs)
+        for key, parse in (('sections', self.parse_sections),
+                           ('properties', self.parse_properties)):
+            if isinstance(obj.get(key), list):
+                outer, self._deferred = self._deferred, []
+                try:
+                    obj[key] = _ParsedObjects(parse(obj[key]), self._deferred)
+                finally:
+                    self._deferred = outer
+
+        return obj
+
+    def _children(self, content, parse):
+        """
+        Returns the odML children of a parsed object. Children already created
+        while decoding JSON content are returned and their deferred errors and
+        validations are reported in document order; all others are parsed with
+        the provided parse method.
+        """
+        if not isinstance(content, _ParsedObjects):
+            return parse(content)
 
-        doc = odmlfmt.Document.create(**doc_attrs)
-        for sec in doc_secs:
-            doc.append(sec)
+        if self._deferred is not None:
+            self._deferred.extend(content.events)
+        else:
+            for func, arg in content.events:
+                func(arg)
 
-        return doc
+        return content
 
     def parse_sections(self, section_list):
         """
@@ -297,42 +479,68 @@ class DictReader:
         odml_sections = []
 
         for section in section_list:
-            sec_attrs = {}
-            children_secs = []
-            sec_props = []
-
-            for i in section:
-                attr = self.is_valid_attribute(i, odmlfmt.Section)
-                if attr == 'properties':
-                    sec_props = self.parse_properties(section['properties'])
-                elif attr == 'sections':
-                    children_secs = self.parse_sections(section['sections'])
-                elif attr:
-                    # Tuples had to be serialized as lists to support the yaml format.
-                    # Now convert cardinality lists back to tuples.
-                    content = section[attr]
-                    if attr.endswith("_cardinality"):
-                        content = parse_cardinality(content)
-
-                    # Make sure to always use the correct odml format attribute name
-                    sec_attrs[odmlfmt.Section.map(attr)] = content
-
-            try:
-                sec = odmlfmt.Section.create(**sec_attrs)
-
-                for prop in sec_props:
-                    sec.append(prop)
-
-                for child_sec in children_secs:
-                    sec.append(child_sec)
-
+            sec = self.parse_section(section)
+            if sec is not None:
                 odml_sections.append(sec)
-            except Exception as exc:
-                msg = "Section not created (%s)\n  %s" % (sec_attrs, str(exc))
-                self.error(msg)
 
         return odml_sections
 
+    def parse_section(self, section):
+        """
+        Parses a Python dictionary object containing an odML section to the
+        odml.Section equivalent including any subsections and properties.
+
+        :param section: Python dictionary object containing an odML section.
+        :returns: parsed odml.Section or None if the Section could not be created
+                  or is not selected.
+        """
+        if self.selection is None:
+            return self._parse_section(section)
+
+        self._section_path.append(section.get("name"))
+        try:
+            if not self.selection.includes(self._section_path, section.get("type")):
+                return None
+            return self._parse_section(section)
+        finally:
+            self._section_path.pop()
+
+    def _parse_section(self, section):
+        sec_attrs = {}
+        children_secs = []
+        sec_props = []
+
+        for key, content in section.items():
+            attr = self.attribute_name(key, odmlfmt.Section)
+            if attr is None:
+                continue
+
+            if key == 'properties':
+                sec_props = self._children(content, self.parse_properties)
+            elif key == 'sections':
+                children_secs = self._children(content, self.parse_sections)
+            else:
+                # Tuples had to be serialized as lists to support the yaml format.
+                # Now convert cardinality lists back to tuples.
+                if key.endswith("_cardinality"):
+                    content = parse_cardinality(content)
+
+                sec_attrs[attr] = content
+
+        try:
+            sec = odmlfmt.Section.create(**sec_attrs)
+            sec.extend(sec_props + children_secs)
+        except Exception as exc:
+            msg = "Section not created (%s)\n  %s" % (sec_attrs, str(exc))
+            self.error(msg)
+            return None
+
+        # Children are complete and attached to their parent at this point.
+        for child in sec_props + children_secs:
+            self.validate(child)
+
+        return sec
+
     def parse_properties(self, props_list):
         """
         Parses a list of Python dictionary objects containing odML properties to the
@@ -344,25 +552,48 @@ class DictReader:
         odml_props = []
 
         for _property in props_list:
-            prop_attrs = {}
-
-            for i in _property:
-                attr = self.is_valid_attribute(i, odmlfmt.Property)
-                if attr:
-                    content = _property[attr]
-                    # Tuples had to be serialized as lists to support the yaml format.
-                    # Now convert cardinality lists back to tuples.
-                    if attr.endswith("_cardinality"):
-                        content = parse_cardinality(content)
-
-                    # Make sure to always use the correct odml format attribute name
-                    prop_attrs[odmlfmt.Property.map(attr)] = content
-
-            try:
-                prop = odmlfmt.Property.create(**prop_attrs)
+            prop = self.parse_property(_property)
+            if prop is not None:
                 odml_props.append(prop)
-            except Exception as exc:
-                msg = "Property not created (%s)\n%s" % (prop_attrs, str(exc))
-                self.error(msg)
 
         return odml_props
+
+    def parse_property(self, _property):
+        """
+        Parses a Python dictionary object containing an odML property to the
+        odml.Property equivalent.
+
+        :param _property: Python dictionary object containing an odML property.
+        :returns: parsed odml.Property or None if the Property could not be created.
+        """
+        prop_attrs = {}
+
+        for key, content in _property.items():
+            attr = self.attribute_name(key, odmlfmt.Property)
+            if attr is None:
+                continue
+
+            # Tuples had to be serialized as lists to support the yaml format.
+            # Now convert cardinality lists back to tuples.
+            if key.endswith("_cardinality"):
+                content = parse_cardinality(content)
+
+            prop_attrs[attr] = content
+
+        raw_values = None
+        if self.lazy_values and prop_attrs.get("values"):
+            raw_values = prop_attrs.pop("values")
+            val_cardinality = prop_attrs.pop("val_cardinality", None)
+
+        try:
+            prop = odmlfmt.Property.create(**prop_attrs)
+            if raw_values is not None:
+                report = partial(report_value_error, self.warnings, self.ignore_errors,
+                                 self.show_warnings, " (Property '%s')" % prop.name)
+                prop._set_raw_values(raw_values, _dict_values, val_cardinality, report)
+            return prop
+        except Exception as exc:
+            msg = "Property not created (%s)\n%s" % (prop_attrs, str(exc))
+            self.error(msg)
+
+        return None
@@ -12,17 +12,23 @@ from os.path import basename
 import yaml
 
 from . import xmlparser
+from . import yaml_backend
+from .binary_parser import BinaryReader, BinaryWriter
 from .dict_parser import DictWriter, DictReader
 from ..info import FORMAT_VERSION
-from .parser_utils import ParserException
+from .parser_utils import InvalidVersionException, ParserException, SectionSelection
+from .parser_utils import open_file
 from .parser_utils import SUPPORTED_PARSERS
 from .rdf_converter import RDFReader, RDFWriter
-from ..validation import Validation
+from .sniffer import sniff_content, sniff_file
+from ..validation import StreamingValidation, Validation, merge_timings
+# Kept importable from this module for backwards compatibility.
+from .yaml_backend import unicode_loader_constructor, yaml_time_serializer
 
 
 class ODMLWriter:
     """
-        A generic odML document writer for JSON, XML, YAML and RDF.
+        A generic odML document writer for JSON, XML, YAML, RDF and BINARY.
         The output format is specified on init.
 
         Usage:
@@ -50,10 +56,24 @@ class ODMLWriter:
         :param filename: path and filename of the output file.
         :param kwargs: Writer backend keyword arguments. Refer to the documentation
                        of the available parsers to check which arguments are supported.
+                       The 'validation_profile' keyword selects the validation
+                       profile run before saving, e.g. 'errors-only' to skip
+                       all warning level validations. Default is 'full'.
+                       The 'yaml_backend' keyword selects the YAML implementation,
+                       see odml.tools.yaml_backend.YAML_BACKENDS. The 'deterministic_ids'
+                       keyword enables content derived RDF node identifiers, see
+                       odml.tools.rdf_converter.RDFWriter. The handler timings of the
+                       validation run before saving are added to the dictionary
+                       provided via the 'timings' keyword, see odml.validation.merge_timings.
         """
 
         # Write document only if it does not contain validation errors.
-        validation = Validation(odml_document)
+        timings = kwargs.get("timings")
+        validation = Validation(odml_document, timing=timings is not None,
+                                profile=kwargs.get("validation_profile"))
+        if timings is not None:
+            merge_timings(timings, validation.timings)
+
         msg = ""
         for err in validation.errors:
             if err.is_error:
@@ -63,7 +83,7 @@ class ODMLWriter:
             msg = "Resolve document validation errors before saving %s" % msg
             raise ParserException(msg)
 
-        report = validation.report()
+        report = validation.summary()
         if report:
             msg += "The saved Document contains unresolved issues."
             msg += " Run the Documents 'validate' method to access them.\n%s" % report
@@ -80,15 +100,22 @@ class ODMLWriter:
                 custom_template = kwargs["custom_template"]
             xmlparser.XMLWriter(odml_document).write_file(filename, local_style=local_style,
                                                           custom_template=custom_template)
+        elif self.parser == 'BINARY':
+            BinaryWriter(odml_document).write_file(filename)
+        elif self.parser == 'YAML':
+            # Stream the YAML output directly to the file.
+            with open_file(filename, 'w') as file:
+                yaml_backend.dump(self._dict_output(odml_document), file,
+                                  backend=kwargs.get("yaml_backend"))
         else:
-            with open(filename, 'w') as file:
+            with open_file(filename, 'w') as file:
                 file.write(self.to_string(odml_document, **kwargs))
 
     def to_string(self, odml_document, **kwargs):
         """
         Parses an odml.Document to a string in the file format
         defined in the ODMLWriter.parser property. Supported formats are
-        JSON, YAML and RDF.
+        JSON, YAML and RDF. The BINARY format returns bytes instead of a string.
 
         :param odml_document: odml.Document.
         :param kwargs: Writer backend keyword arguments e.g. for adding specific
@@ -103,34 +130,37 @@ class ODMLWriter:
 
         if self.parser == 'XML':
             string_doc = str(xmlparser.XMLWriter(odml_document))
+        elif self.parser == 'BINARY':
+            string_doc = BinaryWriter(odml_document).to_bytes()
         elif self.parser == "RDF":
             rdf_format = "xml"
             if "rdf_format" in kwargs and isinstance(kwargs["rdf_format"], str):
                 rdf_format = kwargs["rdf_format"]
 
-            string_doc = RDFWriter(odml_document).get_rdf_str(rdf_format)
+            deterministic_ids = bool(kwargs.get("deterministic_ids", False))
+            string_doc = RDFWriter(odml_document, deterministic_ids=deterministic_ids)\
+                .get_rdf_str(rdf_format)
         else:
-            self.parsed_doc = DictWriter().to_dict(odml_document)
-
-            odml_output = {'Document': self.parsed_doc,
-                           'odml-version': FORMAT_VERSION}
+            odml_output = self._dict_output(odml_document)
 
             if self.parser == 'YAML':
-                yaml.add_representer(datetime.time, yaml_time_serializer)
-                string_doc = yaml.dump(odml_output, default_flow_style=False)
+                string_doc = yaml_backend.dump(odml_output,
+                                               backend=kwargs.get("yaml_backend"))
             elif self.parser == 'JSON':
                 string_doc = json.dumps(odml_output, indent=4,
                                         cls=JSONDateTimeSerializer)
 
         return string_doc
 
+    def _dict_output(self, odml_document):
+        """
+        Returns the Python dictionary equivalent of an odml.Document
+        including the odML format version.
+        """
+        self.parsed_doc = DictWriter().to_dict(odml_document)
 
-def yaml_time_serializer(dumper, data):
-    """
-    This function is required to serialize datetime.time as string objects
-    when working with YAML as output format.
-    """
-    return dumper.represent_scalar('tag:yaml.org,2002:str', str(data))
+        return {'Document': self.parsed_doc,
+                'odml-version': FORMAT_VERSION}
 
 
 class JSONDateTimeSerializer(json.JSONEncoder):
@@ -153,30 +183,94 @@ class ODMLReader:
     Usage:
         yaml_odml_doc = ODMLReader(parser='YAML').from_file("odml_doc.yaml")
         json_odml_doc = ODMLReader(parser='JSON').from_file("odml_doc.json")
+        any_odml_doc = ODMLReader(parser='AUTO').from_file("odml_doc.odml")
     """
 
-    def __init__(self, parser='XML', show_warnings=True):
+    def __init__(self, parser='XML', show_warnings=True, timing=False, fail_fast=False):
         """
-        :param parser: odml parser; supported are 'XML', 'JSON', 'YAML' and 'RDF'.
+        :param parser: odml parser; supported are 'XML', 'JSON', 'YAML', 'RDF'
+                       and 'BINARY'. 'AUTO' identifies the parser of every file
+                       or string from its content.
         :param show_warnings: Toggle whether to print warnings to the command line.
+        :param timing: Toggle whether the validation run after loading records
+                       handler timings. The validation of the last loaded document
+                       is available via the 'validation' attribute; no validation
+                       is run if warnings are not shown and fail_fast is not set.
+        :param fail_fast: Toggle whether loading raises a ParserException on the first
+                          validation error. The XML, JSON and YAML parsers validate
+                          the document while it is being parsed and stop right away.
         """
         self.doc = None  # odML document
         self.parsed_doc = None  # Python dictionary object equivalent
         parser = parser.upper()
-        if parser not in SUPPORTED_PARSERS:
+        if parser not in SUPPORTED_PARSERS and parser != 'AUTO':
             raise NotImplementedError("'%s' odML parser does not exist!" % parser)
         self.parser = parser
         self.show_warnings = show_warnings
+        self.timing = timing
+        self.fail_fast = fail_fast
         self.warnings = []
+        self.validation = None
+
+    def _streaming_validation(self, profile=None):
+        """
+        Validation is only required to print validation warnings after loading
+        or to fail fast on validation errors. The returned StreamingValidation
+        is handed to the XML and dict readers to validate the document while it
+        is being parsed.
+        """
+        self.validation = None
+        if self.show_warnings or self.fail_fast:
+            self.validation = StreamingValidation(profile=profile, fail_fast=self.fail_fast,
+                                                  timing=self.timing)
+        return self.validation
+
+    def _check_fail_fast(self, validation):
+        """
+        Raises a ParserException on the first validation error of a
+        loaded document, if the reader is set to fail fast.
+        """
+        if not self.fail_fast:
+            return
+
+        for err in validation.errors:
+            if err.is_error:
+                raise ParserException("Validation failed: %s" % err)
 
-    def _validation_warning(self):
-        report = Validation(self.doc).report()
+    def _auto_reader(self, sniffed):
+        """
+        Returns a reader for the parser identified by content sniffing. Raises an
+        InvalidVersionException without parsing the content if the identified odML
+        format version is not supported.
+
+        :param sniffed: tuple of parser, RDF format and odML format version.
+        """
+        parser, _, version = sniffed
+        if version is not None and version != FORMAT_VERSION:
+            msg = ("Cannot parse odML document with format version '%s'. \n"
+                   "\tUse the 'VersionConverter' from 'odml.tools.converters' "
+                   "to import previous odML formats." % version)
+            raise InvalidVersionException(msg)
+
+        return ODMLReader(parser, self.show_warnings, self.timing, self.fail_fast)
+
+    def _auto_result(self, reader):
+        self.parsed_doc = reader.parsed_doc
+        self.warnings = reader.warnings
+        self.validation = reader.validation
+        self.doc = reader.doc
+        return self.doc
+
+    def _validation_warning(self, validation):
+        report = validation.summary()
         if report:
             msg = "The loaded Document contains unresolved issues."
             msg += " Run the Documents 'validate' method to access them.\n%s" % report
             warnings.warn(msg)
 
-    def from_file(self, file, doc_format=None):
+    def from_file(self, file, doc_format=None, validation_profile=None,
+                  include_paths=None, exclude_types=None, max_depth=None,
+                  lazy_values=False, iterative=False):
         """
         Loads an odML document from a file. The ODMLReader.parser specifies the
         input file format. If the input file is an RDF file, the specific RDF format
@@ -184,61 +278,121 @@ class ODMLReader:
         Available RDF formats: 'xml', 'n3', 'turtle', 'nt', 'pretty-xml',
         'trix', 'trig', 'nquads'.
 
+        The XML, JSON and YAML parsers can load parts of a document; Sections that
+        are not selected by include_paths, exclude_types and max_depth are skipped
+        while parsing. See odml.tools.parser_utils.SectionSelection for details.
+
         :param file: file path to load an odML document from.
         :param doc_format: Required for RDF files only and provides the specific format
                            of an RDF file.
+        :param validation_profile: Name of the validation profile run after loading
+                                   the document. Default is 'full'.
+        :param include_paths: list of absolute paths of the Sections to load.
+        :param exclude_types: list of types of Sections that are not loaded.
+        :param max_depth: maximum depth of loaded Sections, top level Sections
+                          have the depth 1.
+        :param lazy_values: If True, the XML, JSON and YAML parsers do not decode
+                            Property values while loading but when they are accessed
+                            for the first time. Validations checking values decode
+                            all values; use e.g. the 'errors-only' validation profile
+                            or disable warnings to benefit from lazy loading.
+        :param iterative: If True, the XML parser builds the odML objects while the
+                          file is read and discards processed XML content instead of
+                          parsing the full XML tree first.
+                          See odml.tools.xmlparser.XMLReader.iter_sections for details.
         :return: parsed odml.Document
         """
+        if self.parser == 'AUTO':
+            sniffed = sniff_file(file)
+            reader = self._auto_reader(sniffed)
+            reader.from_file(file, doc_format or sniffed[1], validation_profile,
+                             include_paths, exclude_types, max_depth, lazy_values,
+                             iterative)
+            return self._auto_result(reader)
+
+        selection = SectionSelection.create(include_paths, exclude_types, max_depth)
+        if selection is not None and self.parser not in ('XML', 'JSON', 'YAML'):
+            raise NotImplementedError("Partial loading is not supported by the '%s' "
+                                      "odML parser!" % self.parser)
+
         if self.parser == 'XML':
+            validation = self._streaming_validation(validation_profile)
             par = xmlparser.XMLReader(ignore_errors=True,
-                                      show_warnings=self.show_warnings)
+                                      show_warnings=self.show_warnings,
+                                      validation=validation,
+                                      selection=selection,
+                                      lazy_values=lazy_values)
             self.warnings = par.warnings
-            self.doc = par.from_file(file)
+            self.doc = par.from_file(file, iterative=iterative)
 
             # Print validation warnings after parsing
             if self.show_warnings:
-                self._validation_warning()
+                self._validation_warning(validation)
 
             return self.doc
 
         if self.parser == 'YAML':
-            with open(file) as yaml_data:
+            with open_file(file) as yaml_data:
                 try:
-                    yaml.SafeLoader.add_constructor("tag:yaml.org,2002:python/unicode",
-                                                    unicode_loader_constructor)
-                    self.parsed_doc = yaml.safe_load(yaml_data)
+                    self.parsed_doc = yaml_backend.load(yaml_data)
                 except yaml.parser.ParserError as err:
                     print(err)
                     return None
 
+            validation = self._streaming_validation(validation_profile)
             par = DictReader(ignore_errors=True,
-                             show_warnings=self.show_warnings)
+                             show_warnings=self.show_warnings,
+                             validation=validation,
+                             selection=selection,
+                             lazy_values=lazy_values)
+            self.warnings = par.warnings
             self.doc = par.to_odml(self.parsed_doc)
             # Provide original file name via the in memory document
             self.doc.origin_file_name = basename(file)
 
             # Print validation warnings after parsing
             if self.show_warnings:
-                self._validation_warning()
+                self._validation_warning(validation)
 
             return self.doc
 
         if self.parser == 'JSON':
-            with open(file) as json_data:
+            validation = self._streaming_validation(validation_profile)
+            par = DictReader(show_warnings=self.show_warnings,
+                             validation=validation,
+                             selection=selection,
+                             lazy_values=lazy_values)
+            self.warnings = par.warnings
+
+            # The odML objects are created while the JSON file is decoded.
+            with open_file(file) as json_data:
                 try:
-                    self.parsed_doc = json.load(json_data)
-                except ValueError as err:  # Python 2 does not support JSONDecodeError
+                    self.doc = par.from_json(json_data)
+                except json.JSONDecodeError as err:
                     print("JSON Decoder Error: %s" % err)
                     return None
-
-            par = DictReader(show_warnings=self.show_warnings)
-            self.doc = par.to_odml(self.parsed_doc)
             # Provide original file name via the in memory document
             self.doc.origin_file_name = basename(file)
 
             # Print validation warnings after parsing
             if self.show_warnings:
-                self._validation_warning()
+                self._validation_warning(validation)
+
+            return self.doc
+
+        if self.parser == 'BINARY':
+            self.doc = BinaryReader().from_file(file)
+            # Provide original file name via the in memory document
+            self.doc.origin_file_name = basename(file)
+
+            # Print validation warnings after loading
+            self.validation = None
+            if self.show_warnings or self.fail_fast:
+                self.validation = Validation(self.doc, timing=self.timing,
+                                             profile=validation_profile)
+                self._check_fail_fast(self.validation)
+            if self.show_warnings:
+                self._validation_warning(self.validation)
 
             return self.doc
 
@@ -247,10 +401,13 @@ class ODMLReader:
                 raise ValueError("Format of the rdf file was not specified")
 
             # Importing from an RDF graph can return multiple documents
+            self.validation = None
             self.doc = RDFReader().from_file(file, doc_format)
 
             for doc in self.doc:
-                report = Validation(doc).report()
+                validation = Validation(doc, profile=validation_profile)
+                self._check_fail_fast(validation)
+                report = validation.summary()
                 if report:
                     msg = "The loaded Document contains unresolved issues."
                     msg += " Run the Documents 'validate' method to access them.\n%s" % report
@@ -258,7 +415,7 @@ class ODMLReader:
 
             return self.doc
 
-    def from_string(self, string, doc_format=None):
+    def from_string(self, string, doc_format=None, validation_profile=None):
         """
         Loads an odML document from a string object. The ODMLReader.parser specifies the
         input file format. If the input string contains an RDF format,
@@ -266,48 +423,71 @@ class ODMLReader:
         Available RDF formats: 'xml', 'n3', 'turtle', 'nt', 'pretty-xml',
         'trix', 'trig', 'nquads'.
 
-        :param string: file path to load an odML document from.
+        :param string: string object containing an odML document; bytes for
+                       the BINARY format.
         :param doc_format: Required for RDF files only and provides the specific format
                            of an RDF file.
+        :param validation_profile: Name of the validation profile run after loading
+                                   the document. Default is 'full'.
         :return: parsed odml.Document
         """
+        if self.parser == 'AUTO':
+            sniffed = sniff_content(string)
+            reader = self._auto_reader(sniffed)
+            reader.from_string(string, doc_format or sniffed[1], validation_profile)
+            return self._auto_result(reader)
 
         if self.parser == 'XML':
-            self.doc = xmlparser.XMLReader().from_string(string)
+            validation = self._streaming_validation(validation_profile)
+            self.doc = xmlparser.XMLReader(validation=validation).from_string(string)
 
             # Print validation warnings after parsing
             if self.show_warnings:
-                self._validation_warning()
+                self._validation_warning(validation)
 
             return self.doc
 
         if self.parser == 'YAML':
             try:
-                self.parsed_doc = yaml.safe_load(string)
+                self.parsed_doc = yaml_backend.load(string)
             except yaml.parser.ParserError as err:
                 print(err)
                 return
 
-            self.doc = DictReader().to_odml(self.parsed_doc)
+            validation = self._streaming_validation(validation_profile)
+            self.doc = DictReader(validation=validation).to_odml(self.parsed_doc)
 
             # Print validation warnings after parsing
             if self.show_warnings:
-                self._validation_warning()
+                self._validation_warning(validation)
 
             return self.doc
 
         if self.parser == 'JSON':
+            validation = self._streaming_validation(validation_profile)
             try:
-                self.parsed_doc = json.loads(string)
-            except ValueError as err:  # Python 2 does not support JSONDecodeError
+                self.doc = DictReader(validation=validation).from_json(string)
+            except json.JSONDecodeError as err:
                 print("JSON Decoder Error: %s" % err)
                 return
 
-            self.doc = DictReader().to_odml(self.parsed_doc)
-
             # Print validation warnings after parsing
             if self.show_warnings:
-                self._validation_warning()
+                self._validation_warning(validation)
+
+            return self.doc
+
+        if self.parser == 'BINARY':
+            self.doc = BinaryReader().from_bytes(string)
+
+            # Print validation warnings after loading
+            self.validation = None
+            if self.show_warnings or self.fail_fast:
+                self.validation = Validation(self.doc, timing=self.timing,
+                                             profile=validation_profile)
+                self._check_fail_fast(self.validation)
+            if self.show_warnings:
+                self._validation_warning(self.validation)
 
             return self.doc
 
@@ -316,21 +496,16 @@ class ODMLReader:
                 raise ValueError("Format of the rdf file was not specified")
 
             # Importing from an RDF graph can return multiple documents
+            self.validation = None
             self.doc = RDFReader().from_string(string, doc_format)
 
             for doc in self.doc:
-                report = Validation(doc).report()
+                validation = Validation(doc, profile=validation_profile)
+                self._check_fail_fast(validation)
+                report = validation.summary()
                 if report:
                     msg = "The loaded Document contains unresolved issues."
                     msg += " Run the Documents 'validate' method to access them.\n%s" % report
                     warnings.warn(msg)
 
             return self.doc
-
-
-# Needed only for < Python 3
-def unicode_loader_constructor(_, node):
-    """
-    Constructor for PyYAML to load unicode characters
-    """
-    return node.value
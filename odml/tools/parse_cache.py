@@ -0,0 +1,261 @@
+"""
+The parse_cache module provides the ParseCache class, a persistent on-disk cache
+of parsed odML documents.
+
+Parsed documents are stored in the binary odML format (see odml.tools.binary_parser),
+which is restored considerably faster than XML, JSON or YAML files are parsed.
+Every cache entry is a single file named after a hash of the cache key; the key
+consists of the absolute file path, file size and modification time, the parser
+and the loading options and optionally a hash of the file content. Changed files
+therefore never match an existing entry.
+
+The cache directory is safe to be used by multiple processes at the same time:
+entries are written to temporary files and moved into place atomically. When the
+cache exceeds its maximum size, the least recently used entries are removed.
+The default cache directory is private to the current user; cache directories
+owned or writable by other users are never used. Parser warnings are stored with
+every entry and shown again when the entry is restored.
+
+Usage:
+    >>> doc = odml.load("file.odml", cache=True)
+    >>> cache = ParseCache(max_size=1024 ** 3, content_hash=True)
+    >>> doc = odml.load("file.odml", cache=cache)
+"""
+import hashlib
+import json
+import os
+import sys
+import tempfile
+
+from os.path import basename
+
+from .binary_parser import BinaryWriter
+from .odmlparser import ODMLReader
+from .parser_utils import ParserException
+
+CACHE_DIR = os.path.join(os.environ.get("XDG_CACHE_HOME") or
+                         os.path.join(os.path.expanduser("~"), ".cache"),
+                         "odml", "parse_cache")
+
+# Default maximum size of all cache entries in bytes.
+DEFAULT_MAX_SIZE = 256 * 1024 ** 2
+
+ENTRY_SUFFIX = ".odmlb"
+
+
+class ParseCache(object):
+    """
+    Persistent cache of parsed odML documents.
+
+    :param cache_dir: directory of the cache entries. Defaults to a directory
+                      in the cache directory of the current user.
+    :param max_size: maximum size of all cache entries in bytes. The least recently
+                     used entries are removed when the size is exceeded.
+    :param content_hash: If True, a hash of the file content is part of the cache
+                         key. This detects changed files with unchanged size and
+                         modification time at the cost of reading every file.
+    """
+
+    def __init__(self, cache_dir=None, max_size=DEFAULT_MAX_SIZE, content_hash=False):
+        self.cache_dir = cache_dir or CACHE_DIR
+        self.max_size = max_size
+        self.content_hash = content_hash
+
+    def key(self, filename, backend, options=None):
+        """
+        Returns the cache key of a file loaded with a parser and loading options.
+
+        :param filename: path of an odML file.
+        :param backend: name of the odML parser.
+        :param options: dictionary of loading options changing the loaded document.
+        :return: hex string.
+        """
+        path = os.path.abspath(filename)
+        stat = os.stat(path)
+
+        key = hashlib.sha256()
+        key.update(repr((path, stat.st_size, stat.st_mtime_ns, backend.upper(),
+                         sorted((options or {}).items()))).encode("utf-8"))
+
+        if self.content_hash:
+            with open(path, "rb") as file:
+                for chunk in iter(lambda: file.read(1024 ** 2), b""):
+                    key.update(chunk)
+
+        return key.hexdigest()
+
+    def _entry(self, key):
+        return os.path.join(self.cache_dir, key + ENTRY_SUFFIX)
+
+    def _trusted_dir(self, create=False):
+        """
+        Returns whether the cache directory may be used. Missing directories are
+        created accessible by the current user only. Directories owned by other
+        users or writable by other users are not used, since their entries could
+        have been placed by someone else.
+
+        :param create: If True, a missing cache directory is created.
+        :return: bool
+        """
+        try:
+            if create:
+                os.makedirs(self.cache_dir, mode=0o700, exist_ok=True)
+            stat = os.stat(self.cache_dir)
+        except OSError:
+            return False
+
+        # Ownership and permissions can only be checked on POSIX systems.
+        if hasattr(os, "getuid"):
+            return stat.st_uid == os.getuid() and not stat.st_mode & 0o022
+        return True
+
+    def get(self, key):
+        """
+        Returns the binary odML content of a cache entry or None if the cache does
+        not contain the key. Marks the entry as recently used.
+
+        :param key: cache key.
+        :return: bytes or None.
+        """
+        if not self._trusted_dir():
+            return None
+
+        entry = self._entry(key)
+        try:
+            with open(entry, "rb") as file:
+                data = file.read()
+        except OSError:
+            return None
+
+        try:
+            os.utime(entry)
+        except OSError:
+            pass
+
+        return data
+
+    def put(self, key, data):
+        """
+        Adds binary odML content to the cache and removes the least recently used
+        entries if the cache exceeds its maximum size.
+
+        :param key: cache key.
+        :param data: bytes.
+        """
+        if len(data) > self.max_size or not self._trusted_dir(create=True):
+            return
+
+        try:
+            handle, tmp_name = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        except OSError:
+            return
+
+        try:
+            with os.fdopen(handle, "wb") as file:
+                file.write(data)
+            os.replace(tmp_name, self._entry(key))
+        except OSError:
+            if os.path.exists(tmp_name):
+                os.remove(tmp_name)
+            return
+
+        self.evict()
+
+    def evict(self, max_size=None):
+        """
+        Removes the least recently used cache entries until the size of all entries
+        does not exceed the maximum size.
+
+        :param max_size: maximum size in bytes; the size of the cache if None.
+        """
+        if max_size is None:
+            max_size = self.max_size
+
+        if not self._trusted_dir():
+            return
+
+        entries = []
+        try:
+            with os.scandir(self.cache_dir) as scan:
+                for item in scan:
+                    if item.name.endswith(ENTRY_SUFFIX):
+                        try:
+                            stat = item.stat()
+                        except OSError:
+                            continue
+                        entries.append((stat.st_mtime_ns, stat.st_size, item.path))
+        except OSError:
+            return
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= max_size:
+                break
+
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+
+    def clear(self):
+        """
+        Removes all cache entries.
+        """
+        self.evict(max_size=0)
+
+    def load(self, filename, backend="xml", show_warnings=True, validation_profile=None,
+             fail_fast=False, **options):
+        """
+        Loads an odML document from the cache or parses the file and adds the
+        parsed document to the cache.
+
+        :param filename: path of an odML file.
+        :param backend: file format of the odML file.
+        :param show_warnings: Toggle whether to print warnings to the command line.
+        :param validation_profile: Name of the validation profile that is run after
+                                   loading the document.
+        :param fail_fast: Toggle whether loading raises a ParserException
+                          on the first validation error.
+        :param options: further options of ODMLReader.from_file like 'include_paths'.
+        :return: the odML document.
+        """
+        # Lazy and iterative loading do not change the document;
+        # lazily loaded values are restored decoded.
+        key_options = dict((name, val) for name, val in options.items()
+                           if val is not None and name not in ("lazy_values", "iterative"))
+        key = self.key(filename, backend, key_options)
+
+        data = self.get(key)
+        if data is not None:
+            header, _, data = data.partition(b"\n")
+            reader = ODMLReader("BINARY", show_warnings, fail_fast=fail_fast)
+            try:
+                parser_warnings = json.loads(header.decode("utf-8"))
+                doc = reader.from_string(data, validation_profile=validation_profile)
+                doc.origin_file_name = basename(filename)
+            except (ValueError, ParserException):
+                # Discard entries of incompatible formats.
+                pass
+            else:
+                if show_warnings:
+                    for msg in parser_warnings:
+                        sys.stderr.write(msg if msg.endswith("\n") else "%s\n" % msg)
+                return doc
+
+        reader = ODMLReader(backend, show_warnings, fail_fast=fail_fast)
+        doc = reader.from_file(filename, validation_profile=validation_profile, **options)
+
+        # The RDF parser returns a list of documents, which are not cached.
+        if doc is not None and not isinstance(doc, list):
+            try:
+                # Lazily loaded values are decoded and checked by the writer.
+                data = BinaryWriter(doc).to_bytes()
+                header = json.dumps(reader.warnings).encode("utf-8")
+                self.put(key, header + b"\n" + data)
+            except Exception:
+                # Documents the binary format cannot store are not cached;
+                # a failing cache must never fail loading the document.
+                pass
+
+        return doc
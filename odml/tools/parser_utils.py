@@ -3,7 +3,13 @@ Utility file to provide constants, exceptions and functions
 commonly used by the odML tools parsers and converters.
 """
 
-SUPPORTED_PARSERS = ['XML', 'YAML', 'JSON', 'RDF']
+import bz2
+import gzip
+import lzma
+import os
+import sys
+
+SUPPORTED_PARSERS = ['XML', 'YAML', 'JSON', 'RDF', 'BINARY']
 
 
 RDF_CONVERSION_FORMATS = {
@@ -22,6 +28,27 @@ RDF_CONVERSION_FORMATS = {
 }
 
 
+# Compression formats supported by 'open_file' identified by
+# their file extension and the magic bytes of their content.
+COMPRESSION_FORMATS = {
+    'gz': gzip.open,
+    'bz2': bz2.open,
+    'xz': lzma.open
+}
+
+COMPRESSION_EXTENSIONS = {
+    '.gz': 'gz',
+    '.bz2': 'bz2',
+    '.xz': 'xz'
+}
+
+COMPRESSION_MAGIC = {
+    b'\x1f\x8b': 'gz',
+    b'BZh': 'bz2',
+    b'\xfd7zXZ\x00': 'xz'
+}
+
+
 class ParserException(Exception):
     """
     Exception wrapper used by various odML parsers.
@@ -34,6 +61,75 @@ class InvalidVersionException(ParserException):
     """
 
 
+def compression_format(filename, mode="r"):
+    """
+    Returns the compression format of a file. When reading, the format is
+    identified by the first bytes of the file content, when writing by the
+    file extension.
+
+    :param filename: path of the file.
+    :param mode: file mode the file is opened with.
+    :return: 'gz', 'bz2', 'xz' or None for uncompressed files.
+    """
+    if "r" in mode:
+        try:
+            with open(filename, "rb") as file:
+                head = file.read(6)
+        except OSError:
+            return None
+
+        for magic, comp_format in COMPRESSION_MAGIC.items():
+            if head.startswith(magic):
+                return comp_format
+        return None
+
+    return COMPRESSION_EXTENSIONS.get(os.path.splitext(filename)[1].lower())
+
+
+def open_file(filename, mode="r", encoding=None):
+    """
+    Opens a file like the builtin 'open' function. Files compressed with gzip,
+    bzip2 or xz are transparently decompressed when read and files with the
+    extension '.gz', '.bz2' or '.xz' are compressed when written. The content
+    is streamed through the compression module, no temporary files are used.
+
+    :param filename: path of the file.
+    :param mode: 'r', 'w', 'rb' or 'wb'.
+    :param encoding: encoding of text mode files.
+    :return: file object.
+    """
+    comp_format = compression_format(filename, mode)
+    if comp_format is None:
+        return open(filename, mode, encoding=encoding)
+
+    if "b" not in mode and "t" not in mode:
+        mode += "t"
+    return COMPRESSION_FORMATS[comp_format](filename, mode, encoding=encoding)
+
+
+def report_value_error(warnings, ignore_errors, show_warnings, location, exc):
+    """
+    Reports an exception raised while decoding lazily loaded Property values
+    the same way the odML readers report errors while parsing. The readers
+    bind the first arguments using functools.partial and pass the result
+    to odml.Property._set_raw_values.
+
+    :param warnings: list of warnings of the reader the message is added to.
+    :param ignore_errors: If False, a ParserException is raised.
+    :param show_warnings: Toggle whether the warning is written to sys.stderr.
+    :param location: description of the origin of the values e.g. ' (line 3)'.
+    :param exc: exception raised while decoding the values.
+    """
+    msg = "%s%s" % (exc, location)
+    if not ignore_errors:
+        raise ParserException(msg)
+
+    msg = "warning: %s\n" % msg
+    warnings.append(msg)
+    if show_warnings:
+        sys.stderr.write(msg)
+
+
 def odml_tuple_export(odml_tuples):
     """
     Converts odml style tuples to a parsable string representation.
@@ -53,3 +149,73 @@ def odml_tuple_export(odml_tuples):
             str_tuples = "(%s)" % str_val
 
     return "[%s]" % str_tuples
+
+
+class SectionSelection(object):
+    """
+    Describes which Sections of an odML document are loaded by the readers.
+    Sections that are not selected are skipped while parsing including all
+    their Properties and subsections.
+
+    :param include_paths: list of absolute Section paths like "/name1/name2".
+                          A selected Section is loaded including all its subsections;
+                          its ancestor Sections are loaded with their Properties but
+                          only with the subsections leading to a selected Section.
+                          All Sections are selected if None.
+    :param exclude_types: list of Section types; Sections of these types are not
+                          loaded. Types are compared case insensitive.
+    :param max_depth: maximum depth of loaded Sections; top level Sections have
+                      the depth 1. All depths are loaded if None.
+    """
+
+    def __init__(self, include_paths=None, exclude_types=None, max_depth=None):
+        self.include_paths = None
+        if include_paths is not None:
+            if isinstance(include_paths, str):
+                include_paths = [include_paths]
+            self.include_paths = [tuple(name for name in path.split("/") if name)
+                                  for path in include_paths]
+
+        self.exclude_types = None
+        if exclude_types is not None:
+            if isinstance(exclude_types, str):
+                exclude_types = [exclude_types]
+            self.exclude_types = set(sec_type.lower() for sec_type in exclude_types)
+
+        self.max_depth = max_depth
+
+    @classmethod
+    def create(cls, include_paths=None, exclude_types=None, max_depth=None):
+        """
+        Returns a SectionSelection or None if no selection criteria are provided.
+        """
+        if include_paths is None and exclude_types is None and max_depth is None:
+            return None
+
+        return cls(include_paths, exclude_types, max_depth)
+
+    def includes(self, path, sec_type):
+        """
+        Returns whether a Section is selected.
+
+        :param path: list of the names of the Section and all its ancestor Sections
+                     starting with the top level Section.
+        :param sec_type: type of the Section.
+        :return: True if the Section is selected, False otherwise.
+        """
+        if self.max_depth is not None and len(path) > self.max_depth:
+            return False
+
+        if self.exclude_types and sec_type and sec_type.lower() in self.exclude_types:
+            return False
+
+        if self.include_paths is None:
+            return True
+
+        path = tuple(path)
+        for include in self.include_paths:
+            depth = min(len(include), len(path))
+            if include[:depth] == path[:depth]:
+                return True
+
+        return False
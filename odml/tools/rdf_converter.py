@@ -4,15 +4,16 @@ the conversion of odML flavored RDF to odML documents.
 """
 
 import os
+import re
 import string
 import uuid
 import warnings
 
 from io import StringIO
+from types import MappingProxyType
 
 from rdflib import __version__ as rdflib_version
 from rdflib import Graph, Literal, URIRef
-from rdflib.graph import Seq
 try:
     from rdflib.container import Seq as CollSeq
 except ImportError as exc:
@@ -27,7 +28,7 @@ import odml
 from ..format import Format, Document, Section, Property
 from ..info import FORMAT_VERSION, INSTALL_PATH
 from .dict_parser import DictReader
-from .parser_utils import ParserException, RDF_CONVERSION_FORMATS
+from .parser_utils import ParserException, RDF_CONVERSION_FORMATS, open_file
 
 ODML_NS = Format.namespace()
 
@@ -65,6 +66,39 @@ def load_rdf_subclasses():
     return section_subclasses
 
 
+# Default subclass mapping and RDF subclass nodes; loaded on first use.
+_DEFAULT_SUBCLASSES = None
+
+
+def _subclass_nodes(section_subclasses):
+    """
+    Returns a dictionary of Section types and the RDF nodes of their subclasses.
+
+    :param section_subclasses: Dictionary of the form {'Section type': 'RDF class type'}
+    """
+    return dict((sec_type, ODML_NS[class_name])
+                for sec_type, class_name in section_subclasses.items())
+
+
+def default_rdf_subclasses():
+    """
+    Returns the default odml section types to RDF Section subclass types mapping
+    and the corresponding RDF subclass nodes. The mapping file is loaded only
+    once per process; both mappings are read only.
+
+    :return: tuple of read only dictionaries of the form {'Section type': 'RDF class type'}
+             and {'Section type': RDF subclass node}
+    """
+    global _DEFAULT_SUBCLASSES
+
+    if _DEFAULT_SUBCLASSES is None:
+        section_subclasses = load_rdf_subclasses() or {}
+        _DEFAULT_SUBCLASSES = (MappingProxyType(section_subclasses),
+                               MappingProxyType(_subclass_nodes(section_subclasses)))
+
+    return _DEFAULT_SUBCLASSES
+
+
 class RDFWriter(object):
     """
     A writer to parse odML files into RDF documents.
@@ -73,6 +107,11 @@ class RDFWriter(object):
     RDF Subclasses.
     Provide a custom Section type to RDF Subclass Name mapping dictionary via the
     'custom_subclasses' attribute to add custom or overwrite default RDF Subclass mappings.
+    Use the 'deterministic_ids' flag to derive the identifiers of value sequence and
+    terminology nodes from their content; repeated exports of an unchanged document
+    result in identical RDF graphs. The 'turtle', 'n3' and N-Triples output is
+    identical byte for byte, N-Triples lines are sorted for this purpose. The
+    serialized order of other formats like 'xml' may still differ between processes.
 
     Usage:
         RDFWriter(odml_docs).get_rdf_str('turtle')
@@ -80,9 +119,11 @@ class RDFWriter(object):
 
         RDFWriter(odml_docs, rdf_subclassing=False).write_file("path", "rdf_format")
         RDFWriter(odml_docs, custom_subclasses=custom_dict).write_file("path", "rdf_format")
+        RDFWriter(odml_docs, deterministic_ids=True).write_file("path", "rdf_format")
     """
 
-    def __init__(self, odml_documents, rdf_subclassing=True, custom_subclasses=None):
+    def __init__(self, odml_documents, rdf_subclassing=True, custom_subclasses=None,
+                 deterministic_ids=False):
         """
         :param odml_documents: list of odML documents
         :param rdf_subclassing: Flag whether Section types should be converted to RDF Subclasses
@@ -95,6 +136,10 @@ class RDFWriter(object):
                                   RDF document.
                                   Key:value pairs of the "custom_subclasses" dict will overwrite
                                   existing key:value pairs of the default subclassing dict.
+        :param deterministic_ids: Flag whether the identifiers of value sequence nodes are
+                                  derived from the id of their Property and the identifiers
+                                  of terminology nodes from the terminology url instead of
+                                  being random. Default is 'False'.
         """
         if not isinstance(odml_documents, list):
             odml_documents = [odml_documents]
@@ -105,8 +150,9 @@ class RDFWriter(object):
         self.graph.bind("odml", ODML_NS)
 
         self.rdf_subclassing = rdf_subclassing
+        self.deterministic_ids = deterministic_ids
 
-        self.section_subclasses = load_rdf_subclasses()
+        self.section_subclasses, self._subclass_nodes = default_rdf_subclasses()
         # If a custom Section type to RDF Subclass dict has been provided,
         # parse it and update the default section_subclasses dict with the content.
         if custom_subclasses and isinstance(custom_subclasses, dict):
@@ -129,6 +175,20 @@ class RDFWriter(object):
 
         return self.graph
 
+    def _new_node(self, seed):
+        """
+        Returns the URI of a new RDF node. If deterministic ids are enabled, the
+        identifier of the node is derived from the provided seed, a random
+        identifier is used otherwise.
+
+        :param seed: string uniquely identifying the content of the node.
+        :return: RDF URI.
+        """
+        if self.deterministic_ids:
+            return URIRef(ODML_NS + str(uuid.uuid5(uuid.NAMESPACE_URL, seed)))
+
+        return URIRef(ODML_NS + str(uuid.uuid4()))
+
     def save_odml_values(self, parent_node, rdf_predicate, values):
         """
         save_odml_values adds an RDF seq node to the parent RDF node
@@ -139,7 +199,7 @@ class RDFWriter(object):
                               to the current parent node.
         :param values: list of odml values.
         """
-        seq = URIRef(ODML_NS + str(uuid.uuid4()))
+        seq = self._new_node("%s/values" % parent_node)
         self.graph.add((seq, RDF.type, RDF.Seq))
         self.graph.add((parent_node, rdf_predicate, seq))
 
@@ -202,7 +262,7 @@ class RDFWriter(object):
         if not terminology_node:
             # adding terminology url value to the graph and linking it
             # to the current RDF node.
-            terminology_node = URIRef(ODML_NS + str(uuid.uuid4()))
+            terminology_node = self._new_node(str(leaf_value))
             self.graph.add((terminology_node, RDF.type, URIRef(leaf_value)))
             self.graph.add((self.hub_root, ODML_NS.hasTerminology, terminology_node))
 
@@ -338,15 +398,15 @@ class RDFWriter(object):
                  in the section_subclasses dict.
         """
         sec_type = getattr(elem, "type")
-        if sec_type and sec_type in self.section_subclasses:
-            return ODML_NS[self.section_subclasses[sec_type]]
+        if sec_type:
+            return self._subclass_nodes.get(sec_type)
 
         return None
 
     def _parse_custom_subclasses(self, custom_subclasses):
         """
         Parses a provided dictionary of "Section type": "RDF Subclass name"
-        key value pairs and adds the pairs to the parsers' 'section_subclasses'
+        key value pairs and adds the pairs to a copy of the parsers' 'section_subclasses'
         default dictionary. Existing key:value pairs will be overwritten
         with provided custom key:value pairs and a Warning will be issued.
         Dictionary values containing whitespaces will raise a ValueError.
@@ -362,13 +422,18 @@ class RDFWriter(object):
             msg = "Custom RDF Subclass names must not contain any whitespace characters."
             raise ValueError(msg)
 
+        # The default mapping is shared and read only.
+        section_subclasses = dict(self.section_subclasses)
         for k in custom_subclasses:
             val = custom_subclasses[k]
-            if k in self.section_subclasses:
+            if k in section_subclasses:
                 msg = "RDFWriter custom subclasses: Key '%s' already exists. " % k
-                msg += "Value '%s' replaces default value '%s'." % (val, self.section_subclasses[k])
+                msg += "Value '%s' replaces default value '%s'." % (val, section_subclasses[k])
                 warnings.warn(msg, stacklevel=2)
-            self.section_subclasses[k] = val
+            section_subclasses[k] = val
+
+        self.section_subclasses = section_subclasses
+        self._subclass_nodes = _subclass_nodes(section_subclasses)
 
     def __str__(self):
         if rdflib_version_major() >= 6:
@@ -397,8 +462,15 @@ class RDFWriter(object):
             raise ValueError(msg)
 
         if rdflib_version_major() >= 6:
-            return self.convert_to_rdf().serialize(format=rdf_format)
-        return self.convert_to_rdf().serialize(format=rdf_format).decode("utf-8")
+            rdf_str = self.convert_to_rdf().serialize(format=rdf_format)
+        else:
+            rdf_str = self.convert_to_rdf().serialize(format=rdf_format).decode("utf-8")
+
+        # rdflib writes N-Triples in hash order, which changes between processes.
+        if self.deterministic_ids and RDF_CONVERSION_FORMATS[rdf_format] == ".nt":
+            rdf_str = "".join(sorted(rdf_str.splitlines(True)))
+
+        return rdf_str
 
     def write_file(self, filename, rdf_format="turtle"):
         """
@@ -416,10 +488,192 @@ class RDFWriter(object):
         if filename.find(RDF_CONVERSION_FORMATS.get(rdf_format)) < 0:
             filename_ext += RDF_CONVERSION_FORMATS.get(rdf_format)
 
-        with open(filename_ext, "w") as out_file:
+        with open_file(filename_ext, "w") as out_file:
             out_file.write(data)
 
 
+STREAM_FORMATS = {
+    'nt': 'nt',
+    'ntriples': 'nt',
+    'nt11': 'nt',
+    'turtle': 'turtle',
+    'ttl': 'turtle'
+}
+
+# Prefixes of the namespaces written to streamed Turtle files.
+TURTLE_PREFIXES = [("odml", str(ODML_NS)), ("rdf", str(RDF)),
+                   ("rdfs", str(RDFS)), ("xsd", str(XSD))]
+
+TURTLE_LOCAL_NAME = re.compile(r"^[A-Za-z0-9_](?:[A-Za-z0-9_.\-]*[A-Za-z0-9_\-])?$")
+
+
+class _TripleStream(object):
+    """
+    Replacement of the rdflib Graph used by the RDFStreamWriter. Triples are
+    written to a file as soon as they are added. Only the triples defining RDF
+    Section subclasses are kept in memory to avoid writing them repeatedly.
+    """
+
+    def __init__(self, out_file, rdf_format):
+        self.out_file = out_file
+        self.turtle = STREAM_FORMATS[rdf_format] == "turtle"
+        self._subject = None
+        self._class_triples = set()
+
+        if self.turtle:
+            for prefix, namespace in TURTLE_PREFIXES:
+                out_file.write("@prefix %s: <%s> .\n" % (prefix, namespace))
+            out_file.write("\n")
+
+    def _term(self, term):
+        if isinstance(term, Literal):
+            lexical = '"%s"' % str(term).replace("\\", "\\\\").replace("\n", "\\n") \
+                .replace('"', '\\"').replace("\r", "\\r")
+            if term.language:
+                return "%s@%s" % (lexical, term.language)
+            if term.datatype:
+                return "%s^^%s" % (lexical, self._term(URIRef(term.datatype)))
+            return lexical
+
+        if self.turtle:
+            for prefix, namespace in TURTLE_PREFIXES:
+                if term.startswith(namespace):
+                    local_name = term[len(namespace):]
+                    if TURTLE_LOCAL_NAME.match(local_name):
+                        return "%s:%s" % (prefix, local_name)
+
+        return term.n3()
+
+    def add(self, triple):
+        """
+        Writes a triple to the output file.
+
+        :param triple: tuple of subject, predicate and object.
+        """
+        subj, pred, obj = triple
+        if pred == RDFS.subClassOf or obj == RDFS.Class:
+            if triple in self._class_triples:
+                return
+            self._class_triples.add(triple)
+
+        # Consecutive Turtle triples of the same subject are combined.
+        if self.turtle and subj == self._subject:
+            self.out_file.write(" ;\n    %s %s" % (self._term(pred), self._term(obj)))
+            return
+
+        if self._subject is not None:
+            self.out_file.write(" .\n")
+        self._subject = subj
+        self.out_file.write("%s %s %s" % (self._term(subj), self._term(pred), self._term(obj)))
+
+    def close(self):
+        """
+        Terminates the last written triple.
+        """
+        if self._subject is not None:
+            self.out_file.write(" .\n")
+        self._subject = None
+
+
+class RDFStreamWriter(RDFWriter):
+    """
+    A writer exporting odML documents to N-Triples or Turtle without building an
+    rdflib Graph. Triples are written to the output while the odML documents are
+    traversed, which considerably reduces the time and memory required to export
+    large documents. The exported RDF graph is isomorphic to the graph exported
+    by the RDFWriter; the serializations differ since e.g. values are stored in
+    RDF Seq nodes with random identifiers.
+
+    Usage:
+        RDFStreamWriter(odml_docs).write_file("/output_path", "nt")
+        RDFStreamWriter(odml_docs).get_rdf_str("turtle")
+    """
+
+    def __init__(self, odml_documents, rdf_subclassing=True, custom_subclasses=None,
+                 deterministic_ids=False):
+        super(RDFStreamWriter, self).__init__(odml_documents, rdf_subclassing,
+                                              custom_subclasses, deterministic_ids)
+        self.graph = None
+        self._terminologies = {}
+
+    def save_odml_values(self, parent_node, rdf_predicate, values):
+        seq = self._new_node("%s/values" % parent_node)
+        self.graph.add((parent_node, rdf_predicate, seq))
+
+        # Identical to the numbered elements of an rdflib Seq container.
+        for counter, curr_val in enumerate(values, 1):
+            self.graph.add((seq, URIRef("%s_%s" % (str(RDF), counter)), Literal(curr_val)))
+        self.graph.add((seq, RDF.type, RDF.Seq))
+
+    def save_repository_node(self, parent_node, rdf_predicate, leaf_value):
+        # Terminology nodes are looked up in a dictionary instead of the graph.
+        terminology_node = self._terminologies.get(leaf_value)
+        if not terminology_node:
+            terminology_node = self._new_node(str(leaf_value))
+            self._terminologies[leaf_value] = terminology_node
+            self.graph.add((terminology_node, RDF.type, URIRef(leaf_value)))
+            self.graph.add((self.hub_root, ODML_NS.hasTerminology, terminology_node))
+
+        self.graph.add((parent_node, rdf_predicate, terminology_node))
+
+    @staticmethod
+    def _check_format(rdf_format):
+        if rdf_format not in STREAM_FORMATS:
+            msg = "odml.RDFStreamWriter: Format for output files is incorrect."
+            msg = "%s Please choose from the list: %s" % (msg, list(STREAM_FORMATS))
+            raise ValueError(msg)
+
+    def _stream(self, out_file, rdf_format):
+        self._check_format(rdf_format)
+
+        self.graph = _TripleStream(out_file, rdf_format)
+        self._terminologies = {}
+        try:
+            self.convert_to_rdf()
+            self.graph.close()
+        finally:
+            self.graph = None
+            self._terminologies = {}
+
+    def __str__(self):
+        return self.get_rdf_str("turtle")
+
+    def __unicode__(self):
+        return self.get_rdf_str("turtle")
+
+    def get_rdf_str(self, rdf_format="nt"):
+        """
+        Convert the odML content of the writer to RDF and return it as a string
+        object in the specified RDF format.
+
+        :param rdf_format: RDF output format. Default format is 'nt'.
+                           Available formats: 'nt', 'ntriples', 'nt11', 'turtle', 'ttl'.
+
+        :return: string object
+        """
+        out_str = StringIO()
+        self._stream(out_str, rdf_format)
+        return out_str.getvalue()
+
+    def write_file(self, filename, rdf_format="nt"):
+        """
+        Convert the odML content of the writer to RDF and write the triples to
+        an output file in the specified RDF format while the content is converted.
+
+        :param filename: path of the output file.
+        :param rdf_format: RDF output format. Default format is 'nt'.
+                           Available formats: 'nt', 'ntriples', 'nt11', 'turtle', 'ttl'.
+        """
+        self._check_format(rdf_format)
+
+        filename_ext = filename
+        if filename.find(RDF_CONVERSION_FORMATS.get(rdf_format)) < 0:
+            filename_ext += RDF_CONVERSION_FORMATS.get(rdf_format)
+
+        with open_file(filename_ext, "w", encoding="utf-8") as out_file:
+            self._stream(out_file, rdf_format)
+
+
 class RDFReader(object):
     """
     A reader to parse odML RDF files or strings into odML documents.
@@ -437,7 +691,8 @@ class RDFReader(object):
         """
         self.docs = []  # list of parsed odml docs
         if filename and doc_format:
-            self.graph = Graph().parse(source=filename, format=doc_format)
+            with open_file(filename, "rb") as source:
+                self.graph = Graph().parse(source=source, format=doc_format)
 
     def to_odml(self):
         """
@@ -464,7 +719,8 @@ class RDFReader(object):
         :param doc_format: RDF format of the input odML RDF file.
         :return: list of converted odML documents
         """
-        self.graph = Graph().parse(source=filename, format=doc_format)
+        with open_file(filename, "rb") as source:
+            self.graph = Graph().parse(source=source, format=doc_format)
         docs = self.to_odml()
         for curr_doc in docs:
             # Provide original file name via the document
@@ -484,6 +740,52 @@ class RDFReader(object):
         self.graph = Graph().parse(source=StringIO(file), format=doc_format)
         return self.to_odml()
 
+    def _predicate_objects(self, subject):
+        """
+        Returns all objects of an RDF subject grouped by their predicates using
+        a single graph lookup.
+
+        :param subject: RDF URI of a node within an RDF graph.
+        :return: dict of predicates and the lists of their objects.
+        """
+        objects = {}
+        for _, pred, obj in self.graph.triples((subject, None, None)):
+            if pred in objects:
+                objects[pred].append(obj)
+            else:
+                objects[pred] = [obj]
+
+        return objects
+
+    def _seq_values(self, seq_uri):
+        """
+        Returns the values of an RDF Seq node in the order of their rdf:_nnn
+        predicates. For rdflib versions below 6, RDF.li values are supported
+        as well and returned if present.
+
+        :param seq_uri: RDF URI of an RDF Seq node within an RDF graph.
+        :return: list of python values.
+        """
+        seq_objects = self._predicate_objects(seq_uri)
+
+        # rdflib does not respect order with RDF.li items yet, see comment in
+        # RDFWriter.save_odml_values; support both RDF.li and rdf:_nnn for now.
+        # Remove RDF.li once rdflib respects RDF.li order in an RDF.Seq obj.
+        if rdflib_version_major() < 6 and RDF.li in seq_objects:
+            return [curr_val.toPython() for curr_val in seq_objects[RDF.li]]
+
+        # rdflib version 6.x.x+ should support rdf:_nnn only, RDF.li
+        # are not supported; sorted like the items of an rdflib Seq.
+        li_index = str(RDF) + "_"
+        items = []
+        for pred, objects in seq_objects.items():
+            if pred.startswith(li_index):
+                index = int(pred[len(li_index):])
+                items.extend((index, obj) for obj in objects)
+        items.sort()
+
+        return [seq_item.toPython() for _, seq_item in items]
+
     def parse_document(self, doc_uri):
         """
         parse_document parses an odML RDF Document node into an odML Document.
@@ -491,13 +793,13 @@ class RDFReader(object):
         :param doc_uri: RDF URI of an odML Document node within an RDF graph.
         :return: dict containing an odML Document
         """
+        objects = self._predicate_objects(doc_uri)
+
         doc_attrs = {}
         for attr in Document.rdf_map_items:
-            elems = list(self.graph.objects(subject=doc_uri, predicate=attr[1]))
+            elems = objects.get(attr[1])
             if attr[0] == "sections":
-                doc_attrs[attr[0]] = []
-                for sec in elems:
-                    doc_attrs[attr[0]].append(self.parse_section(sec))
+                doc_attrs[attr[0]] = [self.parse_section(sec) for sec in elems or []]
             elif attr[0] == "id":
                 doc_attrs[attr[0]] = doc_uri.split("#", 1)[1]
             elif elems:
@@ -512,17 +814,15 @@ class RDFReader(object):
         :param sec_uri: RDF URI of an odML Section node within an RDF graph.
         :return: dict containing an odML Section
         """
+        objects = self._predicate_objects(sec_uri)
+
         sec_attrs = {}
         for attr in Section.rdf_map_items:
-            elems = list(self.graph.objects(subject=sec_uri, predicate=attr[1]))
+            elems = objects.get(attr[1])
             if attr[0] == "sections":
-                sec_attrs[attr[0]] = []
-                for sec in elems:
-                    sec_attrs[attr[0]].append(self.parse_section(sec))
+                sec_attrs[attr[0]] = [self.parse_section(sec) for sec in elems or []]
             elif attr[0] == "properties":
-                sec_attrs[attr[0]] = []
-                for prop in elems:
-                    sec_attrs[attr[0]].append(self.parse_property(prop))
+                sec_attrs[attr[0]] = [self.parse_property(prop) for prop in elems or []]
             elif attr[0] == "id":
                 sec_attrs[attr[0]] = sec_uri.split("#", 1)[1]
             elif elems:
@@ -538,33 +838,13 @@ class RDFReader(object):
         :param prop_uri: RDF URI of an odML Property node within an RDF graph.
         :return: dict containing an odML Property
         """
+        objects = self._predicate_objects(prop_uri)
+
         prop_attrs = {}
         for attr in Property.rdf_map_items:
-            elems = list(self.graph.objects(subject=prop_uri, predicate=attr[1]))
+            elems = objects.get(attr[1])
             if attr[0] == "value" and elems:
-                prop_attrs[attr[0]] = []
-
-                if rdflib_version_major() >= 6:
-                    # rdflib version 6.x.x+ should support rdf:_nnn only, RDF.li
-                    # are not supported; reverse import the blank node values;
-                    # hopefully in the correct order.
-                    val_seq = Seq(graph=self.graph, subject=elems[0])
-                    for seq_item in val_seq:
-                        prop_attrs[attr[0]].append(seq_item.toPython())
-                else:
-                    # rdflib does not respect order with RDF.li items yet, see comment above
-                    # support both RDF.li and rdf:_nnn for now.
-                    # Remove rdf:_nnn once rdflib respects RDF.li order in an RDF.Seq obj.
-                    values = list(self.graph.objects(subject=elems[0], predicate=RDF.li))
-                    if values:
-                        for curr_val in values:
-                            prop_attrs[attr[0]].append(curr_val.toPython())
-                    else:
-                        # rdf:__nnn part
-                        val_seq = Seq(graph=self.graph, subject=elems[0])
-                        for seq_item in val_seq:
-                            prop_attrs[attr[0]].append(seq_item.toPython())
-
+                prop_attrs[attr[0]] = self._seq_values(elems[0])
             elif attr[0] == "id":
                 prop_attrs[attr[0]] = prop_uri.split("#", 1)[1]
             elif elems:
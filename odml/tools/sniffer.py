@@ -0,0 +1,125 @@
+"""
+The sniffer module identifies the file format and the odML format version of
+odML files and strings by inspecting their first and last bytes, which allows
+loading files with the matching parser without trial and error.
+
+Usage:
+    >>> parser, rdf_format, version = sniff_file("file.odml")
+"""
+import os
+import re
+
+from .binary_parser import MAGIC as BINARY_MAGIC
+from .parser_utils import ParserException, compression_format, open_file
+from ..info import FORMAT_VERSION
+
+# Number of bytes inspected at the start and the end of a file.
+SNIFF_SIZE = 4096
+
+XML_ODML = re.compile(r"<odML\b")
+XML_VERSION = re.compile(r"<odML\b[^>]*?\bversion\s*=\s*[\"']([^\"']*)[\"']")
+JSON_VERSION = re.compile(r"\"odml-version\"\s*:\s*\"?([^\",}\s]*)")
+YAML_KEYS = re.compile(r"^(?:Document|odml-version)\s*:", re.MULTILINE)
+YAML_VERSION = re.compile(r"^odml-version\s*:\s*[\"']?([^\"'\s]+)", re.MULTILINE)
+RDF_XML = re.compile(r"<rdf:RDF\b|www\.w3\.org/1999/02/22-rdf-syntax-ns")
+NTRIPLES = re.compile(r"^(?:<[^>\s]*>|_:\S+)\s+<[^>\s]*>\s+\S", re.MULTILINE)
+TURTLE = re.compile(r"^\s*(?:@prefix|@base|PREFIX|BASE)\b", re.IGNORECASE | re.MULTILINE)
+
+
+def sniff_content(head, tail=b""):
+    """
+    Identifies the format of odML content from its first and optionally its
+    last bytes.
+
+    :param head: first bytes or characters of the content.
+    :param tail: last bytes or characters of the content; used to find the
+                 odML format version of JSON and YAML content.
+    :return: tuple of the name of the odML parser (see SUPPORTED_PARSERS), the RDF
+             format for RDF content or None and the odML format version or None
+             if the version cannot be identified from the inspected content.
+    """
+    if isinstance(head, bytes):
+        if head.startswith(BINARY_MAGIC):
+            return "BINARY", None, None
+        head = head.decode("utf-8", "ignore")
+    if isinstance(tail, bytes):
+        tail = tail.decode("utf-8", "ignore")
+
+    text = head.lstrip("\ufeff \t\r\n")
+    content = head + tail
+
+    if text.startswith("<"):
+        if XML_ODML.search(text):
+            version = XML_VERSION.search(text)
+            return "XML", None, version.group(1) if version else None
+        if NTRIPLES.match(text):
+            return "RDF", "nt", None
+        if RDF_XML.search(text):
+            return "RDF", "xml", None
+        if text.startswith("<TriX"):
+            return "RDF", "trix", None
+        return "XML", None, None
+
+    if text.startswith("{") or text.startswith("["):
+        if '"@context"' in text or '"@id"' in text:
+            return "RDF", "json-ld", None
+        version = JSON_VERSION.search(content)
+        return "JSON", None, version.group(1) if version else None
+
+    if TURTLE.match(text):
+        return "RDF", "turtle", None
+
+    if YAML_KEYS.search(text):
+        version = YAML_VERSION.search(content)
+        return "YAML", None, version.group(1) if version else None
+
+    if NTRIPLES.match(text):
+        return "RDF", "nt", None
+
+    raise ParserException("Could not identify the format of the odML content.")
+
+
+def sniff_file(filename):
+    """
+    Identifies the format of an odML file. Compressed files are inspected
+    after decompression. See 'sniff_content' for details.
+
+    :param filename: path of an odML file.
+    :return: tuple of the name of the odML parser, the RDF format or None and
+             the odML format version or None.
+    """
+    with open_file(filename, "rb") as file:
+        head = file.read(SNIFF_SIZE)
+
+    # The format version of JSON and YAML files is usually stored at their end;
+    # only uncompressed files can be read from the end without reading everything.
+    tail = b""
+    if compression_format(filename) is None:
+        size = os.path.getsize(filename)
+        if size > SNIFF_SIZE:
+            with open(filename, "rb") as file:
+                file.seek(max(size - SNIFF_SIZE, SNIFF_SIZE))
+                tail = file.read()
+
+    try:
+        return sniff_content(head, tail)
+    except ParserException:
+        raise ParserException("Could not identify the format of file '%s'." % filename)
+
+
+def is_previous_version(filename):
+    """
+    Returns True if content sniffing identifies the file as an odML file of a
+    previous odML format version, which has to be converted with the
+    VersionConverter before it can be loaded. Returns False if the file has the
+    current format version or if the version cannot be identified.
+
+    :param filename: path of an odML file.
+    :return: bool
+    """
+    try:
+        version = sniff_file(filename)[2]
+    except (OSError, ParserException):
+        return False
+
+    return version is not None and version != FORMAT_VERSION
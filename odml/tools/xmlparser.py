@@ -6,8 +6,13 @@ The parser can be invoked standalone:
     python -m odml.tools.xmlparser file.odml
 """
 import csv
+import os
+import re
+import stat
 import sys
+import tempfile
 
+from functools import partial
 from os.path import basename
 
 from lxml import etree as ET
@@ -22,6 +27,7 @@ except ImportError:
 from .. import format as ofmt
 from ..info import FORMAT_VERSION
 from .parser_utils import InvalidVersionException, ParserException, odml_tuple_export
+from .parser_utils import open_file, report_value_error
 
 
 XML_HEADER = """<?xml version="1.0" encoding="UTF-8"?>"""
@@ -71,9 +77,17 @@ def parse_cardinality(val):
     return None
 
 
+# Characters requiring a value to be quoted by the csv "excel" dialect.
+CSV_QUOTE_CHARS = re.compile('[,"\r\n]')
+# Characters requiring a full csv reader to split a value string.
+CSV_READ_CHARS = re.compile('["\r\n]')
+
+
 def to_csv(val):
     """
     Modifies odML values for serialization to strings and files.
+    The output is identical to writing the values with a csv.writer
+    using the "excel" dialect.
 
     :param val: odML value.
     :return: modified value string.
@@ -81,12 +95,19 @@ def to_csv(val):
     # Make sure all individual values do not contain
     # leading or trailing whitespaces.
     unicode_values = list(map(str.strip, map(str, val)))
-    stream = StringIO()
-    writer = csv.writer(stream, dialect="excel")
-    writer.writerow(unicode_values)
-    # Strip any csv.writer added carriage return line feeds
-    # and double quotes before saving.
-    csv_string = stream.getvalue().strip().strip('"')
+
+    # Values that do not require quoting are simply joined,
+    # only the remaining ones are handled by the csv module.
+    if CSV_QUOTE_CHARS.search("".join(unicode_values)):
+        stream = StringIO()
+        writer = csv.writer(stream, dialect="excel")
+        writer.writerow(unicode_values)
+        # Strip any csv.writer added carriage return line feeds
+        # and double quotes before saving.
+        csv_string = stream.getvalue().strip().strip('"')
+    else:
+        csv_string = ",".join(unicode_values)
+
     if len(unicode_values) > 1:
         csv_string = "[" + csv_string + "]"
     return csv_string
@@ -111,8 +132,13 @@ def from_csv(value_string):
 
     if not value_string:
         return []
+
+    # Without quotes or line breaks the csv "excel" dialect
+    # is equivalent to a plain split.
+    if not CSV_READ_CHARS.search(value_string):
+        return value_string.split(",")
+
     stream = StringIO(value_string)
-    stream.seek(0)
     reader = csv.reader(stream, dialect="excel")
     return list(reader)[0]
 
@@ -127,23 +153,23 @@ class XMLWriter:
         self.doc = odml_document
 
     @staticmethod
-    def save_element(curr_el):
+    def _iter_children(curr_el):
         """
-        Returns an XML node for the odML object curr_el.
+        Yields the content of the odML object curr_el in XML element order.
+        Attributes are yielded as XML leaf nodes, child odML objects
+        (Sections and Properties) are yielded as is.
 
         :param curr_el: odML object. Supported objects are odml.Document, odml.Section,
                         odml.Property.
-        :returns: parsed XML Node.
         """
         fmt = curr_el.format()
-        cur = E(fmt.name)
-
-        # generate attributes
-        if isinstance(fmt, ofmt.Document.__class__):
-            cur.attrib['version'] = FORMAT_VERSION
-
-        # generate elements
         for k in fmt.arguments_keys:
+            if isinstance(fmt, ofmt.Property.__class__) and k == "value" and \
+                    curr_el._raw_values is not None and curr_el._raw_values[1] is from_csv:
+                # Lazily loaded values that have not been accessed are saved unchanged.
+                yield E(k, curr_el._raw_values[0])
+                continue
+
             if not hasattr(curr_el, fmt.map(k)):
                 continue
 
@@ -154,22 +180,86 @@ class XMLWriter:
             if isinstance(fmt, ofmt.Property.__class__) and k == "value":
                 # Custom odML tuples require special handling for save loading from file.
                 if curr_el.dtype and curr_el.dtype.endswith("-tuple") and val:
-                    ele = E(k, odml_tuple_export(val))
+                    yield E(k, odml_tuple_export(val))
                 else:
-                    ele = E(k, to_csv(val))
-                cur.append(ele)
+                    yield E(k, to_csv(val))
+            elif isinstance(val, list):
+                for curr_val in val:
+                    if curr_val is None:
+                        continue
+                    yield curr_val
             else:
-                if isinstance(val, list):
-                    for curr_val in val:
-                        if curr_val is None:
-                            continue
-                        ele = XMLWriter.save_element(curr_val)
-                        cur.append(ele)
-                else:
-                    ele = E(k, str(val))
-                    cur.append(ele)
+                yield E(k, str(val))
+
+    @staticmethod
+    def _attributes(curr_el):
+        """
+        Returns the XML attributes of the XML node for the odML object curr_el.
+
+        :param curr_el: odML object.
+        :returns: dictionary of XML attributes.
+        """
+        if isinstance(curr_el.format(), ofmt.Document.__class__):
+            return {"version": FORMAT_VERSION}
+        return {}
+
+    @staticmethod
+    def save_element(curr_el):
+        """
+        Returns an XML node for the odML object curr_el.
+
+        :param curr_el: odML object. Supported objects are odml.Document, odml.Section,
+                        odml.Property.
+        :returns: parsed XML Node.
+        """
+        cur = E(curr_el.format().name, XMLWriter._attributes(curr_el))
+
+        for child in XMLWriter._iter_children(curr_el):
+            if not ET.iselement(child):
+                child = XMLWriter.save_element(child)
+            cur.append(child)
+
         return cur
 
+    @staticmethod
+    def stream_element(xml_file, curr_el, depth=0):
+        """
+        Incrementally writes the XML representation of the odML object curr_el
+        to an open lxml.etree.xmlfile context. Only the XML leaf nodes of a single
+        odML object are created at any time, the odML tree itself is never
+        converted to an XML tree.
+
+        :param xml_file: open lxml.etree.xmlfile context.
+        :param curr_el: odML object. Supported objects are odml.Document, odml.Section,
+                        odml.Property.
+        :param depth: nesting depth of curr_el used to indent the output.
+        """
+        with xml_file.element(curr_el.format().name, XMLWriter._attributes(curr_el)):
+            XMLWriter._stream_children(xml_file, curr_el, depth)
+
+    @staticmethod
+    def _stream_children(xml_file, curr_el, depth):
+        """
+        Incrementally writes the content of the odML object curr_el to an
+        open lxml.etree.xmlfile context.
+
+        :param xml_file: open lxml.etree.xmlfile context.
+        :param curr_el: odML object.
+        :param depth: nesting depth of curr_el used to indent the output.
+        """
+        indent = "\n" + "  " * (depth + 1)
+        has_children = False
+        for child in XMLWriter._iter_children(curr_el):
+            has_children = True
+            xml_file.write(indent)
+            if ET.iselement(child):
+                xml_file.write(child)
+            else:
+                XMLWriter.stream_element(xml_file, child, depth + 1)
+
+        if has_children:
+            xml_file.write(indent[:-2])
+
     def __str__(self):
         return ET.tounicode(self.save_element(self.doc), pretty_print=True)
 
@@ -179,6 +269,9 @@ class XMLWriter:
     def write_file(self, filename, local_style=False, custom_template=None):
         """
         write_file saves the XMLWriters odML document to an XML file.
+        The document is written incrementally; no full XML tree or string
+        of the document is held in memory. The file is only replaced once
+        the whole document has been written.
 
         :param filename: location and name where the file will be written to.
         :param local_style: Optional boolean. By default an odML XML document is saved
@@ -195,25 +288,56 @@ class XMLWriter:
                                 full XSL stylesheet, but has to start and end with the
                                 tag: '<xsl:template match="odML">[custom]</xsl:template>'.
         """
-        # calculate the data before opening the file in case we get any exception
-        data = str(self)
-
-        with open(filename, "w", encoding = "utf-8") as file:
-            file.write("%s\n" % XML_HEADER)
-            if not local_style and not custom_template:
-                file.write("%s\n" % EXTERNAL_STYLE_HEADER)
-            else:
-                file.write("%s\n" % INFILE_STYLE_HEADER)
-
-                template = INFILE_TEMPLATE_WRAPPER % INFILE_STYLE_TEMPLATE
-                if custom_template:
-                    template = INFILE_TEMPLATE_WRAPPER % custom_template
+        template = None
+        header = "%s\n%s\n" % (XML_HEADER, EXTERNAL_STYLE_HEADER)
+        if local_style or custom_template:
+            header = "%s\n%s\n" % (XML_HEADER, INFILE_STYLE_HEADER)
+            template = INFILE_TEMPLATE_WRAPPER % (custom_template or INFILE_STYLE_TEMPLATE)
+
+        # Write to a temporary file first, an exception while writing
+        # must not leave a truncated file at the target location.
+        handle, tmp_name = tempfile.mkstemp(dir=os.path.dirname(filename) or ".",
+                                            suffix=os.path.splitext(filename)[1])
+        os.close(handle)
+        try:
+            with open_file(tmp_name, "wb") as file:
+                file.write(header.encode("utf-8"))
+                with ET.xmlfile(file, encoding="utf-8") as xml_file:
+                    if template is None:
+                        self.stream_element(xml_file, self.doc)
+                    else:
+                        with xml_file.element(self.doc.format().name,
+                                              self._attributes(self.doc)):
+                            # The stylesheet is written verbatim; the buffered XML
+                            # output has to be flushed before writing to the file.
+                            xml_file.write("\n")
+                            xml_file.flush()
+                            file.write(("%s\n" % template).encode("utf-8"))
+
+                            self._stream_children(xml_file, self.doc, 0)
+                file.write(b"\n")
+            os.chmod(tmp_name, _file_mode(filename))
+            os.replace(tmp_name, filename)
+        except BaseException:
+            if os.path.exists(tmp_name):
+                os.remove(tmp_name)
+            raise
+
+
+def _file_mode(filename):
+    """
+    Returns the permissions a file written to filename should have: the
+    permissions of an existing file or the default permissions of a new file.
 
-                replace = """<odML version="%s">""" % FORMAT_VERSION
-                replacement = """<odML version="%s">\n%s\n""" % (FORMAT_VERSION, template)
-                data = data.replace(replace, replacement)
+    :param filename: path of the file.
+    :return: permission bits.
+    """
+    if os.path.exists(filename):
+        return stat.S_IMODE(os.stat(filename).st_mode)
 
-            file.write(data)
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
 
 
 def load(filename):
@@ -231,7 +355,8 @@ class XMLReader(object):
         >>> doc = XMLReader().from_file("file.odml")
     """
 
-    def __init__(self, ignore_errors=False, show_warnings=True, filename=None):
+    def __init__(self, ignore_errors=False, show_warnings=True, filename=None,
+                 validation=None, selection=None, lazy_values=False):
         """
         :param ignore_errors: To allow loading and fixing of invalid odml files
                               encountered errors can be converted to warnings
@@ -241,13 +366,29 @@ class XMLReader(object):
                               Any warnings can be accessed via the Reader's class
                               warnings attribute after parsing is done.
         :param filename: Path to an odml file.
+        :param validation: Optional odml.validation.StreamingValidation. If provided,
+                           every parsed Section and Property is validated as soon
+                           as it has been attached to its parent.
+        :param selection: Optional odml.tools.parser_utils.SectionSelection. If provided,
+                          only the selected Sections are parsed; the XML content of
+                          all other Sections is skipped.
+        :param lazy_values: If True, Property values are stored as read from the file
+                            and only decoded when they are accessed for the first time.
+                            Values that have not been accessed are saved unchanged.
         """
         self.parser = ET.XMLParser(remove_comments=True)
         self.tags = dict([(obj.name, obj) for obj in ofmt.__all__])
         self.ignore_errors = ignore_errors
         self.show_warnings = show_warnings
         self.filename = filename
+        self.validation = validation
+        self.selection = selection
+        self.lazy_values = lazy_values
         self.warnings = []
+        self.doc_attributes = {}
+        self._section_path = []
+        # odML objects already built from XML nodes by the iterative parser.
+        self._built = {}
 
     @staticmethod
     def _handle_version(root):
@@ -275,18 +416,32 @@ class XMLReader(object):
                    % root.attrib['version'])
             raise InvalidVersionException(msg)
 
-    def from_file(self, xml_file):
+    def from_file(self, xml_file, iterative=False):
         """
         Parses the datastream from a file like object and return an odML data structure.
         If the file cannot be parsed, a ParserException is raised.
 
         :param xml_file: file path to an XML input file or file like object.
+        :param iterative: If True, the file is parsed incrementally and the odML
+                          objects are created while the file is read. Parsed XML
+                          elements are discarded immediately, which avoids holding
+                          the full XML tree and the odML document in memory at
+                          the same time. See 'iter_sections' for details.
         :returns: a parsed odml.Document.
         """
+        if iterative:
+            return self._from_file_iterative(xml_file)
+
         try:
-            root = ET.parse(xml_file, self.parser).getroot()
-            if hasattr(xml_file, "close"):
-                xml_file.close()
+            if self.selection is not None:
+                root = self._parse_selected(xml_file)
+            elif isinstance(xml_file, str):
+                with open_file(xml_file, "rb") as file:
+                    root = ET.parse(file, self.parser).getroot()
+            else:
+                root = ET.parse(xml_file, self.parser).getroot()
+                if hasattr(xml_file, "close"):
+                    xml_file.close()
         except ET.XMLSyntaxError as exc:
             raise ParserException(exc.msg)
 
@@ -299,6 +454,233 @@ class XMLReader(object):
 
         return doc
 
+    def _parse_selected(self, xml_file):
+        """
+        Parses an XML file into an lxml tree and removes the node of every Section
+        that is not selected as soon as its closing tag has been read. The XML tree
+        therefore never holds more than the selected Sections and a single
+        unselected Section. Only the end of a Section is reported to Python;
+        all other XML elements are handled by lxml alone.
+
+        Sections whose own or ancestor names are not known when they
+        end are kept and left to the selection in 'parse_section'.
+
+        :param xml_file: file path to an XML input file or file like object.
+        :returns: root node of the parsed lxml.etree.
+        """
+        # Paths and types of the currently open ancestor Section nodes.
+        identities = {}
+        for event, node in self._iter_events(xml_file, events=("end",), tag="section"):
+            if event == "close":
+                return node
+
+            parent = node.getparent()
+            # The name of a Section might have been unknown while its
+            # children were read; identify the complete node again.
+            identities.pop(node, None)
+            identity = self._selection_identity(node, identities)
+            identities.pop(node, None)
+            if parent is None or identity is None:
+                continue
+
+            if not self.selection.includes(*identity):
+                parent.remove(node)
+
+    def _selection_identity(self, node, identities):
+        """
+        Returns the path of names and the type of a Section node, using and
+        filling the cache of already identified ancestor Section nodes.
+
+        :param node: XML node of an odML Section.
+        :param identities: dictionary of Section nodes and their identity.
+        :return: tuple of the Section path and type or None if a name is unknown.
+        """
+        if node in identities:
+            return identities[node]
+
+        name, sec_type = self._section_identity(node)
+        identity = None
+        if name is not None:
+            parent = node.getparent()
+            if parent is None or parent.tag.lower() != "section":
+                identity = ([name], sec_type)
+            else:
+                parent_identity = self._selection_identity(parent, identities)
+                if parent_identity is not None:
+                    identity = (parent_identity[0] + [name], sec_type)
+
+        identities[node] = identity
+        return identity
+
+    def _from_file_iterative(self, xml_file):
+        """
+        Incrementally parses an XML file into an odml.Document.
+
+        :param xml_file: file path to an XML input file or file like object.
+        :returns: a parsed odml.Document.
+        """
+        sections = [sec for sec, _ in self._iter_sections(xml_file)]
+
+        fmt = self.tags["odML"]
+        try:
+            doc = fmt.create(**self.doc_attributes)
+        except Exception as exc:
+            self.error(str(exc), None)
+            # Invalid attributes are skipped, if errors are ignored.
+            doc = fmt.create()
+
+        for sec in sections:
+            doc.append(sec)
+
+        if self.validation is not None:
+            for sec in sections:
+                self.check_validation_errors(self.validation.add(sec), None)
+            self.check_validation_errors(self.validation.finalize(doc), None)
+
+        # Provide original file name via the in memory document
+        if isinstance(xml_file, str):
+            doc.origin_file_name = basename(xml_file)
+
+        return doc
+
+    def iter_sections(self, xml_file):
+        """
+        Incrementally parses an XML file and yields every top-level odml.Section as
+        soon as its closing tag has been read. Every Section and Property is built as
+        soon as its closing tag has been read and its XML content is discarded, so
+        the XML tree only holds the currently open elements and the direct content
+        of the open Sections. If a Section selection is used, nested Sections are
+        built when their top-level Section ends and the XML tree holds a single
+        top-level Section. The yielded Sections are not attached to a Document.
+
+        The attributes of the odML Document are available via the 'doc_attributes'
+        property of the reader once all Sections have been consumed.
+        If the file cannot be parsed, a ParserException is raised.
+
+        Usage:
+            >>> reader = XMLReader()
+            >>> for sec in reader.iter_sections("file.odml"):
+            >>>     print(sec.name)
+
+        :param xml_file: file path to an XML input file or file like object.
+        :returns: generator of parsed top-level odml.Sections.
+        """
+        for sec, node in self._iter_sections(xml_file):
+            if self.validation is not None:
+                self.check_validation_errors(self.validation.add(sec), node)
+            yield sec
+
+    def _iter_sections(self, xml_file):
+        """
+        Generator yielding tuples of parsed top-level odml.Sections and their
+        already cleared XML nodes. Document attributes are collected in the
+        'doc_attributes' property of the reader.
+
+        :param xml_file: file path to an XML input file or file like object.
+        """
+        fmt = self.tags["odML"]
+        self.doc_attributes = {}
+        self._built = {}
+
+        root = None
+        depth = 0
+        try:
+            for event, node in self._iter_events(xml_file):
+                if event == "close":
+                    break
+
+                if event == "start":
+                    if root is None:
+                        root = node
+                        self._handle_version(root)
+                        self.check_attributes(root)
+                    depth += 1
+                    continue
+
+                depth -= 1
+                if depth > 1:
+                    self._build_nested(node)
+                    continue
+
+                # Only handle completed direct children of the root node.
+                if depth != 1:
+                    continue
+
+                node.tag = node.tag.lower()
+                self.is_valid_argument(node.tag, fmt, root, node)
+                sec = None
+                if node.tag == "section":
+                    sec = self.parse_element(node)
+                elif node.tag in fmt.arguments_keys:
+                    self.parse_argument(node, fmt, root, self.doc_attributes)
+
+                # Discard all processed XML content.
+                node.clear()
+                while node.getprevious() is not None:
+                    del root[0]
+
+                if sec is not None:
+                    yield sec, node
+
+        except ET.XMLSyntaxError as exc:
+            raise ParserException(exc.msg)
+
+        if root is None:
+            raise ParserException("Could not find any content in the provided file.")
+
+    def _build_nested(self, node):
+        """
+        Builds the odml.Section or odml.Property of a completed XML node within
+        a Section and discards the content of the node. The built object is
+        attached when its parent Section is parsed. Nothing is built if a Section
+        selection is used, since the selection depends on the ancestor Sections.
+
+        :param node: completed XML node below a top-level Section.
+        """
+        tag = node.tag.lower()
+        if self.selection is not None or tag not in ("section", "property") or \
+                node.getparent().tag.lower() != "section":
+            return
+
+        node.tag = tag
+        self._built[node] = self.parse_element(node)
+        node.clear()
+
+    @staticmethod
+    def _iter_events(xml_file, chunk_size=65536, events=("start", "end"), tag=None):
+        """
+        Reads an XML file in chunks and yields the parser events of all XML
+        elements. After the file has been read, the root node of the parsed
+        XML tree is yielded with the event 'close'. Works with file paths as
+        well as with text and binary file like objects.
+
+        :param xml_file: file path to an XML input file or file like object.
+        :param chunk_size: number of characters or bytes read at once.
+        :param events: parser events that are reported.
+        :param tag: Optional tag name; only events of matching elements are reported.
+        """
+        parser = ET.XMLPullParser(events=events, tag=tag, remove_comments=True)
+
+        file_obj = xml_file
+        if isinstance(xml_file, str):
+            file_obj = open_file(xml_file, "rb")
+
+        try:
+            data = file_obj.read(chunk_size)
+            while data:
+                parser.feed(data)
+                for event in parser.read_events():
+                    yield event
+                data = file_obj.read(chunk_size)
+
+            root = parser.close()
+            for event in parser.read_events():
+                yield event
+            yield "close", root
+        finally:
+            if hasattr(file_obj, "close"):
+                file_obj.close()
+
     def from_string(self, string):
         """
         Parses an XML string and return an odML data structure.
@@ -380,6 +762,24 @@ class XMLReader(object):
         if self.show_warnings:
             sys.stderr.write(msg)
 
+    def check_validation_errors(self, errors, elem):
+        """
+        Raises a ParserException on the first validation error, if the
+        readers validation is set to fail fast.
+
+        :param errors: list of ValidationErrors.
+        :param elem: XML node corresponding to the validated odML object.
+        """
+        if not self.validation.fail_fast:
+            return
+
+        for err in errors:
+            if err.is_error:
+                msg = "Validation failed: %s" % err
+                if elem is not None:
+                    msg += " (line %d)" % elem.sourceline
+                raise ParserException(msg)
+
     def parse_element(self, node):
         """
         Identifies the odML object corresponding to the current XML node e.g.
@@ -394,6 +794,50 @@ class XMLReader(object):
             return None  # won't be able to parse this one
         return getattr(self, "parse_" + node.tag)(node, self.tags[node.tag])
 
+    def check_attributes(self, root):
+        """
+        Calls the parsers error method for every unsupported XML attribute of a node.
+
+        :param root: XML node.
+        """
+        for k, val in root.attrib.iteritems():
+            k = k.lower()
+            # 'version' is currently the only supported XML attribute.
+            if k == 'version' and root.tag == 'odML':
+                continue
+
+            # We currently do not support XML attributes.
+            self.error("Attribute not supported, ignoring '%s=%s' " % (k, val), root)
+
+    def parse_argument(self, node, fmt, root, arguments):
+        """
+        Parses the text content of an XML node containing a single odML attribute
+        and adds it to the arguments dictionary using the odML class attribute name.
+
+        :param node: XML node containing an odML attribute.
+        :param fmt: odML class corresponding to the content of the parent node.
+        :param root: parent XML node.
+        :param arguments: dictionary of already parsed attributes.
+        """
+        tag = fmt.map(node.tag)
+        if tag in arguments:
+            self.warn("Element <%s> is given multiple times in "
+                      "<%s> tag" % (node.tag, root.tag), node)
+
+        # Special handling of values;
+        curr_text = node.text.strip() if node.text else None
+        if tag == "values" and curr_text:
+            if self.lazy_values:
+                # Values are decoded on first access, see parse_tag.
+                arguments[tag] = node.text
+            else:
+                arguments[tag] = from_csv(node.text)
+        # Special handling of cardinality
+        elif tag.endswith("_cardinality") and curr_text:
+            arguments[tag] = parse_cardinality(node.text)
+        else:
+            arguments[tag] = curr_text
+
     def parse_tag(self, root, fmt, insert_children=True):
         """
         Parse an odml node based on the format description *fmt*
@@ -409,14 +853,7 @@ class XMLReader(object):
         extra_args = {}
         children = []
 
-        for k, val in root.attrib.iteritems():
-            k = k.lower()
-            # 'version' is currently the only supported XML attribute.
-            if k == 'version' and root.tag == 'odML':
-                continue
-
-            # We currently do not support XML attributes.
-            self.error("Attribute not supported, ignoring '%s=%s' " % (k, val), root)
+        self.check_attributes(root)
 
         for node in root:
             node.tag = node.tag.lower()
@@ -424,26 +861,15 @@ class XMLReader(object):
             if node.tag in fmt.arguments_keys:
                 # this is a heuristic, but works for now
                 if node.tag in self.tags and node.tag in fmt.map_keys:
-                    sub_obj = self.parse_element(node)
+                    if node in self._built:
+                        sub_obj = self._built.pop(node)
+                    else:
+                        sub_obj = self.parse_element(node)
                     if sub_obj is not None:
                         extra_args[fmt.map(node.tag)] = sub_obj
                         children.append(sub_obj)
                 else:
-                    tag = fmt.map(node.tag)
-                    if tag in arguments:
-                        self.warn("Element <%s> is given multiple times in "
-                                  "<%s> tag" % (node.tag, root.tag), node)
-
-                    # Special handling of values;
-                    curr_text = node.text.strip() if node.text else None
-                    if tag == "values" and curr_text:
-                        content = from_csv(node.text)
-                        arguments[tag] = content
-                    # Special handling of cardinality
-                    elif tag.endswith("_cardinality") and curr_text:
-                        arguments[tag] = parse_cardinality(node.text)
-                    else:
-                        arguments[tag] = curr_text
+                    self.parse_argument(node, fmt, root, arguments)
             else:
                 self.error("Invalid element <%s> in odML document section <%s> "
                            % (node.tag, root.tag), node)
@@ -451,10 +877,19 @@ class XMLReader(object):
         check_args = dict(list(arguments.items()) + list(extra_args.items()))
         self.check_mandatory_arguments(check_args, fmt, root.tag, root)
 
+        raw_values = None
+        if self.lazy_values and arguments.get("values") and fmt.name == "property":
+            raw_values = arguments.pop("values")
+            val_cardinality = arguments.pop("val_cardinality", None)
+
         # Instantiate the current odML object with the parsed attributes.
         obj = fmt.create()
         try:
             obj = fmt.create(**arguments)
+            if raw_values is not None:
+                report = partial(report_value_error, self.warnings, self.ignore_errors,
+                                 self.show_warnings, " (line %d)" % root.sourceline)
+                obj._set_raw_values(raw_values, from_csv, val_cardinality, report)
         except Exception as exc:
             self.error(str(exc), root)
 
@@ -462,6 +897,11 @@ class XMLReader(object):
             for child in children:
                 obj.append(child)
 
+            # Children are complete and attached to their parent at this point.
+            if self.validation is not None:
+                for child in children:
+                    self.check_validation_errors(self.validation.add(child), root)
+
         return obj
 
     # function 'parse_element' requires the captialisation of 'parse_odML'
@@ -476,6 +916,9 @@ class XMLReader(object):
         :return: parsed odml.Document
         """
         doc = self.parse_tag(root, fmt)
+        if self.validation is not None:
+            self.check_validation_errors(self.validation.finalize(doc), root)
+
         return doc
 
     def parse_section(self, root, fmt):
@@ -485,9 +928,36 @@ class XMLReader(object):
 
         :param root: XML node
         :param fmt: odML class corresponding to the content of the XML node.
-        :return: parsed odml.Section
+        :return: parsed odml.Section or None if the Section is not selected.
+        """
+        if self.selection is None:
+            return self.parse_tag(root, fmt)
+
+        name, sec_type = self._section_identity(root)
+        self._section_path.append(name)
+        try:
+            if not self.selection.includes(self._section_path, sec_type):
+                return None
+            return self.parse_tag(root, fmt)
+        finally:
+            self._section_path.pop()
+
+    @staticmethod
+    def _section_identity(root):
         """
-        return self.parse_tag(root, fmt)
+        Returns the name and type of a Section XML node without parsing its content.
+
+        :param root: XML node of an odML Section.
+        :return: tuple of the Section name and type.
+        """
+        name, sec_type = None, None
+        for node in root:
+            tag = node.tag.lower()
+            if tag == "name":
+                name = node.text.strip() if node.text else None
+            elif tag == "type":
+                sec_type = node.text.strip() if node.text else None
+        return name, sec_type
 
     def parse_property(self, root, fmt):
         """
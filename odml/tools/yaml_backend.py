@@ -0,0 +1,136 @@
+"""
+The yaml_backend module provides the YAML loader and dumper used by the odML parsers.
+
+By default the libyaml based C implementation of PyYAML is used if it is available,
+the pure Python implementation otherwise. Custom odML constructors and representers
+are registered once on private loader and dumper classes and do not modify the
+global PyYAML loaders and dumpers.
+
+Available backends are listed in YAML_BACKENDS:
+    'c':      libyaml based CSafeLoader and CSafeDumper.
+    'python': pure Python SafeLoader and SafeDumper.
+
+The backend used when none is specified can be changed via DEFAULT_BACKEND.
+"""
+
+import datetime
+
+import yaml
+
+LIBYAML = hasattr(yaml, "CSafeLoader") and hasattr(yaml, "CSafeDumper")
+
+YAML_BACKENDS = ["c", "python"] if LIBYAML else ["python"]
+
+DEFAULT_BACKEND = YAML_BACKENDS[0]
+
+
+def unicode_loader_constructor(_, node):
+    """
+    Constructor for PyYAML to load unicode characters
+    """
+    return node.value
+
+
+def yaml_time_serializer(dumper, data):
+    """
+    This function is required to serialize datetime.time as string objects
+    when working with YAML as output format.
+    """
+    return dumper.represent_scalar('tag:yaml.org,2002:str', str(data))
+
+
+class _SafeLoader(yaml.SafeLoader):
+    """
+    Pure Python YAML loader supporting odML specific tags.
+    """
+
+
+class _SafeDumper(yaml.SafeDumper):
+    """
+    Pure Python YAML dumper supporting odML specific types.
+    """
+
+
+_LOADERS = {"python": _SafeLoader}
+_DUMPERS = {"python": _SafeDumper}
+
+if LIBYAML:
+    class _CSafeLoader(yaml.CSafeLoader):
+        """
+        libyaml based YAML loader supporting odML specific tags.
+        """
+
+    class _CSafeDumper(yaml.CSafeDumper):
+        """
+        libyaml based YAML dumper supporting odML specific types.
+        """
+
+    _LOADERS["c"] = _CSafeLoader
+    _DUMPERS["c"] = _CSafeDumper
+
+for _loader in _LOADERS.values():
+    _loader.add_constructor("tag:yaml.org,2002:python/unicode", unicode_loader_constructor)
+
+for _dumper in _DUMPERS.values():
+    _dumper.add_representer(datetime.time, yaml_time_serializer)
+
+
+def _backend(backend):
+    """
+    Returns the name of a supported YAML backend.
+
+    :param backend: name of a YAML backend or None for the default backend.
+    :return: name of the YAML backend.
+    """
+    if backend is None:
+        return DEFAULT_BACKEND
+
+    if backend not in YAML_BACKENDS:
+        raise ValueError("YAML backend '%s' is not available; available backends: %s"
+                         % (backend, ", ".join(YAML_BACKENDS)))
+    return backend
+
+
+def get_loader(backend=None):
+    """
+    Returns the YAML loader class of a YAML backend.
+
+    :param backend: 'c', 'python' or None for the default backend.
+    :return: YAML loader class.
+    """
+    return _LOADERS[_backend(backend)]
+
+
+def get_dumper(backend=None):
+    """
+    Returns the YAML dumper class of a YAML backend.
+
+    :param backend: 'c', 'python' or None for the default backend.
+    :return: YAML dumper class.
+    """
+    return _DUMPERS[_backend(backend)]
+
+
+def load(stream, backend=None):
+    """
+    Loads a YAML document from a string or file like object.
+
+    :param stream: YAML string or file like object.
+    :param backend: 'c', 'python' or None for the default backend.
+    :return: Python object of the YAML content.
+    """
+    return yaml.load(stream, Loader=get_loader(backend))
+
+
+def dump(data, stream=None, backend=None):
+    """
+    Serializes a Python object to YAML. If a stream is provided, the output
+    is written directly to the stream, otherwise it is returned as a string.
+
+    :param data: Python object.
+    :param stream: Optional file like object the output is written to.
+    :param backend: 'c', 'python' or None for the default backend.
+    :return: YAML string if no stream was provided, None otherwise.
+    """
+    return yaml.dump(data, stream, Dumper=get_dumper(backend),
+                     default_flow_style=False)
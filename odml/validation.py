@@ -4,7 +4,10 @@ Generic odML validation framework.
 """
 
 import re
+import threading
+import time
 
+from contextlib import contextmanager
 from enum import Enum
 
 from . import dtypes
@@ -12,6 +15,9 @@ from . import dtypes
 LABEL_ERROR = 'error'
 LABEL_WARNING = 'warning'
 
+# Holds the stack of TerminologyCaches of the currently active validation runs.
+_ACTIVE = threading.local()
+
 
 class IssueID(Enum):
     """
@@ -97,15 +103,200 @@ class ValidationError(object):
         return "Validation%s: %s '%s'" % (self.rank.capitalize(), print_str, self.msg)
 
 
+class TerminologyCache(object):
+    """
+    Memoizes the terminology equivalents of Sections and the Property names
+    of terminology Sections for the duration of a single validation run.
+    Resolving a terminology equivalent loads the terminology and searches
+    its section tree; with the cache this is done once per Section instead
+    of once per validated Property.
+    """
+
+    def __init__(self):
+        self._equivalents = {}
+        self._property_names = {}
+
+    def equivalent(self, sec):
+        """
+        :param sec: odml.Section or odml.Document.
+        :returns: the terminology equivalent of the Section or None.
+        """
+        if sec not in self._equivalents:
+            self._equivalents[sec] = sec.get_terminology_equivalent()
+        return self._equivalents[sec]
+
+    def property_names(self, tsec):
+        """
+        :param tsec: terminology odml.Section.
+        :returns: frozenset of the names of all Properties of the terminology Section.
+        """
+        if tsec not in self._property_names:
+            self._property_names[tsec] = frozenset(prop.name for prop in tsec.properties)
+        return self._property_names[tsec]
+
+
+def _active_terminology_cache():
+    """
+    :returns: the TerminologyCache of the innermost active validation run or None.
+    """
+    stack = getattr(_ACTIVE, "caches", None)
+    if stack:
+        return stack[-1]
+    return None
+
+
+def terminology_equivalent(sec):
+    """
+    Returns the terminology equivalent of a Section. Within a validation run
+    the result is memoized; outside of a validation run it is resolved directly.
+    Validation handlers should use this function instead of calling
+    'get_terminology_equivalent' on the Section itself.
+
+    :param sec: odml.Section or odml.Document.
+    :returns: the terminology equivalent of the Section or None.
+    """
+    cache = _active_terminology_cache()
+    if cache is None:
+        return sec.get_terminology_equivalent()
+    return cache.equivalent(sec)
+
+
+def terminology_property_names(tsec):
+    """
+    Returns the names of all Properties of a terminology Section.
+    Within a validation run the result is memoized.
+
+    :param tsec: terminology odml.Section.
+    :returns: frozenset of Property names.
+    """
+    cache = _active_terminology_cache()
+    if cache is None:
+        return frozenset(prop.name for prop in tsec.properties)
+    return cache.property_names(tsec)
+
+
+class HandlerTiming(object):
+    """
+    Collects the number of calls, the total and the maximal wall time and the
+    number of yielded ValidationErrors of a single validation handler
+    applied to a single odml class.
+
+    :param klass: string of the odml class the handler is registered for.
+    :param handler: name of the validation handler.
+    """
+
+    def __init__(self, klass, handler):
+        self.klass = klass
+        self.handler = handler
+        self.calls = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.errors = 0
+
+    def add(self, duration, errors=0):
+        """
+        Records a single handler call.
+
+        :param duration: wall time of the call in seconds.
+        :param errors: number of ValidationErrors yielded by the call.
+        """
+        self.calls += 1
+        self.total_time += duration
+        self.max_time = max(self.max_time, duration)
+        self.errors += errors
+
+    def merge(self, other):
+        """
+        Adds the recorded timings of another HandlerTiming to the current one.
+
+        :param other: HandlerTiming.
+        """
+        self.calls += other.calls
+        self.total_time += other.total_time
+        self.max_time = max(self.max_time, other.max_time)
+        self.errors += other.errors
+
+    def as_dict(self):
+        """
+        :returns: dictionary containing the recorded timings.
+        """
+        return {"class": self.klass, "handler": self.handler, "calls": self.calls,
+                "total_time": self.total_time, "max_time": self.max_time,
+                "errors": self.errors}
+
+    def __repr__(self):
+        return "HandlerTiming[%s|%s] {calls = %d, total = %.6fs, max = %.6fs, errors = %d}" % \
+               (self.klass, self.handler, self.calls, self.total_time,
+                self.max_time, self.errors)
+
+
+def merge_timings(target, timings):
+    """
+    Merges handler timings into a target dictionary. Useful to aggregate
+    the timings of multiple validation runs e.g. over many documents.
+
+    :param target: dictionary of "(class, handler)":HandlerTiming entries.
+    :param timings: dictionary of "(class, handler)":HandlerTiming entries
+                    that will be added to the target dictionary.
+    :returns: the updated target dictionary.
+    """
+    for key, timing in timings.items():
+        if key not in target:
+            target[key] = HandlerTiming(*key)
+        target[key].merge(timing)
+
+    return target
+
+
+def timing_summary(timings):
+    """
+    Formats handler timings as a human readable table sorted by total
+    wall time. The table is followed by the accumulated timings per odml class.
+
+    :param timings: dictionary of "(class, handler)":HandlerTiming entries.
+    :returns: string containing the formatted table.
+    """
+    entries = sorted(timings.values(), key=lambda x: x.total_time, reverse=True)
+
+    row = "%-10s %-32s %8s %12s %12s %8s"
+    lines = [row % ("class", "handler", "calls", "total [s]", "max [s]", "errors")]
+    class_totals = {}
+    for curr in entries:
+        lines.append(row % (curr.klass, curr.handler, curr.calls, "%.6f" % curr.total_time,
+                            "%.6f" % curr.max_time, curr.errors))
+        if curr.klass not in class_totals:
+            class_totals[curr.klass] = HandlerTiming(curr.klass, "total")
+        class_totals[curr.klass].merge(curr)
+
+    lines.append("")
+    for curr in sorted(class_totals.values(), key=lambda x: x.total_time, reverse=True):
+        lines.append(row % (curr.klass, curr.handler, curr.calls, "%.6f" % curr.total_time,
+                            "%.6f" % curr.max_time, curr.errors))
+
+    return "\n".join(lines)
+
+
 class Validation(object):
     """
     Validation provides a set of default validations that can used to validate
     odml objects. Custom validations can be added via the 'register_handler' method.
 
     :param obj: odml object the validation will be applied to.
+    :param validate: if True, the validation is run on init.
+    :param reset: if True, all registered handlers are removed and no validation is run
+                  to allow custom Validation objects.
+    :param timing: if True, the number of calls, the wall time and the number of
+                   yielded errors are recorded for every handler and odml class.
+                   The results can be accessed via the 'timings' attribute and the
+                   'timing_report' and 'timing_summary' methods.
+    :param profile: name of a registered validation profile or an iterable of
+                    handler functions. Only registered handlers contained in the
+                    profile are run. Default profiles are 'errors-only', 'structural'
+                    and 'full'. If None, all registered handlers are run.
     """
 
     _handlers = {}
+    _profiles = {"full": None}
 
     @staticmethod
     def register_handler(klass, handler):
@@ -124,10 +315,56 @@ class Validation(object):
         """
         Validation._handlers.setdefault(klass, set()).add(handler)
 
-    def __init__(self, obj, validate=True, reset=False):
+    @staticmethod
+    def register_profile(name, handlers):
+        """
+        Adds a named validation profile. A profile restricts a validation run
+        to the registered handlers it contains, e.g. to skip expensive
+        warning level handlers when saving large documents.
+
+        :param name: name of the validation profile.
+        :param handlers: iterable of validation handler functions.
+                         If None, all registered handlers are run.
+        """
+        Validation._profiles[name] = None if handlers is None else frozenset(handlers)
+
+    @staticmethod
+    def get_profile(profile):
+        """
+        Returns the handlers of a validation profile.
+        Raises a ValueError if a profile name has not been registered.
+
+        :param profile: name of a registered validation profile, an iterable of
+                        validation handler functions or None.
+        :returns: frozenset of handler functions or None if all handlers are to be run.
+        """
+        if profile is None:
+            return None
+
+        if isinstance(profile, str):
+            if profile not in Validation._profiles:
+                msg = "Unknown validation profile '%s'. " % profile
+                msg += "Available profiles: %s" % ", ".join(sorted(Validation._profiles))
+                raise ValueError(msg)
+            return Validation._profiles[profile]
+
+        return frozenset(profile)
+
+    def __init__(self, obj, validate=True, reset=False, timing=False, profile=None):
         self.obj = obj  # may also be a section
         self.errors = []
 
+        # "(class, handler)":HandlerTiming dictionary; only used in timing mode.
+        self.timings = {} if timing else None
+
+        self._terminology_cache = TerminologyCache()
+
+        # Restrict the instance to the handlers of the requested profile.
+        allowed = self.get_profile(profile)
+        if allowed is not None:
+            self._handlers = dict((klass, set(handlers & allowed))
+                                  for klass, handlers in self._handlers.items())
+
         # If initialized with reset=True, reset all handlers and
         # do not run any validation yet to allow custom Validation objects.
         if reset:
@@ -137,6 +374,21 @@ class Validation(object):
         if validate:
             self.run_validation()
 
+    @contextmanager
+    def _caching(self):
+        """
+        Activates the TerminologyCache of this Validation for the
+        handlers run within the context.
+        """
+        if not hasattr(_ACTIVE, "caches"):
+            _ACTIVE.caches = []
+
+        _ACTIVE.caches.append(self._terminology_cache)
+        try:
+            yield
+        finally:
+            _ACTIVE.caches.pop()
+
     def validate(self, obj):
         """
         Runs all registered handlers that are applicable to a provided odml class instance.
@@ -144,11 +396,48 @@ class Validation(object):
 
         :param obj: odml class instance.
         """
-        handlers = self._handlers.get(obj.format().name, [])
+        klass = obj.format().name
+        self._run_handlers(klass, self._handlers.get(klass, []), obj)
+
+    def _run_handlers(self, klass, handlers, obj):
+        """
+        Runs the provided handlers on an odml class instance and collects
+        all occurring validation errors.
+
+        :param klass: string of the odml class the handlers are registered for.
+        :param handlers: iterable of validation handlers.
+        :param obj: odml class instance.
+        """
+        if self.timings is not None:
+            for handler in handlers:
+                self._timed_validate(klass, handler, obj)
+            return
+
         for handler in handlers:
             for err in handler(obj):
                 self.error(err)
 
+    def _timed_validate(self, klass, handler, obj):
+        """
+        Runs a single handler on an odml class instance and records the
+        number of calls, the wall time and the number of yielded errors.
+
+        :param klass: string of the odml class the handler is registered for.
+        :param handler: validation handler.
+        :param obj: odml class instance.
+        """
+        key = (klass, handler.__name__)
+        if key not in self.timings:
+            self.timings[key] = HandlerTiming(*key)
+
+        num_errors = len(self.errors)
+        start = time.perf_counter()
+        for err in handler(obj):
+            self.error(err)
+        duration = time.perf_counter() - start
+
+        self.timings[key].add(duration, len(self.errors) - num_errors)
+
     def error(self, validation_error):
         """
         Registers an error found during the validation process.
@@ -160,16 +449,20 @@ class Validation(object):
         Runs a clean new validation on the registered Validation object.
         """
         self.errors = []
+        if self.timings is not None:
+            self.timings = {}
+        self._terminology_cache = TerminologyCache()
 
-        self.validate(self.obj)
+        with self._caching():
+            self.validate(self.obj)
 
-        if self.obj.format().name == "property":
-            return
+            if self.obj.format().name == "property":
+                return
 
-        for sec in self.obj.itersections(recursive=True):
-            self.validate(sec)
-            for prop in sec.properties:
-                self.validate(prop)
+            for sec in self.obj.itersections(recursive=True):
+                self.validate(sec)
+                for prop in sec.properties:
+                    self.validate(prop)
 
     def report(self):
         """
@@ -177,6 +470,13 @@ class Validation(object):
         """
         self.run_validation()
 
+        return self.summary()
+
+    def summary(self):
+        """
+        Returns a results report of the errors found in the last
+        validation run without running the validation again.
+        """
         err_count = 0
         reduce = set()
         sec_count = 0
@@ -201,6 +501,33 @@ class Validation(object):
 
         return msg
 
+    def timing_report(self):
+        """
+        Returns the timings recorded during the last validation run
+        sorted by the total wall time of the individual handlers.
+        Requires the Validation to be initialized with 'timing=True'.
+
+        :returns: list of dictionaries containing the 'class', 'handler', 'calls',
+                  'total_time', 'max_time' and 'errors' of every handler.
+        """
+        if self.timings is None:
+            raise ValueError("Timing was not enabled on this Validation.")
+
+        entries = sorted(self.timings.values(), key=lambda x: x.total_time, reverse=True)
+        return [curr.as_dict() for curr in entries]
+
+    def timing_summary(self):
+        """
+        Returns the timings recorded during the last validation run as a
+        human readable table. Requires the Validation to be initialized with 'timing=True'.
+
+        :returns: string
+        """
+        if self.timings is None:
+            raise ValueError("Timing was not enabled on this Validation.")
+
+        return timing_summary(self.timings)
+
     def register_custom_handler(self, klass, handler):
         """
         Adds a validation handler for an odml class. The handler is called in the
@@ -228,6 +555,137 @@ class Validation(object):
         return errors
 
 
+class StreamingValidation(Validation):
+    """
+    StreamingValidation validates a document while it is being parsed. The parser
+    hands in every Section and Property once it has been attached to its parent
+    and the Document once parsing is done. This avoids a second traversal of the
+    full document tree after loading.
+
+    The uniqueness of ids is checked incrementally with a running id map
+    instead of running the 'document_unique_ids' handler on the full tree.
+
+    :param profile: name of a registered validation profile or an iterable of
+                    handler functions. If None, all registered handlers are run.
+    :param fail_fast: if True, parsers using this validation will raise a
+                      ParserException on the first encountered validation error.
+                      Duplicate ids are then reported as soon as they are found.
+    :param timing: if True, handler timings are recorded. See Validation for details.
+    """
+
+    def __init__(self, profile=None, fail_fast=False, timing=False):
+        super(StreamingValidation, self).__init__(None, validate=False,
+                                                  timing=timing, profile=profile)
+        self.fail_fast = fail_fast
+
+        self._check_ids = document_unique_ids in self._handlers.get("odML", set())
+        self._id_map = {}
+        self._duplicates = {}
+
+    def add(self, obj):
+        """
+        Validates a single Section or Property. Sections have to be handed in
+        once all their children have been attached.
+
+        :param obj: odml.Section or odml.Property.
+        :returns: list of the ValidationErrors found for the object. Duplicate
+                  id errors are only reported when the document is finalized,
+                  unless the validation fails fast.
+        """
+        num_errors = len(self.errors)
+        with self._caching():
+            self.validate(obj)
+
+        if self._check_ids:
+            if obj.id not in self._id_map:
+                self._id_map[obj.id] = obj
+            elif self.fail_fast:
+                first = self._id_map[obj.id]
+                first_str = "%s '%s'" % (first.format().name.capitalize(), first.get_path())
+                self.error(self._duplicate_error(obj, first_str))
+            else:
+                self._duplicates.setdefault(obj.id, [self._id_map[obj.id]]).append(obj)
+
+        return self.errors[num_errors:]
+
+    @staticmethod
+    def _document_order(obj):
+        """
+        Returns a sort key reflecting the order in which 'document_unique_ids'
+        visits an object: the Properties of a Section come before the Section
+        itself, which comes before its sub-sections.
+
+        :param obj: odml.Section or odml.Property attached to a document.
+        :returns: list of tuples.
+        """
+        key = []
+        if obj.format().name == "property":
+            key.append((0, obj.parent.properties.index(obj)))
+            obj = obj.parent
+        else:
+            key.append((1,))
+
+        while obj.parent is not None:
+            key.insert(0, (2, obj.parent.sections.index(obj)))
+            obj = obj.parent
+
+        return key
+
+    def finalize(self, doc):
+        """
+        Runs the Document validations and reports any encountered duplicate ids.
+        All Sections and Properties of the document have to be added beforehand.
+
+        :param doc: the parsed odml.Document.
+        :returns: list of the ValidationErrors found for the Document and duplicate ids.
+        """
+        self.obj = doc
+        num_errors = len(self.errors)
+
+        handlers = [handler for handler in self._handlers.get("odML", [])
+                    if handler is not document_unique_ids]
+        with self._caching():
+            self._run_handlers("odML", handlers, doc)
+
+        if not self._check_ids:
+            return self.errors[num_errors:]
+
+        if doc.id in self._id_map:
+            self._duplicates.setdefault(doc.id, [self._id_map[doc.id]])
+
+        for oid, objs in self._duplicates.items():
+            # Report duplicates in the same way a full validation run would.
+            objs = sorted(objs, key=self._document_order)
+            if oid == doc.id:
+                first_str = "Document '%s'" % doc.get_path()
+            else:
+                first = objs.pop(0)
+                first_str = "%s '%s'" % (first.format().name.capitalize(), first.get_path())
+
+            for obj in objs:
+                self.error(self._duplicate_error(obj, first_str))
+
+        return self.errors[num_errors:]
+
+    @staticmethod
+    def _duplicate_error(obj, first_str):
+        """
+        Returns the ValidationError of an object sharing its id with another object.
+
+        :param obj: odml.Section or odml.Property with a duplicate id.
+        :param first_str: description of the first object with the same id.
+        :returns: ValidationError.
+        """
+        if obj.format().name == "property":
+            validation_id = IssueID.property_unique_ids
+        else:
+            validation_id = IssueID.section_unique_ids
+
+        msg = "Duplicate id in %s '%s' and %s" % (obj.format().name.capitalize(),
+                                                   obj.get_path(), first_str)
+        return ValidationError(obj, msg, validation_id=validation_id)
+
+
 # ------------------------------------------------
 # validation rules
 
@@ -287,7 +745,7 @@ def section_repository_present(sec):
         return
 
     try:
-        tsec = sec.get_terminology_equivalent()
+        tsec = terminology_equivalent(sec)
     except Exception as exc:
         msg = "Could not load terminology: %s" % exc
         yield ValidationError(sec, msg, LABEL_WARNING, validation_id)
@@ -453,12 +911,11 @@ def property_terminology_check(prop):
     if not prop.parent:
         return
 
-    tsec = prop.parent.get_terminology_equivalent()
+    tsec = terminology_equivalent(prop.parent)
     if tsec is None:
         return
-    try:
-        tsec.properties[prop.name]
-    except KeyError:
+
+    if prop.name not in terminology_property_names(tsec):
         msg = "Property '%s' not found in terminology" % prop.name
         yield ValidationError(prop, msg, LABEL_WARNING, validation_id)
 
@@ -684,3 +1141,21 @@ def property_values_cardinality(obj):
 
 
 Validation.register_handler("property", property_values_cardinality)
+
+
+# Validation profiles have to be registered after the default handlers.
+Validation.register_profile("errors-only", [object_required_attributes,
+                                            document_unique_ids,
+                                            section_unique_name_type,
+                                            property_unique_names])
+
+Validation.register_profile("structural", [object_required_attributes,
+                                           document_unique_ids,
+                                           section_unique_name_type,
+                                           property_unique_names,
+                                           section_type_must_be_defined,
+                                           object_name_readable,
+                                           property_dependency_check,
+                                           section_properties_cardinality,
+                                           section_sections_cardinality,
+                                           property_values_cardinality])
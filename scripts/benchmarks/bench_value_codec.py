@@ -0,0 +1,71 @@
+"""
+Benchmarks the odML value list codec used by the XML parser against
+a reference implementation using the csv module for every value list.
+
+    python scripts/benchmarks/bench_value_codec.py [number of properties]
+"""
+import csv
+import sys
+import timeit
+
+from io import StringIO
+
+from odml.tools.xmlparser import from_csv, to_csv
+
+
+def csv_to_csv(val):
+    """
+    Reference encoder writing every value list with a new csv.writer.
+    """
+    unicode_values = list(map(str.strip, map(str, val)))
+    stream = StringIO()
+    writer = csv.writer(stream, dialect="excel")
+    writer.writerow(unicode_values)
+    csv_string = stream.getvalue().strip().strip('"')
+    if len(unicode_values) > 1:
+        csv_string = "[" + csv_string + "]"
+    return csv_string
+
+
+def csv_from_csv(value_string):
+    """
+    Reference decoder reading every value string with a new csv.reader.
+    """
+    if not value_string:
+        return []
+    if value_string[0] == "[" and value_string[-1] == "]":
+        value_string = value_string[1:-1]
+    else:
+        return [value_string]
+
+    if not value_string:
+        return []
+    stream = StringIO(value_string)
+    reader = csv.reader(stream, dialect="excel")
+    return list(reader)[0]
+
+
+def run(num_props):
+    """
+    Prints encoding and decoding times for plain and quoted value lists.
+
+    :param num_props: number of value lists encoded and decoded per run.
+    """
+    samples = {
+        "plain": [[str(i), str(i + 1), "value %d" % i] for i in range(num_props)],
+        "quoted": [[str(i), "a,b", 'say "%d"' % i] for i in range(num_props)],
+    }
+
+    for name, values in samples.items():
+        encoded = [to_csv(val) for val in values]
+        for label, func, data in (("to_csv", to_csv, values),
+                                  ("reference to_csv", csv_to_csv, values),
+                                  ("from_csv", from_csv, encoded),
+                                  ("reference from_csv", csv_from_csv, encoded)):
+            duration = min(timeit.repeat(lambda: [func(val) for val in data],
+                                         number=1, repeat=5))
+            print("%-7s %-20s %8.4fs" % (name, label, duration))
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
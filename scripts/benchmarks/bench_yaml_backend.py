@@ -0,0 +1,59 @@
+"""
+Benchmarks loading and saving a large odML document with the available
+YAML backends of odml.tools.yaml_backend.
+
+    python scripts/benchmarks/bench_yaml_backend.py [number of sections]
+"""
+import os
+import sys
+import tempfile
+import timeit
+
+import odml
+
+from odml.tools import yaml_backend
+from odml.tools.odmlparser import ODMLWriter
+
+
+def create_document(num_secs, num_props=20):
+    """
+    Creates an odML document with num_secs Sections with num_props Properties each.
+    """
+    doc = odml.Document(author="benchmark")
+    for i in range(num_secs):
+        sec = doc.create_section(name="sec_%d" % i, type="benchmark")
+        for j in range(num_props):
+            _ = sec.create_property(name="prop_%d" % j, values=[i, j, i * j])
+    return doc
+
+
+def run(num_secs):
+    """
+    Prints save and load times of a document for every YAML backend.
+
+    :param num_secs: number of Sections of the benchmark document.
+    """
+    doc = create_document(num_secs)
+    tmp_dir = tempfile.mkdtemp()
+
+    for backend in yaml_backend.YAML_BACKENDS:
+        path = os.path.join(tmp_dir, "%s.yaml" % backend)
+        writer = ODMLWriter("YAML")
+
+        save = min(timeit.repeat(lambda: writer.write_file(doc, path, yaml_backend=backend),
+                                 number=1, repeat=3))
+
+        def load():
+            with open(path) as yaml_file:
+                yaml_backend.load(yaml_file, backend=backend)
+
+        read = min(timeit.repeat(load, number=1, repeat=3))
+        print("%-7s save %8.4fs  load %8.4fs  (%d bytes)"
+              % (backend, save, read, os.path.getsize(path)))
+        os.remove(path)
+
+    os.rmdir(tmp_dir)
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
@@ -0,0 +1,124 @@
+"""
+This module supplies tests for the odml.tools.archive ArchiveWriter
+and ArchiveDocument classes.
+"""
+
+import os
+import shutil
+import unittest
+
+import odml
+
+from odml.tools.archive import ArchiveDocument, ArchiveWriter, load
+from odml.tools.binary_parser import BinaryReader, BinaryWriter
+from odml.tools.parser_utils import ParserException
+from .util import create_test_dir
+
+
+class TestArchive(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = create_test_dir(__file__)
+
+        doc = odml.Document(author="author", version="v1")
+        for i in range(3):
+            sec = odml.Section(name="exp_%d" % i, type="experiment/ephys", parent=doc)
+            _ = odml.Property(name="prop", values=[i, i + 1], parent=sec)
+            sub = odml.Section(name="subject", type="subject", parent=sec)
+            _ = odml.Property(name="species", values=["mouse"], parent=sub)
+            _ = odml.Section(name="cell", type="cell", parent=sub)
+        _ = odml.Section(name="setup", type="hardware", parent=doc)
+
+        self.doc = doc
+        self.file = os.path.join(self.tmp_dir, "archive.odmla")
+        ArchiveWriter(doc).write_file(self.file)
+
+    def tearDown(self):
+        if self.tmp_dir and os.path.exists(self.tmp_dir):
+            shutil.rmtree(self.tmp_dir)
+
+    def test_attributes(self):
+        with ArchiveDocument(self.file) as arc:
+            self.assertEqual(arc.id, self.doc.id)
+            self.assertEqual(arc.author, "author")
+            self.assertEqual(arc.version, "v1")
+            self.assertIsNone(arc.date)
+            self.assertEqual(arc.section_paths(),
+                             ["/exp_0", "/exp_0/subject", "/exp_0/subject/cell",
+                              "/exp_1", "/exp_1/subject", "/exp_1/subject/cell",
+                              "/exp_2", "/exp_2/subject", "/exp_2/subject/cell",
+                              "/setup"])
+            self.assertEqual(arc.sections, self.doc.sections)
+
+    def test_lazy_access(self):
+        with ArchiveDocument(self.file) as arc:
+            sec = arc.get_section_by_path("/exp_1/subject")
+            self.assertEqual(sec, self.doc["exp_1"]["subject"])
+            self.assertEqual(list(arc._cache), [4])
+
+            self.assertIs(arc.get_section_by_path("exp_1/subject"), sec)
+            self.assertEqual(arc.get_property_by_path("/exp_1/subject:species").values,
+                             ["mouse"])
+
+            oid = self.doc["exp_2"]["subject"]["cell"].id
+            self.assertEqual(arc.get_section_by_id(oid).id, oid)
+            self.assertIsNone(arc.get_section_by_id("unknown"))
+
+            # Subsections of read Sections are not read again.
+            exp = arc.get_section_by_path("/exp_0")
+            self.assertIs(arc.get_section_by_path("/exp_0/subject/cell"),
+                          exp["subject"]["cell"])
+
+            with self.assertRaises(ValueError):
+                arc.get_section_by_path("/exp_0/unknown")
+            with self.assertRaises(ValueError):
+                arc.get_section_by_path("/")
+
+    def test_find(self):
+        with ArchiveDocument(self.file) as arc:
+            self.assertEqual(arc.find("setup"), self.doc["setup"])
+            self.assertEqual(list(arc._cache), [9])
+
+            self.assertEqual(len(arc.find(type="experiment/ephys", findAll=True)), 3)
+            self.assertIsNone(arc.find(type="experiment"))
+            self.assertEqual(len(arc.find(type="experiment", findAll=True,
+                                          include_subtype=True)), 3)
+            self.assertIsNone(arc.find("subject"))
+
+    def test_itersections(self):
+        with ArchiveDocument(self.file) as arc:
+            self.assertEqual([sec.get_path() for sec in arc.itersections()],
+                             [sec.get_path() for sec in self.doc.itersections()])
+            self.assertEqual(len(list(arc.itersections(max_depth=1))), 4)
+
+            filter_func = lambda x: x.type == "cell"
+            self.assertEqual(len(list(arc.itersections(filter_func=filter_func))), 3)
+            self.assertEqual(len(list(arc.iterproperties())), 6)
+
+        with ArchiveDocument(self.file) as arc:
+            sec = next(arc.itersections())
+            self.assertEqual(sec.name, "exp_0")
+            self.assertEqual(list(arc._cache), [0])
+
+    def test_load(self):
+        doc = load(self.file)
+        self.assertEqual(doc, self.doc)
+
+        # Archives are valid binary odML files.
+        self.assertEqual(BinaryReader().from_file(self.file), self.doc)
+
+    def test_invalid(self):
+        bin_file = os.path.join(self.tmp_dir, "plain.odmlb")
+        BinaryWriter(self.doc).write_file(bin_file)
+        with self.assertRaises(ParserException):
+            ArchiveDocument(bin_file)
+
+        empty_file = os.path.join(self.tmp_dir, "empty.odmla")
+        open(empty_file, "wb").close()
+        with self.assertRaises(ParserException):
+            ArchiveDocument(empty_file)
+
+        arc = ArchiveDocument(self.file)
+        arc.close()
+        with self.assertRaises(ValueError):
+            arc.get_section_by_path("/setup")
@@ -1,5 +1,8 @@
+import copy
 import datetime
 import os
+import pickle
+import sys
 import unittest
 
 from glob import glob
@@ -333,3 +336,48 @@ class TestSection(unittest.TestCase):
         self.assertEqual(subsec.parent, root.sections[0])
         self.assertEqual(len(root.sections[0].sections), 1)
         self.assertEqual(root.sections[0].sections[0].name, name)
+
+    def test_pickle(self):
+        doc = Document(author="author", version="v1", date="2021-12-24")
+        sec = Section(name="sec", type="test", parent=doc)
+        sub = Section(name="sub", type="test", parent=sec)
+        _ = Property(name="prop", values=[1, 2], unit="mV", parent=sub)
+        _ = Section(name="other", type="test", parent=doc)
+
+        restored = pickle.loads(pickle.dumps(doc, pickle.HIGHEST_PROTOCOL))
+        self.assertEqual(restored, doc)
+        self.assertEqual(restored.id, doc.id)
+        self.assertEqual(restored.date, doc.date)
+        self.assertEqual([obj.id for obj in restored.itersections()],
+                         [obj.id for obj in doc.itersections()])
+        self.assertEqual([obj.get_path() for obj in restored.itersections()],
+                         [obj.get_path() for obj in doc.itersections()])
+
+        prop = restored.get_property_by_path("/sec/sub:prop")
+        self.assertEqual(prop.values, [1, 2])
+        self.assertIs(prop.parent, restored["sec"]["sub"])
+        self.assertIs(restored["sec"].parent, restored)
+
+        self.assertEqual(copy.deepcopy(doc), doc)
+
+        # Merged objects of linked Sections reference the restored link targets.
+        link = Section(name="link", type="test", parent=doc)
+        link.link = "/sec/sub"
+        restored = pickle.loads(pickle.dumps(doc))
+        restored_link = restored["link"]
+        self.assertEqual(restored_link, link)
+        self.assertIs(restored_link.get_merged_equivalent(), restored["sec"]["sub"])
+        self.assertIs(restored_link.properties["prop"]._merged,
+                      restored["sec"]["sub"].properties["prop"])
+
+        restored_link.clean()
+        self.assertEqual(len(restored_link.properties), 0)
+        self.assertEqual(len(restored["sec"]["sub"].properties), 1)
+
+        # Deep trees do not exceed the recursion limit.
+        doc = Document()
+        parent = doc
+        for i in range(sys.getrecursionlimit()):
+            parent = Section(name="sec_%d" % i, parent=parent)
+        restored = pickle.loads(pickle.dumps(doc))
+        self.assertEqual(len(list(restored.itersections())), sys.getrecursionlimit())
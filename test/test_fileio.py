@@ -1,7 +1,12 @@
+import multiprocessing
 import os
+import shutil
 import sys
 import unittest
 
+from concurrent.futures.process import BrokenProcessPool
+from unittest import mock
+
 try:
     from StringIO import StringIO
 except ImportError:
@@ -9,7 +14,7 @@ except ImportError:
 
 import odml
 
-from .util import TEST_RESOURCES_DIR as RES_DIR
+from .util import create_test_dir, TEST_RESOURCES_DIR as RES_DIR
 
 
 class TestTypes(unittest.TestCase):
@@ -35,6 +40,16 @@ class TestTypes(unittest.TestCase):
         odml.save(doc, file_name, unsupported_kwarg="I do not matter")
         os.remove(file_name)
 
+    def test_validation_profile(self):
+        doc = odml.load(self.file, validation_profile="errors-only")
+        file_name = "%s_copy" % self.file
+        odml.save(doc, file_name, validation_profile="structural")
+        os.remove(file_name)
+
+        with self.assertRaises(ValueError):
+            odml.save(doc, file_name, validation_profile="I do not exist")
+        self.assertFalse(os.path.exists(file_name))
+
     def test_display(self):
         doc = odml.load(self.file)
         odml.display(doc)
@@ -50,3 +65,175 @@ class TestTypes(unittest.TestCase):
 
         with self.assertRaises(NotImplementedError):
             odml.display(doc, "html")
+
+    def test_partial_load(self):
+        doc = odml.Document()
+        for name in ["exp_a", "exp_b"]:
+            sec = odml.Section(name=name, type="experiment", parent=doc)
+            _ = odml.Property(name="prop", values=[1, 2], parent=sec)
+            sub = odml.Section(name="subject", type="subject", parent=sec)
+            _ = odml.Section(name="cell", type="cell", parent=sub)
+            _ = odml.Section(name="setup", type="hardware", parent=sec)
+
+        tmp_dir = create_test_dir(__file__)
+        try:
+            for backend in ["xml", "json", "yaml"]:
+                file_name = os.path.join(tmp_dir, "partial.%s" % backend)
+                odml.save(doc, file_name, backend)
+
+                loaded = odml.load(file_name, backend, include_paths=["/exp_b/subject"])
+                self.assertEqual([sec.get_path() for sec in loaded.itersections()],
+                                 ["/exp_b", "/exp_b/subject", "/exp_b/subject/cell"])
+                self.assertEqual(loaded["exp_b"].properties["prop"].values, [1, 2])
+                self.assertEqual(loaded["exp_b"]["subject"], doc["exp_b"]["subject"])
+
+                loaded = odml.load(file_name, backend, exclude_types=["Hardware", "cell"])
+                self.assertEqual(len(list(loaded.itersections())), 4)
+                self.assertIsNone(loaded.find_related(type="hardware"))
+
+                loaded = odml.load(file_name, backend, max_depth=1,
+                                   include_paths=["/exp_a"])
+                self.assertEqual([sec.get_path() for sec in loaded.itersections()],
+                                 ["/exp_a"])
+
+            with self.assertRaises(NotImplementedError):
+                odml.load(file_name, "rdf", max_depth=1)
+        finally:
+            shutil.rmtree(tmp_dir)
+
+    def test_fail_fast(self):
+        doc = odml.Document()
+        for name in ["first", "second"]:
+            sec = odml.Section(name=name, type="test", parent=doc)
+            _ = odml.Property(name="prop", values=[1, 2], parent=sec)
+        _ = odml.Property(name="duplicate", oid=doc["first"].properties["prop"].id,
+                          parent=doc["first"])
+
+        tmp_dir = create_test_dir(__file__)
+        try:
+            for backend in ["xml", "json", "yaml"]:
+                file_name = os.path.join(tmp_dir, "fail_fast.%s" % backend)
+                with open(file_name, "w") as out_file:
+                    out_file.write(odml.tools.ODMLWriter(backend).to_string(doc))
+
+                loaded = odml.load(file_name, backend, show_warnings=False)
+                self.assertEqual(loaded, doc)
+
+                with self.assertRaises(odml.tools.parser_utils.ParserException) as exc:
+                    odml.load(file_name, backend, show_warnings=False, fail_fast=True)
+                self.assertIn("Duplicate id", str(exc.exception))
+
+            # The error is raised while the remaining file is not parsed yet.
+            file_name = os.path.join(tmp_dir, "fail_fast_truncated.xml")
+            xml_string = str(odml.tools.XMLWriter(doc))
+            with open(file_name, "w") as out_file:
+                out_file.write(xml_string[:xml_string.index("<name>second")])
+
+            with self.assertRaises(odml.tools.parser_utils.ParserException) as exc:
+                odml.load(file_name, iterative=True, show_warnings=False, fail_fast=True)
+            self.assertIn("Duplicate id", str(exc.exception))
+        finally:
+            shutil.rmtree(tmp_dir)
+
+    def test_load_many(self):
+        missing = os.path.join(RES_DIR, "i_do_not_exist.odml")
+        invalid = os.path.join(RES_DIR, "invalid_root.xml")
+        files = [self.file, missing, self.file, invalid]
+        doc = odml.load(self.file)
+
+        for workers in [1, 2]:
+            results = odml.load_many(files, workers=workers)
+            self.assertEqual([res.path for res in results], files)
+            self.assertEqual(results[0].document, doc)
+            self.assertEqual(results[0].document.id, doc.id)
+            self.assertEqual(results[0].document.origin_file_name, doc.origin_file_name)
+            self.assertIsNone(results[0].error)
+            self.assertEqual(results[2].document, doc)
+
+            self.assertIsNone(results[1].document)
+            self.assertIsInstance(results[1].error, FileNotFoundError)
+            self.assertIsInstance(results[3].error, odml.tools.parser_utils.ParserException)
+
+            results = list(odml.iter_load_many(files, workers=workers))
+            self.assertEqual(sorted(res.path for res in results), sorted(files))
+            self.assertEqual(len([res for res in results if res.error is None]), 2)
+
+    @unittest.skipIf(multiprocessing.get_start_method() != "fork",
+                     "patched loading has to be inherited by the worker processes")
+    def test_load_many_worker_crash(self):
+        crash = os.path.join(RES_DIR, "crash.odml")
+        load = odml.fileio.load
+
+        def crashing_load(filename, *args, **kwargs):
+            if filename == crash:
+                os._exit(1)
+            return load(filename, *args, **kwargs)
+
+        files = [self.file, crash, self.file]
+        with mock.patch("odml.fileio.load", side_effect=crashing_load):
+            results = odml.load_many(files, workers=2)
+
+        # A crashed worker fails the affected files instead of the whole batch.
+        self.assertEqual([res.path for res in results], files)
+        self.assertIsNone(results[1].document)
+        self.assertIsInstance(results[1].error, BrokenProcessPool)
+        for res in results:
+            self.assertTrue(res.document is not None or res.error is not None)
+
+    def test_compressed_files(self):
+        doc = odml.load(self.file)
+        magic = {"gz": b"\x1f\x8b", "bz2": b"BZh", "xz": b"\xfd7zXZ\x00"}
+
+        tmp_dir = create_test_dir(__file__)
+        try:
+            for backend in ["xml", "json", "yaml", "binary"]:
+                for comp_format in magic:
+                    file_name = os.path.join(tmp_dir, "doc.%s.%s" % (backend, comp_format))
+                    odml.save(doc, file_name, backend)
+                    with open(file_name, "rb") as file:
+                        self.assertTrue(file.read().startswith(magic[comp_format]))
+
+                    self.assertEqual(odml.load(file_name, backend), doc)
+
+            # Compression is detected by content independent of the file extension.
+            file_name = os.path.join(tmp_dir, "doc.xml")
+            os.rename(os.path.join(tmp_dir, "doc.xml.xz"), file_name)
+            self.assertEqual(odml.load(file_name), doc)
+
+            reader = odml.tools.XMLReader()
+            self.assertEqual(reader.from_file(file_name, iterative=True), doc)
+            self.assertEqual(len(list(reader.iter_sections(file_name))), len(doc.sections))
+        finally:
+            shutil.rmtree(tmp_dir)
+
+    def test_auto_backend(self):
+        doc = odml.load(self.file)
+
+        tmp_dir = create_test_dir(__file__)
+        try:
+            for backend in ["xml", "json", "yaml", "binary"]:
+                file_name = os.path.join(tmp_dir, "doc.%s.gz" % backend)
+                odml.save(doc, file_name, backend)
+                self.assertEqual(odml.tools.sniffer.sniff_file(file_name)[0],
+                                 backend.upper())
+                self.assertEqual(odml.load(file_name, "auto"), doc)
+
+            for rdf_format in ["xml", "turtle", "nt"]:
+                file_name = os.path.join(tmp_dir, "doc_%s" % rdf_format)
+                odml.tools.RDFWriter(doc).write_file(file_name, rdf_format)
+                file_name += odml.tools.parser_utils.RDF_CONVERSION_FORMATS[rdf_format]
+                self.assertEqual(odml.tools.sniffer.sniff_file(file_name),
+                                 ("RDF", rdf_format, None))
+                self.assertEqual(odml.load(file_name, "auto")[0], doc)
+
+            with open(self.file, "rb") as xml_file:
+                content = xml_file.read()
+            self.assertEqual(odml.tools.ODMLReader("auto").from_string(content), doc)
+        finally:
+            shutil.rmtree(tmp_dir)
+
+        for ext in ["xml", "json", "yaml"]:
+            file_name = os.path.join(RES_DIR, "version_conversion.%s" % ext)
+            self.assertEqual(odml.tools.sniffer.sniff_file(file_name)[2], "1")
+            with self.assertRaises(odml.tools.parser_utils.InvalidVersionException):
+                odml.load(file_name, "auto")
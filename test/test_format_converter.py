@@ -1,11 +1,14 @@
+import multiprocessing
 import os
 import shutil
 import tempfile
 import unittest
 
 from contextlib import contextmanager
+from unittest import mock
 
 from odml.tools.converters import FormatConverter
+from odml.tools.converters.format_converter import MANIFEST_NAME
 from .util import create_test_dir
 
 FC = FormatConverter
@@ -152,3 +155,78 @@ class TestFormatConverter(unittest.TestCase):
             FC._check_input_output_directory(in_dir, "/not_valid_path")
         self.assertNotRaises(FC._check_input_output_directory(in_dir, None))
         self.assertNotRaises(FC._check_input_output_directory(in_dir, out_dir))
+
+    def test_convert_dir_incremental(self):
+        self.tmp_dir = create_test_dir(__file__)
+        # Directory names containing regular expression metacharacters.
+        in_dir = os.path.join(self.tmp_dir, "in+dir(1)")
+        out_dir = os.path.join(self.tmp_dir, "out[1]")
+        os.makedirs(os.path.join(in_dir, "sub.d"))
+        os.makedirs(out_dir)
+
+        in_files = [os.path.join(in_dir, "a.xml"), os.path.join(in_dir, "sub.d", "b.xml")]
+        for in_file in in_files:
+            with open(in_file, "w") as file:
+                file.write(self.doc)
+
+        summary = FC.convert_dir(in_dir, out_dir, True, "odml", jobs=2, skip="hash")
+        self.assertEqual(summary[:3], (2, 0, 0))
+        self.assertTrue(os.path.isfile(os.path.join(out_dir, "a.odml")))
+        self.assertTrue(os.path.isfile(os.path.join(out_dir, "sub.d", "b.odml")))
+
+        # Unchanged files are skipped
+        summary = FC.convert_dir(in_dir, out_dir, True, "odml", skip="hash")
+        self.assertEqual(summary[:3], (0, 2, 0))
+
+        # Changed and invalid files are converted again
+        with open(in_files[0], "w") as file:
+            file.write(self.doc.replace("<name>S</name>", "<name>T</name>"))
+        with open(os.path.join(in_dir, "invalid.xml"), "w") as file:
+            file.write("<odML")
+
+        summary = FC.convert_dir(in_dir, out_dir, True, "odml", skip="hash")
+        self.assertEqual(summary[:3], (1, 1, 1))
+
+        # Files with an output file newer than the input file are skipped
+        past = os.path.getmtime(in_files[1]) - 10
+        os.utime(os.path.join(out_dir, "a.odml"), (past, past))
+
+        summary = FC.convert_dir(in_dir, out_dir, True, "odml", skip="mtime")
+        self.assertEqual(summary[:3], (1, 1, 1))
+
+        with self.assertRaises(ValueError):
+            FC.convert_dir(in_dir, out_dir, True, "odml", skip="size")
+
+    @unittest.skipIf(multiprocessing.get_start_method() != "fork",
+                     "patched conversion has to be inherited by the worker processes")
+    def test_convert_dir_worker_crash(self):
+        self.tmp_dir = create_test_dir(__file__)
+        in_dir = os.path.join(self.tmp_dir, "in")
+        out_dir = os.path.join(self.tmp_dir, "out")
+        os.makedirs(in_dir)
+        os.makedirs(out_dir)
+
+        for name in ["a.xml", "crash.xml", "c.xml"]:
+            with open(os.path.join(in_dir, name), "w") as file:
+                file.write(self.doc)
+
+        convert_file = FC._convert_file
+
+        def crashing_convert(input_path, output_path, res_format):
+            if input_path.endswith("crash.xml"):
+                os._exit(1)
+            return convert_file(input_path, output_path, res_format)
+
+        # A crashed worker fails the affected files instead of the whole run.
+        with mock.patch.object(FC, "_convert_file", side_effect=crashing_convert):
+            first = FC.convert_dir(in_dir, out_dir, True, "odml", jobs=2, skip="hash")
+        self.assertEqual(first.converted + first.failed, 3)
+        self.assertGreaterEqual(first.failed, 1)
+
+        # The manifest has been compacted and failed files are converted again.
+        with open(os.path.join(out_dir, MANIFEST_NAME)) as manifest:
+            self.assertEqual(len(manifest.readlines()), first.converted)
+
+        summary = FC.convert_dir(in_dir, out_dir, True, "odml", skip="hash")
+        self.assertEqual(summary[:3], (first.failed, first.converted, 0))
+        self.assertTrue(os.path.isfile(os.path.join(out_dir, "crash.odml")))
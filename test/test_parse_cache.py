@@ -0,0 +1,134 @@
+"""
+This module supplies tests for the odml.tools.parse_cache ParseCache class.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from io import StringIO
+from unittest import mock
+
+import odml
+
+from odml.tools import xmlparser
+from odml.tools.parse_cache import CACHE_DIR, ENTRY_SUFFIX, ParseCache
+from .util import create_test_dir, TEST_RESOURCES_DIR as RES_DIR
+
+
+class TestParseCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = create_test_dir(__file__)
+        self.cache = ParseCache(cache_dir=os.path.join(self.tmp_dir, "cache"))
+
+        self.file = os.path.join(self.tmp_dir, "example.odml")
+        shutil.copy(os.path.join(RES_DIR, "example.odml"), self.file)
+
+    def tearDown(self):
+        if self.tmp_dir and os.path.exists(self.tmp_dir):
+            shutil.rmtree(self.tmp_dir)
+
+    def entries(self):
+        return [name for name in os.listdir(self.cache.cache_dir)
+                if name.endswith(ENTRY_SUFFIX)]
+
+    def test_load(self):
+        doc = odml.load(self.file)
+
+        cached = odml.load(self.file, cache=self.cache)
+        self.assertEqual(cached, doc)
+        self.assertEqual(len(self.entries()), 1)
+
+        # Cached documents are restored without parsing the file.
+        with mock.patch.object(xmlparser.XMLReader, "from_file") as from_file:
+            cached = odml.load(self.file, cache=self.cache)
+            self.assertFalse(from_file.called)
+        self.assertEqual(cached, doc)
+        self.assertEqual(cached.id, doc.id)
+        self.assertEqual(cached.origin_file_name, doc.origin_file_name)
+
+        # Loading options are part of the key.
+        partial = odml.load(self.file, cache=self.cache, include_paths=["/TheCrew"])
+        self.assertEqual(len(partial.sections), 1)
+        self.assertEqual(len(self.entries()), 2)
+
+        # Changed files are parsed again.
+        doc.author = "changed"
+        odml.save(doc, self.file)
+        self.assertEqual(odml.load(self.file, cache=self.cache).author, "changed")
+        self.assertEqual(len(self.entries()), 3)
+
+    def test_content_hash(self):
+        cache = ParseCache(cache_dir=self.cache.cache_dir, content_hash=True)
+        key = cache.key(self.file, "xml")
+        self.assertNotEqual(key, self.cache.key(self.file, "xml"))
+
+        stat = os.stat(self.file)
+        with open(self.file, "r+") as file:
+            content = file.read()
+            file.seek(0)
+            file.write(content.replace("D. N. Adams", "D. N. Adamz"))
+        os.utime(self.file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        self.assertEqual(self.cache.key(self.file, "xml"), self.cache.key(self.file, "xml"))
+        self.assertNotEqual(cache.key(self.file, "xml"), key)
+
+    def test_evict(self):
+        self.cache.put("first", b"1" * 10)
+        self.cache.put("second", b"2" * 10)
+        os.utime(os.path.join(self.cache.cache_dir, "first" + ENTRY_SUFFIX), ns=(0, 0))
+
+        # Accessing an entry marks it as recently used.
+        self.assertEqual(self.cache.get("first"), b"1" * 10)
+        self.assertIsNone(self.cache.get("unknown"))
+
+        self.cache.max_size = 25
+        self.cache.put("third", b"3" * 10)
+        self.assertEqual(sorted(self.entries()),
+                         ["first" + ENTRY_SUFFIX, "third" + ENTRY_SUFFIX])
+
+        self.cache.clear()
+        self.assertEqual(self.entries(), [])
+
+    def test_cache_dir(self):
+        # The default cache directory is private to the current user.
+        self.assertFalse(CACHE_DIR.startswith(tempfile.gettempdir()))
+
+        self.cache.put("key", b"data")
+        if hasattr(os, "getuid"):
+            self.assertEqual(os.stat(self.cache.cache_dir).st_mode & 0o777, 0o700)
+
+            # Entries of directories other users can write to are not trusted.
+            os.chmod(self.cache.cache_dir, 0o777)
+            self.assertIsNone(self.cache.get("key"))
+            self.cache.put("other", b"data")
+            self.assertEqual(self.entries(), ["key" + ENTRY_SUFFIX])
+            os.chmod(self.cache.cache_dir, 0o700)
+        self.assertEqual(self.cache.get("key"), b"data")
+
+        # An unusable cache directory does not fail loading.
+        cache = ParseCache(cache_dir=os.path.join(self.file, "cache"))
+        doc = odml.load(self.file, cache=cache)
+        self.assertEqual(doc, odml.load(self.file))
+
+    def test_warnings(self):
+        path = os.path.join(self.tmp_dir, "ignore_errors.xml")
+        shutil.copy(os.path.join(RES_DIR, "ignore_errors.xml"), path)
+
+        with mock.patch("sys.stderr", new_callable=StringIO) as stderr:
+            _ = self.cache.load(path)
+            parsed = stderr.getvalue()
+        self.assertIn("warning[", parsed)
+
+        # Parser warnings are shown again when a cache entry is restored.
+        with mock.patch.object(xmlparser.XMLReader, "from_file") as from_file:
+            with mock.patch("sys.stderr", new_callable=StringIO) as stderr:
+                _ = self.cache.load(path)
+                self.assertEqual(stderr.getvalue(), parsed)
+            self.assertFalse(from_file.called)
+
+        with mock.patch("sys.stderr", new_callable=StringIO) as stderr:
+            _ = self.cache.load(path, show_warnings=False)
+            self.assertEqual(stderr.getvalue(), "")
@@ -0,0 +1,143 @@
+"""
+This module supplies tests for the odml.tools.binary_parser BinaryWriter
+and BinaryReader classes.
+"""
+
+import datetime
+import os
+import shutil
+import unittest
+
+import odml
+
+from odml.tools.binary_parser import BinaryReader, BinaryWriter, DOCUMENT, MAGIC
+from odml.tools.odmlparser import ODMLReader, ODMLWriter
+from odml.tools.parser_utils import InvalidVersionException, ParserException
+from .util import create_test_dir
+
+
+class TestBinaryParser(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = create_test_dir(__file__)
+
+        doc = odml.Document(author="author", version="v1", date="2021-12-24",
+                            repository="https://some.repo.org/term.xml")
+        sec = odml.Section(name="sec", type="test", definition="μ definition",
+                           reference="ref", sec_cardinality=(1, None),
+                           prop_cardinality=(None, 5), parent=doc)
+        _ = odml.Section(name="link", type="test", link="/sec", parent=sec)
+        _ = odml.Section(name="include", type="test", include="inc.xml#sec", parent=sec)
+        sub = odml.Section(name="sub", type="test", parent=sec)
+
+        _ = odml.Property(name="int", values=[1, -2, 2 ** 40], unit="mV",
+                          uncertainty=0.5, val_cardinality=(1, 3), parent=sec)
+        _ = odml.Property(name="bigint", values=[2 ** 70, 1], dtype="int", parent=sec)
+        _ = odml.Property(name="float", values=[1.5, -0.25], uncertainty=2, parent=sec)
+        _ = odml.Property(name="bool", values=[True, False], parent=sec)
+        _ = odml.Property(name="string", values=["a", "b,c", "μ", ""], parent=sec)
+        _ = odml.Property(name="text", values=["line\nbreak"], dtype="text", parent=sec)
+        _ = odml.Property(name="date", values=["2021-12-24"], dtype="date", parent=sub)
+        _ = odml.Property(name="time", values=["11:22:33"], dtype="time", parent=sub)
+        _ = odml.Property(name="datetime", values=["2021-12-24 11:22:33"],
+                          dtype="datetime", parent=sub)
+        _ = odml.Property(name="tuple", values=["(1;2)", "(3;4)"], dtype="2-tuple",
+                          definition="def", dependency="dep", dependency_value="dval",
+                          value_origin="origin", reference="ref", parent=sub)
+        _ = odml.Property(name="empty", parent=sub)
+        _ = odml.Section(name="empty", type="test", parent=doc)
+
+        self.doc = doc
+
+    def tearDown(self):
+        if self.tmp_dir and os.path.exists(self.tmp_dir):
+            shutil.rmtree(self.tmp_dir)
+
+    def assert_restored(self, doc):
+        self.assertEqual(doc, self.doc)
+        self.assertEqual(doc.id, self.doc.id)
+        self.assertEqual(doc.date, self.doc.date)
+
+        for obj, restored in zip(self.doc.itersections(), doc.itersections()):
+            self.assertEqual(restored.id, obj.id)
+            self.assertEqual(restored.link, obj.link)
+            self.assertEqual(restored.include, obj.include)
+            self.assertEqual(restored.parent.id, obj.parent.id)
+
+        for obj, restored in zip(self.doc.iterproperties(), doc.iterproperties()):
+            self.assertEqual(restored.id, obj.id)
+            self.assertEqual(restored.values, obj.values)
+            self.assertEqual([type(val) for val in restored.values],
+                             [type(val) for val in obj.values])
+            self.assertEqual(restored.dtype, obj.dtype)
+            self.assertEqual(restored.uncertainty, obj.uncertainty)
+            self.assertEqual(type(restored.uncertainty), type(obj.uncertainty))
+            self.assertEqual(restored.val_cardinality, obj.val_cardinality)
+            self.assertEqual(restored.parent.name, obj.parent.name)
+
+    def test_round_trip(self):
+        data = BinaryWriter(self.doc).to_bytes()
+        self.assertTrue(data.startswith(MAGIC))
+        self.assert_restored(BinaryReader().from_bytes(data))
+
+        path = os.path.join(self.tmp_dir, "doc.odmlb")
+        BinaryWriter(self.doc).write_file(path)
+        self.assert_restored(BinaryReader().from_file(path))
+
+        # Restored documents behave like the original document
+        doc = BinaryReader().from_file(path)
+        for curr in [doc, self.doc]:
+            curr.sections["sec"].properties["int"].values = [4, 5]
+            _ = curr.sections["sec"].create_section(name="new", type="test", oid=doc.id)
+        self.assertEqual(ODMLWriter().to_string(doc), ODMLWriter().to_string(self.doc))
+
+    def test_fileio(self):
+        path = os.path.join(self.tmp_dir, "doc.odmlb")
+        odml.save(self.doc, path, "binary")
+        self.assert_restored(odml.load(path, "binary", show_warnings=False))
+
+        data = ODMLWriter("BINARY").to_string(self.doc)
+        self.assert_restored(ODMLReader("BINARY", False).from_string(data))
+
+    def test_string_uncertainty(self):
+        # Text formats keep uncertainties as strings.
+        self.doc.sections["sec"].properties["bool"].uncertainty = 0.1
+        data = ODMLWriter().to_string(self.doc)
+        doc = ODMLReader(show_warnings=False).from_string(data.encode())
+        self.assertEqual(doc.sections["sec"].properties["bool"].uncertainty, "0.1")
+
+        restored = BinaryReader().from_bytes(BinaryWriter(doc).to_bytes())
+        for obj, prop in zip(doc.iterproperties(), restored.iterproperties()):
+            self.assertEqual(prop.uncertainty, obj.uncertainty)
+            self.assertEqual(type(prop.uncertainty), type(obj.uncertainty))
+
+    def test_skip_section(self):
+        data = BinaryWriter(self.doc).to_bytes()
+        reader = BinaryReader()
+        offset = reader.read_header(data)
+
+        # Skip the document record
+        offset += DOCUMENT.size
+        next_offset = reader.skip_section(data, offset)
+        sec, offset = reader.read_section(data, offset)
+        self.assertEqual(offset, next_offset)
+        self.assertEqual(sec, self.doc.sections["sec"])
+
+        sec, _ = reader.read_section(data, offset)
+        self.assertEqual(sec.name, "empty")
+
+    def test_invalid_content(self):
+        with self.assertRaises(ParserException):
+            BinaryReader().from_bytes(b"<odML></odML>")
+
+        data = BinaryWriter(self.doc).to_bytes()
+        with self.assertRaises(ParserException):
+            BinaryReader().from_bytes(data[:len(data) // 2])
+
+        data = data.replace(b"1.1", b"1.0", 1)
+        with self.assertRaises(InvalidVersionException):
+            BinaryReader().from_bytes(data)
+
+        self.doc.sections["sec"].properties["string"]._values = ["a", 1]
+        with self.assertRaises(ParserException):
+            BinaryWriter(self.doc).to_bytes()
@@ -8,6 +8,8 @@ import os
 import shutil
 import unittest
 
+import odml
+
 from odml.tools import dict_parser
 from odml.tools.parser_utils import ParserException, InvalidVersionException
 from .util import create_test_dir, TEST_RESOURCES_DIR as RES_DIR
@@ -241,3 +243,44 @@ class TestJSONParser(unittest.TestCase):
         for msg in self.json_reader.warnings:
             self.assertIn("Error", msg)
             self.assertIn(exc_msg, msg)
+
+    def test_from_json(self):
+        # Unsupported documents raise the same exceptions as 'to_odml'.
+        for filename, exc_type in (("missing_root.json", ParserException),
+                                   ("missing_version.json", ParserException),
+                                   ("invalid_version.json", InvalidVersionException)):
+            with open(os.path.join(self.base_path, filename)) as json_data:
+                with self.assertRaises(exc_type):
+                    _ = self.json_reader.from_json(json_data)
+
+        file_content = _INVALID_ATTRIBUTE_HANDLING_DOC % ("inv_doc", "inv_sec", "inv_prop")
+        with self.assertRaises(ParserException) as exc:
+            _ = self.json_reader.from_json(file_content)
+        self.assertIn("Invalid element", str(exc.exception))
+        self.assertIn("inv_doc", str(exc.exception))
+
+        for content in [file_content, _SEC_CREATION_ERROR_DOC % ("valid", "invalid"),
+                        _PROP_CREATION_ERROR_DOC]:
+            reader = dict_parser.DictReader(show_warnings=False, ignore_errors=True)
+            doc = reader.to_odml(json.loads(content))
+
+            json_reader = dict_parser.DictReader(show_warnings=False, ignore_errors=True)
+            json_doc = json_reader.from_json(content)
+
+            self.assertEqual(json_doc, doc)
+            self.assertEqual(json_reader.warnings, reader.warnings)
+
+        # Test loading a document with nested sections from a file
+        path = os.path.join(self.tmp_dir_path, "nested.json")
+        doc = odml.Document()
+        sec = doc.create_section(name="sec", type="test")
+        sub = sec.create_section(name="sub", type="test")
+        _ = sub.create_property(name="prop", values=[1, 2])
+        _ = sec.create_property(name="prop", values=["a"])
+        odml.save(doc, path, "JSON")
+
+        with open(path) as json_data:
+            json_doc = self.json_reader.from_json(json_data)
+        self.assertEqual(json_doc, doc)
+        self.assertIs(json_doc.sections["sec"].sections["sub"].parent,
+                      json_doc.sections["sec"])
@@ -1,9 +1,15 @@
+import csv
 import os
+import shutil
 import unittest
 
-from odml.tools import xmlparser
+from io import BytesIO, StringIO
+
+import odml
+
+from odml.tools import parser_utils, xmlparser
 from odml.tools.parser_utils import ParserException, InvalidVersionException
-from .util import TEST_RESOURCES_DIR as RES_DIR
+from .util import create_test_dir, TEST_RESOURCES_DIR as RES_DIR
 
 
 class TestXMLParser(unittest.TestCase):
@@ -14,6 +20,12 @@ class TestXMLParser(unittest.TestCase):
         self.xml_reader = xmlparser.XMLReader()
         self.xml_reader_ignore = xmlparser.XMLReader(ignore_errors=True)
 
+        self.tmp_dir = create_test_dir(__file__)
+
+    def tearDown(self):
+        if self.tmp_dir and os.path.exists(self.tmp_dir):
+            shutil.rmtree(self.tmp_dir)
+
     def test_invalid_root(self):
         filename = "invalid_root.xml"
         message = "Expecting <odML>"
@@ -46,3 +58,194 @@ class TestXMLParser(unittest.TestCase):
 
         doc = self.xml_reader_ignore.from_file(os.path.join(self.base_path, filename))
         doc.pprint()
+
+    def test_iterative_from_file(self):
+        path = os.path.join(self.base_path, "example.odml")
+        doc = self.xml_reader.from_file(path)
+        iter_doc = xmlparser.XMLReader().from_file(path, iterative=True)
+
+        self.assertEqual(doc, iter_doc)
+        self.assertEqual(doc.id, iter_doc.id)
+        self.assertEqual(doc.author, iter_doc.author)
+        self.assertEqual(doc.origin_file_name, iter_doc.origin_file_name)
+        self.assertEqual([sec.id for sec in doc.itersections()],
+                         [sec.id for sec in iter_doc.itersections()])
+        self.assertEqual([prop.id for prop in doc.iterproperties()],
+                         [prop.id for prop in iter_doc.iterproperties()])
+
+        with open(path) as xml_file:
+            iter_doc = xmlparser.XMLReader().from_file(xml_file, iterative=True)
+        self.assertEqual(doc, iter_doc)
+
+        # Nested Sections and Properties are built before their parents
+        # and all of them are attached.
+        reader = xmlparser.XMLReader()
+        iter_doc = reader.from_file(path, iterative=True)
+        self.assertEqual(reader._built, {})
+        self.assertEqual([sec.get_path() for sec in doc.itersections()],
+                         [sec.get_path() for sec in iter_doc.itersections()])
+
+        iter_doc = odml.load(path, iterative=True, show_warnings=False)
+        self.assertEqual(doc, iter_doc)
+        self.assertEqual(doc.origin_file_name, iter_doc.origin_file_name)
+
+    def test_iter_sections(self):
+        path = os.path.join(self.base_path, "example.odml")
+        doc = self.xml_reader.from_file(path)
+
+        reader = xmlparser.XMLReader()
+        names = []
+        for sec in reader.iter_sections(path):
+            self.assertIsNone(sec.parent)
+            self.assertEqual(sec, doc[sec.name])
+            names.append(sec.name)
+
+        self.assertEqual(names, [sec.name for sec in doc.sections])
+        self.assertEqual(reader.doc_attributes["author"], doc.author)
+        self.assertEqual(reader.doc_attributes["oid"], doc.id)
+
+    def test_iterative_errors(self):
+        for filename, exc_type in [("invalid_root.xml", ParserException),
+                                   ("missing_version.xml", ParserException),
+                                   ("invalid_version.xml", InvalidVersionException)]:
+            path = os.path.join(self.base_path, filename)
+            with self.assertRaises(exc_type):
+                _ = self.xml_reader.from_file(path, iterative=True)
+
+        path = os.path.join(self.base_path, "ignore_errors.xml")
+        with self.assertRaises(ParserException):
+            _ = self.xml_reader.from_file(path, iterative=True)
+
+        doc = self.xml_reader_ignore.from_file(path)
+        iter_doc = xmlparser.XMLReader(ignore_errors=True).from_file(path, iterative=True)
+        self.assertEqual(len(doc.sections), len(iter_doc.sections))
+        self.assertEqual(doc.sections[0].name, iter_doc.sections[0].name)
+        self.assertEqual(len(list(doc.iterproperties())),
+                         len(list(iter_doc.iterproperties())))
+
+    def test_lazy_values(self):
+        path = os.path.join(self.base_path, "example.odml")
+        doc = self.xml_reader.from_file(path)
+        lazy_doc = xmlparser.XMLReader(lazy_values=True).from_file(path)
+
+        props = list(doc.iterproperties())
+        lazy_props = list(lazy_doc.iterproperties())
+        self.assertTrue(all(prop._raw_values is not None for prop in lazy_props
+                            if prop.dtype))
+
+        # Values are decoded on first access.
+        self.assertEqual(lazy_props[0][0], props[0][0])
+        self.assertIsNone(lazy_props[0]._raw_values)
+        self.assertEqual(len(lazy_props[1]), len(props[1]))
+        self.assertEqual(lazy_doc, doc)
+        self.assertEqual([prop.values for prop in lazy_props],
+                         [prop.values for prop in props])
+        self.assertEqual([prop.dtype for prop in lazy_props],
+                         [prop.dtype for prop in props])
+
+        # Values that have not been accessed are saved unchanged.
+        lazy_doc = xmlparser.XMLReader(lazy_values=True).from_file(path)
+        prop = next(lazy_doc.iterproperties())
+        prop._raw_values = ("[ 1,2 ]",) + prop._raw_values[1:]
+        xml_string = str(xmlparser.XMLWriter(lazy_doc))
+        self.assertIn("<value>[ 1,2 ]</value>", xml_string)
+        self.assertIsNotNone(prop._raw_values)
+
+        lazy_doc = xmlparser.XMLReader(lazy_values=True).from_file(path)
+        xml_string = str(xmlparser.XMLWriter(lazy_doc))
+        self.assertEqual(self.xml_reader.from_string(xml_string), doc)
+
+    def test_lazy_invalid_values(self):
+        xml_string = ("<odML version=\"1.1\"><section><name>sec</name><type>t</type>"
+                      "<property><name>invalid</name><type>int</type>"
+                      "<value>[abc,def]</value></property>"
+                      "<property><name>valid</name><type>int</type>"
+                      "<value>[1,2]</value></property>"
+                      "</section></odML>")
+        path = os.path.join(self.tmp_dir, "invalid_values.odml")
+        with open(path, "w") as xml_file:
+            xml_file.write(xml_string)
+
+        # Eager parsing reports invalid values as warnings and keeps loading.
+        reader = odml.tools.ODMLReader(show_warnings=False)
+        doc = reader.from_file(path)
+        self.assertEqual(len(reader.warnings), 1)
+
+        # Lazily decoded values follow the same error policy.
+        for validation_profile in ["full", "structural"]:
+            reader = odml.tools.ODMLReader(show_warnings=False)
+            lazy_doc = reader.from_file(path, lazy_values=True,
+                                        validation_profile=validation_profile)
+            prop = lazy_doc.sections["sec"].properties["invalid"]
+            self.assertEqual(prop.values, [])
+            self.assertEqual(len(reader.warnings), 1)
+            self.assertIn("(line 1)", reader.warnings[0])
+            self.assertEqual(lazy_doc.sections["sec"].properties["valid"].values,
+                             doc.sections["sec"].properties["valid"].values)
+
+        lazy_doc = odml.load(path, lazy_values=True, show_warnings=False)
+        self.assertEqual(lazy_doc.sections["sec"].properties["invalid"].values, [])
+
+        # Without ignored errors the values raise on every access.
+        lazy_doc = xmlparser.XMLReader(lazy_values=True).from_file(path)
+        prop = lazy_doc.sections["sec"].properties["invalid"]
+        for _ in range(2):
+            with self.assertRaises(ParserException):
+                _ = prop.values
+
+    def test_selection_pruning(self):
+        xml_string = ("<odML version=\"1.1\">"
+                      "<section><name>keep</name><type>t</type>"
+                      "<section><name>sub</name><type>skip</type></section>"
+                      "<section><type>t</type>"
+                      "<section><name>late_sub</name><type>t</type></section>"
+                      "<name>late</name></section>"
+                      "</section>"
+                      "<section><name>other</name><type>t</type>"
+                      "<property><name>prop</name><value>1</value></property>"
+                      "</section>"
+                      "</odML>")
+
+        selection = parser_utils.SectionSelection(include_paths=["/keep"],
+                                                  exclude_types=["skip"])
+        reader = xmlparser.XMLReader(selection=selection)
+
+        # Unselected Sections are removed from the XML tree while it is parsed.
+        root = reader._parse_selected(BytesIO(xml_string.encode()))
+        self.assertEqual([sec.findtext("name") for sec in root.iter("section")],
+                         ["keep", "late", "late_sub"])
+
+        # Sections named after their subsections are selected as well.
+        doc = reader.from_file(BytesIO(xml_string.encode()))
+        self.assertEqual([sec.get_path() for sec in doc.itersections()],
+                         ["/keep", "/keep/late", "/keep/late/late_sub"])
+
+        selection.exclude_types.add("t")
+        doc = reader.from_file(BytesIO(xml_string.encode()))
+        self.assertEqual(len(doc.sections), 0)
+
+    def test_value_codec(self):
+        def csv_reference(values):
+            stream = StringIO()
+            csv.writer(stream, dialect="excel").writerow(values)
+            csv_string = stream.getvalue().strip().strip('"')
+            if len(values) > 1:
+                csv_string = "[" + csv_string + "]"
+            return csv_string
+
+        cases = [[], [""], ["a"], ["a", "b"], ["a,b"], ["a,b", "c"], ["a", "b,c"],
+                 ['say "hi"', "x"], ["line\nbreak", "y"], ["", ""], [1, 2.5, True],
+                 ["μ", " padded "]]
+        for values in cases:
+            expected = csv_reference([str(val).strip() for val in values])
+            self.assertEqual(xmlparser.to_csv(values), expected)
+
+        self.assertEqual(xmlparser.from_csv("[a,b,c]"), ["a", "b", "c"])
+        self.assertEqual(xmlparser.from_csv("a,b"), ["a,b"])
+        self.assertEqual(xmlparser.from_csv("[]"), [])
+        self.assertEqual(xmlparser.from_csv('["a,b",c]'), ["a,b", "c"])
+        self.assertEqual(xmlparser.from_csv('[a,"say ""hi"""]'), ["a", 'say "hi"'])
+        self.assertEqual(xmlparser.from_csv('[a,"line\nbreak"]'), ["a", "line\nbreak"])
+
+        values = ["a", "b,c", 'd"e', "f"]
+        self.assertEqual(xmlparser.from_csv(xmlparser.to_csv(values)), values)
@@ -106,6 +106,20 @@ class TestRDFReader(unittest.TestCase):
         self.assertEqual(prop.value_origin, "force")
         self.assertEqual(prop.reference, "Experiment 1")
 
+    def test_property_value_order(self):
+        """
+        Test if more than nine values are read in the order of their RDF Seq items.
+        """
+        doc = Document()
+        sec = Section(name="sec1", type="test", parent=doc)
+        Property(name="many", values=list(range(25, 0, -1)), parent=sec)
+
+        rdf_writer = RDFWriter(doc).get_rdf_str("nt")
+        rdf_reader = RDFReader().from_string(rdf_writer, "nt")
+
+        prop = rdf_reader[0].sections[0].properties["many"]
+        self.assertEqual(prop.values, list(range(25, 0, -1)))
+
     def test_mandatory_attrs_section(self):
         """
         Test if ParserError is thrown if mandatory attributes are missing for section.
@@ -1,25 +1,33 @@
 import datetime
 import os
+import subprocess
+import sys
 import unittest
+import uuid
+
+from itertools import count
 
 from sys import version_info
+from unittest import mock
 
 import yaml
 
 if version_info > (3, 4):
     from owlrl import DeductiveClosure, RDFS_Semantics
 
-from rdflib import URIRef, Literal
+from rdflib import Graph, URIRef, Literal
+from rdflib.compare import isomorphic
 from rdflib.namespace import Namespace, RDF, RDFS, XSD
 from rdflib.plugins.sparql import prepareQuery
 
 import odml
 
 from odml.format import Format
-from odml.tools.rdf_converter import ODML_NS, RDFWriter
+from odml.tools.rdf_converter import ODML_NS, RDFStreamWriter, RDFWriter
 
 from .test_samplefile import SampleFileCreator
 from .test_samplefile import parse
+from .util import TEST_RESOURCES_DIR as RES_DIR
 
 ODMLNS = Format.namespace()
 
@@ -353,6 +361,22 @@ class TestRDFWriter(unittest.TestCase):
                 self.assertNotIn("odml:Cell", rdf_writer.get_rdf_str())
                 self.assertIn("odml:Neuron", rdf_writer.get_rdf_str())
 
+    def test_rdf_subclasses_cache(self):
+        writer = RDFWriter([self.doc])
+        other = RDFWriter([self.doc])
+
+        # The default mapping is loaded once and shared read only.
+        self.assertIs(writer.section_subclasses, other.section_subclasses)
+        with self.assertRaises(TypeError):
+            writer.section_subclasses["cell"] = "Neuron"
+
+        # Custom mappings are merged into a copy.
+        with self.assertWarns(UserWarning):
+            custom = RDFWriter([self.doc], custom_subclasses={"cell": "Neuron"})
+        self.assertEqual(custom.section_subclasses["cell"], "Neuron")
+        self.assertEqual(writer.section_subclasses["cell"], "Cell")
+        self.assertEqual(RDFWriter([self.doc]).section_subclasses["cell"], "Cell")
+
     def test_rdf_subclassing_definitions(self):
         """
         Test that RDF Subclass definitions are written to the resulting graph.
@@ -507,3 +531,64 @@ class TestRDFWriter(unittest.TestCase):
             curr_query = prepareQuery(q_string, initNs=namespace_map)
 
             self.assertIs(len(use_graph.query(curr_query)), 0)
+
+    def test_stream_writer(self):
+        doc = odml.load(os.path.join(odml.__path__[0], "..", "doc",
+                                     "example_odMLs", "THGTTG.odml"))
+        sec = odml.Section(name="special", type="cell", parent=doc)
+        _ = odml.Section(name="other", type="cell", parent=doc)
+        _ = odml.Property(name="text", values=["a \"quoted\"\nline", "back\\slash", "ü"],
+                          parent=sec)
+        _ = odml.Property(name="float", values=[1.5, -2.0], parent=sec)
+        _ = odml.Property(name="date", dtype="date", values=[datetime.date(2021, 1, 2)],
+                          parent=sec)
+
+        docs = [doc, self.doc]
+        for rdf_format in ["nt", "turtle"]:
+            # Seq and terminology node identifiers are created in the same order.
+            with mock.patch("uuid.uuid4", side_effect=(uuid.UUID(int=i) for i in count())):
+                expected = RDFWriter(docs).convert_to_rdf()
+            with mock.patch("uuid.uuid4", side_effect=(uuid.UUID(int=i) for i in count())):
+                data = RDFStreamWriter(docs).get_rdf_str(rdf_format)
+
+            graph = Graph().parse(data=data, format=rdf_format)
+            self.assertTrue(isomorphic(graph, expected))
+            # Subclass definitions are written only once
+            self.assertEqual(data.count("subClassOf"),
+                             len(list(expected.triples((None, RDFS.subClassOf, None)))))
+
+        with self.assertRaises(ValueError):
+            RDFStreamWriter(docs).get_rdf_str("xml")
+
+    def test_deterministic_ids(self):
+        self.doc.repository = "terminology_url"
+        prop = next(self.doc.iterproperties())
+
+        for writer in [RDFWriter, RDFStreamWriter]:
+            for rdf_format in ["nt", "turtle"]:
+                rdf_str = writer(self.doc, deterministic_ids=True).get_rdf_str(rdf_format)
+                self.assertEqual(writer(self.doc, deterministic_ids=True)
+                                 .get_rdf_str(rdf_format), rdf_str)
+                self.assertNotEqual(writer(self.doc).get_rdf_str(rdf_format), rdf_str)
+
+        # The serialized bytes do not depend on the hash seed of the process.
+        script = ("import sys, odml; "
+                  "from odml.tools.rdf_converter import RDFStreamWriter, RDFWriter; "
+                  "doc = odml.load(sys.argv[1], show_warnings=False); "
+                  "print([writer(doc, deterministic_ids=True).get_rdf_str(rdf_format) "
+                  "for writer in [RDFWriter, RDFStreamWriter] "
+                  "for rdf_format in ['nt', 'turtle']])")
+        path = os.path.join(RES_DIR, "example.odml")
+        outputs = set()
+        for seed in ["1", "2", "3"]:
+            env = dict(os.environ, PYTHONHASHSEED=seed,
+                       PYTHONPATH=os.pathsep.join(sys.path))
+            outputs.add(subprocess.check_output([sys.executable, "-c", script, path],
+                                                env=env))
+        self.assertEqual(len(outputs), 1)
+
+        graph = RDFWriter(self.doc, deterministic_ids=True).convert_to_rdf()
+        prop_node = URIRef(ODMLNS + prop.id)
+        seq_node = graph.value(subject=prop_node, predicate=ODMLNS.hasValue)
+        seq_id = uuid.uuid5(uuid.NAMESPACE_URL, "%s/values" % prop_node)
+        self.assertEqual(seq_node, URIRef(ODMLNS + str(seq_id)))
@@ -1,11 +1,17 @@
 import os
+import pathlib
 import shutil
 import unittest
 
+from io import StringIO
+from unittest import mock
+
 from docopt import DocoptExit
 
 from odml import load as odml_load
+from odml.doc import BaseDocument
 from odml.scripts import odml_convert
+from odml.validation import Validation
 from . import util
 
 
@@ -91,3 +97,25 @@ class TestScriptOdmlConvert(unittest.TestCase):
         # make sure the files are valid odml files
         _ = odml_load(os.path.join(out_dir, file_lst[0]))
         _ = odml_load(os.path.join(out_dir, file_lst[1]))
+
+    def test_validation_timing(self):
+        timings = {}
+        recent_file = os.path.join(util.TEST_RESOURCES_DIR, "example.odml")
+        previous_file = os.path.join(self.dir_files, "conversion_example_A.xml")
+        report = StringIO()
+
+        # Only the validation run while loading recent version files is timed.
+        run_validation = Validation.run_validation
+        with mock.patch.object(Validation, "run_validation", autospec=True,
+                               side_effect=run_validation) as validation_mock:
+            odml_convert.run_conversion([pathlib.Path(previous_file)], self.tmp_dir,
+                                        report, timings=timings)
+            self.assertEqual(timings, {})
+            self.assertEqual(len(os.listdir(self.tmp_dir)), 1)
+
+            odml_convert.run_conversion([pathlib.Path(recent_file)], self.tmp_dir,
+                                        report, timings=timings)
+        self.assertIn(("property", "property_values_check"), timings)
+        self.assertEqual(timings[("odML", "object_required_attributes")].calls, 1)
+        self.assertFalse([call for call in validation_mock.call_args_list
+                          if isinstance(call[0][0].obj, BaseDocument)])
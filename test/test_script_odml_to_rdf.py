@@ -1,11 +1,17 @@
 import os
+import pathlib
 import shutil
 import unittest
 
+from io import StringIO
+from unittest import mock
+
 from docopt import DocoptExit
 from rdflib import Graph
 
+from odml.doc import BaseDocument
 from odml.scripts import odml_to_rdf
+from odml.validation import Validation
 
 from . import util
 
@@ -97,3 +103,20 @@ class TestScriptOdmlToRDF(unittest.TestCase):
         curr_graph = Graph()
         curr_graph.parse(os.path.join(rdf_dir, file_lst[0]))
         curr_graph.parse(os.path.join(rdf_dir, file_lst[1]))
+
+    def test_validation_timing(self):
+        timings = {}
+        file_list = [pathlib.Path(os.path.join(self.dir_files, "example_A.doi.xml"))]
+        report = StringIO()
+
+        run_validation = Validation.run_validation
+        with mock.patch.object(Validation, "run_validation", autospec=True,
+                               side_effect=run_validation) as validation_mock:
+            odml_to_rdf.run_conversion(file_list, self.tmp_dir, self.tmp_dir, report,
+                                       timings=timings)
+        self.assertIn(("property", "property_values_check"), timings)
+
+        # The timings are recorded by the validation run before the export.
+        self.assertEqual(len([call for call in validation_mock.call_args_list
+                              if isinstance(call[0][0].obj, BaseDocument)]), 1)
+        self.assertEqual(timings[("odML", "object_required_attributes")].calls, 1)
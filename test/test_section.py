@@ -1,3 +1,4 @@
+import pickle
 import unittest
 
 from odml import Property, Section, Document
@@ -438,6 +439,23 @@ class TestSection(unittest.TestCase):
             sec.extend([Section(name="new"), Section(name="sec3")])
         self.assertEqual(len(sec.sections), 3)
 
+    def test_pickle(self):
+        sec = Section(name="main", type="test")
+        sub = Section(name="sub", type="test", parent=sec)
+        _ = Property(name="prop", values=[1, 2], parent=sec)
+        _ = Property(name="subprop", values=["a"], parent=sub)
+
+        restored = pickle.loads(pickle.dumps(sec))
+        self.assertEqual(restored, sec)
+        self.assertEqual(restored.id, sec.id)
+        self.assertEqual(restored.properties["prop"].values, [1, 2])
+        self.assertIs(restored.sections["sub"].parent, restored)
+        self.assertIs(restored.properties["prop"].parent, restored)
+
+        # Restored lists keep rejecting invalid entries.
+        with self.assertRaises(ValueError):
+            restored.sections.append(Property(name="invalid"))
+
     def test_remove(self):
         sec = Section(name="remsec")
 
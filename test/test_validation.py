@@ -1,10 +1,15 @@
+import json
 import os
 import sys
 import unittest
 
+import yaml
+
 import odml
 import odml.validation
 import odml.terminology
+from odml.tools import DictReader, ODMLWriter, XMLReader
+from odml.tools.parser_utils import ParserException
 from . import test_samplefile as samplefile
 from .util import TEST_RESOURCES_DIR as RES_DIR
 
@@ -494,3 +499,186 @@ class TestValidation(unittest.TestCase):
         res = Validate(doc)
         # self.assertEqual(list(self.filter_mapping_errors(res.errors)), [])
         self.assertEqual(res.errors, [])
+
+    def test_validation_timing(self):
+        """
+        Test recording of validation handler timings.
+        """
+        res = Validate(self.doc)
+        self.assertIsNone(res.timings)
+        with self.assertRaises(ValueError):
+            res.timing_report()
+
+        res = Validate(self.doc, timing=True)
+        report = res.timing_report()
+        self.assertTrue(report)
+
+        # Timings are recorded per odml class and handler
+        keys = [(curr["class"], curr["handler"]) for curr in report]
+        self.assertIn(("odML", "object_required_attributes"), keys)
+        self.assertIn(("section", "object_required_attributes"), keys)
+        self.assertIn(("property", "property_values_check"), keys)
+
+        num_secs = len(list(self.doc.itersections(recursive=True)))
+        num_props = len(list(self.doc.iterproperties()))
+        timing = res.timings[("section", "section_type_must_be_defined")]
+        self.assertEqual(timing.calls, num_secs)
+        timing = res.timings[("property", "property_values_check")]
+        self.assertEqual(timing.calls, num_props)
+        self.assertGreaterEqual(timing.total_time, timing.max_time)
+
+        # Report is sorted by total time
+        times = [curr["total_time"] for curr in report]
+        self.assertEqual(times, sorted(times, reverse=True))
+
+        # The number of recorded errors matches the found errors
+        self.assertEqual(sum([curr["errors"] for curr in report]), len(res.errors))
+
+        # Re-running the validation does not accumulate timings
+        res.run_validation()
+        self.assertEqual(res.timings[("property", "property_values_check")].calls,
+                         num_props)
+
+        summary = res.timing_summary()
+        self.assertIn("property_values_check", summary)
+
+        # Test merging timings of multiple validation runs
+        merged = odml.validation.merge_timings({}, res.timings)
+        odml.validation.merge_timings(merged, Validate(self.doc, timing=True).timings)
+        self.assertEqual(merged[("property", "property_values_check")].calls,
+                         2 * num_props)
+
+    def test_validation_profiles(self):
+        """
+        Test restricting validations via validation profiles.
+        """
+        doc = odml.Document()
+        sec = odml.Section(name="sec", parent=doc)
+        _ = odml.Property(name="prop", values=["1", "2"], dtype="string", parent=sec)
+
+        full = Validate(doc)
+        self.assertTrue([err for err in full.errors if err.is_warning])
+        self.assertEqual(len(Validate(doc, profile="full").errors), len(full.errors))
+
+        # The errors-only profile does not run any warning level validation
+        res = Validate(doc, profile="errors-only")
+        self.assertEqual(res.errors, [])
+
+        # The structural profile skips the value content validations
+        res = Validate(doc, profile="structural")
+        self.assertError(res, "Section type not specified")
+        for err in res.errors:
+            self.assertNotEqual(err.validation_id,
+                                odml.validation.IssueID.property_values_string_check)
+
+        # Custom profiles
+        res = Validate(doc, profile=[odml.validation.section_type_must_be_defined])
+        self.assertEqual(len(res.errors), 1)
+        self.assertError(res, "Section type not specified")
+
+        odml.validation.Validation.register_profile(
+            "test_profile", [odml.validation.property_values_string_check])
+        res = Validate(doc, profile="test_profile")
+        self.assertEqual(len(res.errors), 1)
+        self.assertEqual(res.errors[0].validation_id,
+                         odml.validation.IssueID.property_values_string_check)
+
+        # Profiles do not change the class level handlers
+        self.assertEqual(len(Validate(doc).errors), len(full.errors))
+
+        with self.assertRaises(ValueError):
+            Validate(doc, profile="I do not exist")
+
+    def test_streaming_validation(self):
+        """
+        Test validating documents while they are parsed.
+        """
+        doc = odml.Document()
+        sec = odml.Section("sec", parent=doc)
+        _ = odml.Property("prop", values=["1"], dtype="string", parent=sec)
+        csec = sec.clone(keep_id=True)
+        sec.append(csec)
+        _ = odml.Section(parent=doc)
+
+        expected = sorted((err.obj.id, err.msg) for err in Validate(doc).errors)
+
+        for parser in ["XML", "JSON", "YAML"]:
+            doc_str = ODMLWriter(parser).to_string(doc)
+
+            res = odml.validation.StreamingValidation()
+            if parser == "XML":
+                loaded = XMLReader(validation=res).from_string(doc_str)
+            else:
+                parsed = json.loads(doc_str) if parser == "JSON" else yaml.safe_load(doc_str)
+                loaded = DictReader(validation=res).to_odml(parsed)
+
+            self.assertIs(res.obj, loaded)
+            self.assertEqual(sorted((err.obj.id, err.msg) for err in res.errors), expected)
+            self.assertError(res, "Duplicate id in Section")
+            self.assertError(res, "Duplicate id in Property")
+
+            # Test fail fast on validation errors
+            res = odml.validation.StreamingValidation(fail_fast=True)
+            with self.assertRaises(ParserException):
+                if parser == "XML":
+                    XMLReader(validation=res).from_string(doc_str)
+                else:
+                    DictReader(validation=res).to_odml(parsed)
+
+        # Test duplicate id check is skipped if excluded by the validation profile
+        doc_str = ODMLWriter("XML").to_string(doc)
+        res = odml.validation.StreamingValidation(profile="structural")
+        XMLReader(validation=res).from_string(doc_str)
+        self.assertError(res, "Duplicate id in Section")
+
+        res = odml.validation.StreamingValidation(
+            profile=[odml.validation.object_name_readable])
+        XMLReader(validation=res).from_string(doc_str)
+        for err in res.errors:
+            self.assertNotIn("Duplicate id", err.msg)
+
+    def test_terminology_cache(self):
+        """
+        Test terminology equivalents are resolved once per Section in a validation run.
+        """
+        doc = samplefile.parse("""
+            s1[t1]
+            - p1
+            - P1
+            - P2
+            """)
+        odml.terminology.terminologies['term_cache'] = samplefile.parse("""
+            S1[T1]
+            - P1
+            """)
+        doc.repository = 'term_cache'
+
+        calls = []
+        orig_func = odml.section.BaseSection.get_terminology_equivalent
+
+        def counting_func(sec):
+            calls.append(sec)
+            return orig_func(sec)
+
+        odml.section.BaseSection.get_terminology_equivalent = counting_func
+        try:
+            res = Validate(doc, validate=False, reset=True)
+            res.register_custom_handler("property",
+                                        odml.validation.property_terminology_check)
+            res.run_validation()
+            self.assertEqual(len(calls), 1)
+            self.assertEqual(len(res.errors), 2)
+            self.assertError(res, "Property 'p1' not found in terminology")
+            self.assertError(res, "Property 'P2' not found in terminology")
+
+            # The cache is only valid for a single validation run
+            res.run_validation()
+            self.assertEqual(len(calls), 2)
+            self.assertEqual(len(res.errors), 2)
+
+            # Without an active validation run the equivalent is resolved directly
+            sec = doc.sections[0]
+            self.assertEqual(odml.validation.terminology_equivalent(sec).name, "S1")
+            self.assertEqual(len(calls), 3)
+        finally:
+            odml.section.BaseSection.get_terminology_equivalent = orig_func
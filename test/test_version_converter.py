@@ -9,6 +9,7 @@ from lxml import etree as ET
 
 from odml.terminology import REPOSITORY_BASE
 from odml.tools.converters import VersionConverter
+from odml.tools.odmlparser import ODMLReader
 from .util import ODML_CACHE_DIR as CACHE_DIR, create_test_dir, TEST_RESOURCES_DIR as RES_DIR
 
 
@@ -97,6 +98,36 @@ class TestVersionConverter(unittest.TestCase):
         self.assertEqual(props_names[0], "prop_name")
         self.assertEqual(props_names[1], "prop_name-2")
 
+    def test_convert_nested_document(self):
+        # Same names are numbered per parent, every Section and Property
+        # within a Section receives exactly one id.
+        depth = 50
+        doc = "<odML version=\"1\">"
+        for _ in range(depth):
+            doc += ("<section><name>s</name><type>t</type>"
+                    "<property><name>p</name><value>1</value></property>"
+                    "<property><name>p</name><id>bad</id></property>"
+                    "<section><name>s</name><type>t</type></section>")
+        doc += "</section>" * depth + "</odML>"
+
+        converter = self.VC(io.StringIO(doc))
+        root = converter._convert(converter._parse_xml()).getroot()
+
+        sec = root.find("section")
+        for _ in range(depth - 1):
+            names = [child.find("name").text for child in sec.findall("section")]
+            self.assertEqual(names, ["s", "s-2"])
+
+            props = sec.findall("property")
+            self.assertEqual([prop.find("name").text for prop in props], ["p", "p-2"])
+            for prop in props:
+                self.assertEqual(len(prop.findall("id")), 1)
+            self.assertEqual(len(sec.findall("id")), 1)
+
+            sec = sec.findall("section")[1]
+
+        self.assertEqual(len(root.findall("id")), 1)
+
     def test_convert_odml_file(self):
         with self.assertRaises(Exception) as exc:
             self.VC("/not_valid_path").convert()
@@ -855,3 +886,25 @@ class TestVersionConverter(unittest.TestCase):
 
         self.assertFalse(os.path.exists(outfile))
         self.assertTrue(os.path.exists("%s.xml" % outfile))
+
+    def test_to_document(self):
+        infile = os.path.join(self.base_path, "version_conversion.xml")
+        self.tmp_dir = create_test_dir(__file__)
+
+        expected = ODMLReader().from_string(self.VC(infile).convert().encode())
+
+        doc = self.VC(infile).to_document()
+        self.assertEqual(doc, expected)
+        self.assertEqual(doc.origin_file_name, "version_conversion.xml")
+
+        # Test converted document is written to named file as well
+        outfile = os.path.join(self.tmp_dir, "test")
+        doc = self.VC(infile).to_document(filename=outfile)
+        self.assertEqual(doc, expected)
+        self.assertEqual(doc.origin_file_name, "test.xml")
+        self.assertEqual(ODMLReader().from_file("%s.xml" % outfile), expected)
+
+        for backend in ["JSON", "YAML"]:
+            infile = os.path.join(self.base_path, "version_conversion.%s" % backend.lower())
+            expected = ODMLReader().from_string(self.VC(infile).convert(backend).encode())
+            self.assertEqual(self.VC(infile).to_document(backend), expected)
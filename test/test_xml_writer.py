@@ -4,8 +4,9 @@ import unittest
 
 import odml
 
+from odml.info import FORMAT_VERSION
 from odml.tools.xmlparser import XML_HEADER, EXTERNAL_STYLE_HEADER, \
-    INFILE_STYLE_HEADER, INFILE_STYLE_TEMPLATE
+    INFILE_STYLE_HEADER, INFILE_STYLE_TEMPLATE, INFILE_TEMPLATE_WRAPPER
 from odml.tools import XMLWriter
 from .util import create_test_dir, TEST_RESOURCES_DIR as RES_DIR
 
@@ -92,3 +93,76 @@ class TestXMLWriter(unittest.TestCase):
         self.assertIn(INFILE_STYLE_HEADER, content)
         self.assertNotIn(INFILE_STYLE_TEMPLATE, content)
         self.assertIn(cust_tmpl, content)
+
+    def test_write_streaming(self):
+        sec = self.doc.sections["sec"]
+        sub = sec.create_section(name="sub", type="test")
+        _ = sub.create_property(name="tuple", value=["(1; 2)"], dtype="2-tuple")
+        _ = self.doc.create_section(name="empty", type="test")
+
+        self.writer.write_file(self.outfile)
+
+        # the incrementally written file has to match the in memory serialization
+        with open(self.outfile, encoding="utf-8") as test_file:
+            content = test_file.read()
+
+        expected = "%s\n%s\n%s" % (XML_HEADER, EXTERNAL_STYLE_HEADER, str(self.writer))
+        self.assertEqual(content, expected)
+
+        doc = odml.load(self.outfile)
+        self.assertEqual(doc, self.doc)
+        self.assertEqual(doc.sections["sec"].sections["sub"].properties["tuple"].values,
+                         [["1", "2"]])
+
+        # local styles are inserted right after the opening root tag
+        self.writer.write_file(self.outfile, local_style=True)
+        with open(self.outfile, "rb") as test_file:
+            content = test_file.read()
+
+        root_tag = '<odML version="%s">' % FORMAT_VERSION
+        template = INFILE_TEMPLATE_WRAPPER % INFILE_STYLE_TEMPLATE
+        expected = "%s\n%s\n%s" % (XML_HEADER, INFILE_STYLE_HEADER, str(self.writer))
+        expected = expected.replace(root_tag, "%s\n%s\n" % (root_tag, template))
+        self.assertEqual(content, expected.encode("utf-8"))
+
+    def test_write_failure(self):
+        self.writer.write_file(self.outfile)
+        with open(self.outfile, "rb") as test_file:
+            content = test_file.read()
+
+        # a failing write keeps the existing file and removes the temporary file
+        prop = self.doc.create_section(name="fail", type="test").create_property(name="fail")
+        prop._values = 1
+        with self.assertRaises(TypeError):
+            self.writer.write_file(self.outfile)
+
+        with open(self.outfile, "rb") as test_file:
+            self.assertEqual(test_file.read(), content)
+        self.assertEqual(os.listdir(self.tmp_dir), ["xml_writer.xml"])
+
+    def test_write_temporary_file(self):
+        # a file named like a temporary file of the target is kept
+        tmp_name = os.path.join(self.tmp_dir, "xml_writer.tmp.xml")
+        with open(tmp_name, "w") as tmp_file:
+            tmp_file.write("keep")
+
+        self.writer.write_file(self.outfile)
+        with open(tmp_name) as tmp_file:
+            self.assertEqual(tmp_file.read(), "keep")
+        self.assertEqual(sorted(os.listdir(self.tmp_dir)),
+                         ["xml_writer.tmp.xml", "xml_writer.xml"])
+
+        # the permissions of an existing file are kept
+        os.chmod(self.outfile, 0o640)
+        self.writer.write_file(self.outfile)
+        self.assertEqual(os.stat(self.outfile).st_mode & 0o777, 0o640)
+        self.assertEqual(odml.load(self.outfile), self.doc)
+
+        # new files are created with the default permissions
+        os.remove(self.outfile)
+        umask = os.umask(0o022)
+        try:
+            self.writer.write_file(self.outfile)
+        finally:
+            os.umask(umask)
+        self.assertEqual(os.stat(self.outfile).st_mode & 0o777, 0o644)
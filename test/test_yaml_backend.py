@@ -0,0 +1,73 @@
+import datetime
+import os
+import shutil
+import unittest
+
+import yaml
+
+import odml
+
+from odml.tools import yaml_backend
+from odml.tools.odmlparser import ODMLWriter
+from .util import create_test_dir
+
+
+class TestYAMLBackend(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = create_test_dir(__file__)
+
+        doc = odml.Document(author="me", date=datetime.date(2020, 1, 1))
+        sec = doc.create_section(name="sec", type="test")
+        _ = sec.create_property(name="time", values=[datetime.time(11, 11, 11)],
+                                dtype="time")
+        _ = sec.create_property(name="text", values=["a", "μ", "b,c"])
+        self.doc = doc
+
+    def tearDown(self):
+        if self.tmp_dir and os.path.exists(self.tmp_dir):
+            shutil.rmtree(self.tmp_dir)
+
+    def test_backends(self):
+        self.assertIn("python", yaml_backend.YAML_BACKENDS)
+        self.assertIn(yaml_backend.DEFAULT_BACKEND, yaml_backend.YAML_BACKENDS)
+
+        with self.assertRaises(ValueError):
+            yaml_backend.get_loader("unknown")
+
+        with self.assertRaises(ValueError):
+            yaml_backend.get_dumper("unknown")
+
+    def test_no_global_state(self):
+        _ = ODMLWriter("YAML").to_string(self.doc)
+
+        self.assertNotIn(datetime.time, yaml.SafeDumper.yaml_representers)
+        self.assertNotIn(datetime.time, yaml.Dumper.yaml_representers)
+        self.assertNotIn("tag:yaml.org,2002:python/unicode",
+                         yaml.SafeLoader.yaml_constructors)
+
+    def test_round_trip(self):
+        for backend in yaml_backend.YAML_BACKENDS:
+            path = os.path.join(self.tmp_dir, "%s.yaml" % backend)
+            ODMLWriter("YAML").write_file(self.doc, path, yaml_backend=backend)
+
+            # the streamed file content equals the string output of the same backend
+            with open(path) as yaml_file:
+                content = yaml_file.read()
+            self.assertEqual(content,
+                             ODMLWriter("YAML").to_string(self.doc, yaml_backend=backend))
+
+            with open(path) as yaml_file:
+                parsed = yaml_backend.load(yaml_file, backend=backend)
+            self.assertEqual(parsed["odml-version"], odml.info.FORMAT_VERSION)
+
+            doc = odml.load(path, "YAML")
+            self.assertEqual(doc, self.doc)
+            self.assertEqual(doc.sections["sec"].properties["time"].values,
+                             [datetime.time(11, 11, 11)])
+
+    def test_unicode_tag(self):
+        content = "value: !!python/unicode 'text'\n"
+        for backend in yaml_backend.YAML_BACKENDS:
+            self.assertEqual(yaml_backend.load(content, backend=backend),
+                             {"value": "text"})